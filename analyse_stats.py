@@ -1,39 +1,297 @@
+"""Statistiques du corpus en flux : lecture par morceaux, agrégats partiels fusionnables, sorties sans écran.
+
+Chaque morceau (lot Parquet ou tranche de CSV) met à jour un CorpusStats : compteurs d'interventions par
+orateur et par parti, et pour chaque séance et chaque législature une distribution des longueurs (nombre,
+somme, somme des carrés, min, max, histogramme à bornes fixes). Ces agrégats s'additionnent : plusieurs
+fichiers sont traités en parallèle (un processus par fichier) puis fusionnés, sans jamais charger le corpus
+entier en mémoire.
+
+Sorties dans --output (défaut : stats/) : stats.json, orateurs.csv, partis.csv, seances.csv, legislatures.csv
+et les graphiques partis.png / longueurs.png (matplotlib en mode fichier, aucune fenêtre).
+
+Usage : python analyse_stats.py [fichiers ...] [--workers 4] [--chunksize 100000] [--top 5] [--output stats]
+        (sans fichier : le corpus à côté du script, Parquet en priorité, sinon le CSV)
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-
-# 1. Chargement des données
-df = pd.read_csv("discours_grand_conseil_complet.csv")
-
-print(f"--- STATISTIQUES GLOBALES ---")
-print(f"Nombre total d'interventions : {len(df)}")
-print(f"Nombre d'orateurs uniques : {df['Orateur'].nunique()}")
-
-# 2. Qui parle le plus ? (Top 5 Orateurs)
-# On compte le nombre d'interventions par orateur
-top_orateurs = df['Orateur'].value_counts().head(5)
-print("\n--- TOP 5 DES BAVARDS (Nombre d'interventions) ---")
-print(top_orateurs)
-
-# 3. Quel parti parle le plus ? (Répartition politique)
-# On compte les interventions par Parti
-top_partis = df['Parti'].value_counts()
-print("\n--- RÉPARTITION PAR PARTI ---")
-print(top_partis)
-
-# 4. (Bonus Maths) : Longueur moyenne des interventions
-# On crée une nouvelle colonne 'Longueur' (nombre de caractères)
-df['Longueur'] = df['Texte'].str.len()
-moyenne = df['Longueur'].mean()
-print(f"\n--- LONGUEUR MOYENNE ---")
-print(f"Une intervention fait en moyenne {int(moyenne)} caractères.")
-
-# 5. Visualisation rapide (Graphique)
-# On crée un graphique à barres des partis
-plt.figure(figsize=(10, 6))
-top_partis.plot(kind='bar', color='skyblue')
-plt.title('Nombre d\'interventions par Parti politique')
-plt.xlabel('Parti')
-plt.ylabel('Nombre d\'interventions')
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.show()
\ No newline at end of file
+
+from corpus import CORPUS_CSV, CORPUS_PARQUET, LABEL_DEFAULTS, convert_date
+
+STATS_COLUMNS = ['Orateur', 'Parti', 'Date', 'Texte']
+DATE_BASCULE = datetime(2025, 5, 1)  # Début de la législature 2025-2029 (comme app.py)
+LEGISLATURES = [("2021-2025", None, DATE_BASCULE), ("2025-2029", DATE_BASCULE, None)]
+
+# Bornes des histogrammes de longueur (caractères) : identiques partout, donc les histogrammes s'additionnent.
+# Classes logarithmiques (+15 % de l'une à l'autre) : la médiane estimée reste à quelques pour cent près.
+LENGTH_BINS = np.concatenate([[0], np.geomspace(10, 1e6, 81), [np.inf]])
+
+
+def legislature_of(date_label):
+    date = convert_date(date_label)
+    for name, start, end in LEGISLATURES:
+        if (start is None or date >= start) and (end is None or date < end):
+            return name
+    return "Autre"
+
+
+# --- AGRÉGATS FUSIONNABLES ---
+class LengthStats:
+    """Distribution des longueurs d'un groupe : tout s'additionne d'un morceau à l'autre."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.total_sq = 0
+        self.min = None
+        self.max = None
+        self.hist = np.zeros(len(LENGTH_BINS) - 1, dtype=np.int64)
+
+    def update(self, count, total, total_sq, low, high, hist):
+        self.count += int(count)
+        self.total += int(total)
+        self.total_sq += int(total_sq)
+        self.min = int(low) if self.min is None else min(self.min, int(low))
+        self.max = int(high) if self.max is None else max(self.max, int(high))
+        self.hist += hist
+
+    def merge(self, other):
+        if other.count: self.update(other.count, other.total, other.total_sq, other.min, other.max, other.hist)
+
+    def median(self):
+        """Médiane estimée sur l'histogramme (interpolation linéaire dans la classe médiane)."""
+        if not self.count: return None
+        cumulative = np.cumsum(self.hist)
+        k = int(np.searchsorted(cumulative, self.count / 2))
+        low, high = LENGTH_BINS[k], min(LENGTH_BINS[k + 1], self.max)
+        before = cumulative[k - 1] if k else 0
+        return float(low + (high - low) * (self.count / 2 - before) / max(self.hist[k], 1))
+
+    def summary(self):
+        mean = self.total / self.count if self.count else None
+        variance = self.total_sq / self.count - mean ** 2 if self.count else None
+        return {"interventions": self.count, "caracteres": self.total, "moyenne": mean,
+                "ecart_type": float(np.sqrt(max(variance, 0))) if self.count else None,
+                "min": self.min, "max": self.max, "mediane_estimee": self.median(),
+                "histogramme": self.hist.tolist()}
+
+
+class CorpusStats:
+    """Agrégats partiels d'un morceau, d'un fichier ou de tout le corpus (update, puis merge)."""
+
+    def __init__(self):
+        self.n_interventions = 0
+        self.orateurs = Counter()
+        self.partis = Counter()
+        self.seances = {}
+        self.legislatures = {}
+        self._legislature_of = {}
+
+    def update(self, chunk):
+        """Ajoute un morceau du corpus (colonnes Orateur, Parti, Date, Texte)."""
+        chunk = chunk.copy()
+        for col in ('Orateur', 'Parti', 'Date'):
+            chunk[col] = chunk[col].astype(object).fillna(LABEL_DEFAULTS[col]).astype(str).str.strip()
+        lengths = chunk['Texte'].fillna("").astype(str).str.len().to_numpy(dtype=np.int64)
+
+        self.n_interventions += len(chunk)
+        self.orateurs.update(chunk['Orateur'].value_counts().to_dict())
+        self.partis.update(chunk['Parti'].value_counts().to_dict())
+
+        for date in chunk['Date'].unique():
+            if date not in self._legislature_of: self._legislature_of[date] = legislature_of(date)
+        legislatures = chunk['Date'].map(self._legislature_of)
+        for key, groups in ((chunk['Date'], self.seances), (legislatures, self.legislatures)):
+            self._update_lengths(groups, key.to_numpy(), lengths)
+
+    @staticmethod
+    def _update_lengths(groups, keys, lengths):
+        codes, names = pd.factorize(keys)
+        bins = np.searchsorted(LENGTH_BINS, lengths, side='right') - 1
+        n_groups, n_bins = len(names), len(LENGTH_BINS) - 1
+        # Une passe vectorisée par agrégat, pour tous les groupes du morceau à la fois
+        counts = np.bincount(codes, minlength=n_groups)
+        totals = np.bincount(codes, weights=lengths, minlength=n_groups)
+        totals_sq = np.bincount(codes, weights=lengths.astype(np.float64) ** 2, minlength=n_groups)
+        lows = np.full(n_groups, np.iinfo(np.int64).max)
+        np.minimum.at(lows, codes, lengths)
+        highs = np.zeros(n_groups, dtype=np.int64)
+        np.maximum.at(highs, codes, lengths)
+        hists = np.bincount(codes * n_bins + bins, minlength=n_groups * n_bins).reshape(n_groups, n_bins)
+        for i, name in enumerate(names):
+            groups.setdefault(name, LengthStats()).update(counts[i], totals[i], totals_sq[i], lows[i], highs[i],
+                                                          hists[i])
+
+    def merge(self, other):
+        self.n_interventions += other.n_interventions
+        self.orateurs.update(other.orateurs)
+        self.partis.update(other.partis)
+        for mine, theirs in ((self.seances, other.seances), (self.legislatures, other.legislatures)):
+            for name, stats in theirs.items():
+                mine.setdefault(name, LengthStats()).merge(stats)
+        self._legislature_of.update(other._legislature_of)
+        return self
+
+    def global_lengths(self):
+        total = LengthStats()
+        for stats in self.legislatures.values():
+            total.merge(stats)
+        return total
+
+    def report(self, top=5):
+        return {
+            "interventions": self.n_interventions,
+            "orateurs_uniques": len(self.orateurs),
+            "top_orateurs": dict(self.orateurs.most_common(top)),
+            "partis": dict(self.partis.most_common()),
+            "longueurs": self.global_lengths().summary(),
+            "legislatures": {name: s.summary() for name, s in sorted(self.legislatures.items())},
+            "seances": {name: s.summary() for name, s in
+                        sorted(self.seances.items(), key=lambda item: convert_date(item[0]))},
+            "bornes_histogramme": [float(b) if np.isfinite(b) else None for b in LENGTH_BINS],  # None : sans limite
+        }
+
+
+# --- LECTURE PAR MORCEAUX ---
+def iter_chunks(path, chunksize=100000):
+    """Morceaux d'un fichier du corpus (Parquet par lots, sinon CSV par tranches), colonnes utiles seulement."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        columns = [c for c in STATS_COLUMNS if c in parquet.schema_arrow.names]
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=lambda c: c in STATS_COLUMNS, dtype=str, encoding='utf-8-sig',
+                               chunksize=chunksize)
+
+
+def stats_for_file(path, chunksize=100000):
+    stats = CorpusStats()
+    for chunk in iter_chunks(path, chunksize):
+        for col in STATS_COLUMNS:
+            if col not in chunk.columns: chunk[col] = LABEL_DEFAULTS.get(col, "")
+        stats.update(chunk)
+    return stats
+
+
+def compute_stats(paths, workers=1, chunksize=100000):
+    """Fusion des agrégats de chaque fichier (un processus par fichier si workers > 1)."""
+    total = CorpusStats()
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            total.merge(stats_for_file(path, chunksize))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for stats in pool.map(stats_for_file, paths, [chunksize] * len(paths)):
+                total.merge(stats)
+    return total
+
+
+# --- SORTIES ---
+def write_outputs(stats, output_dir, top=5):
+    os.makedirs(output_dir, exist_ok=True)
+    report = stats.report(top)
+    with open(os.path.join(output_dir, "stats.json"), "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+
+    pd.DataFrame(stats.orateurs.most_common(), columns=['Orateur', 'Interventions']).to_csv(
+        os.path.join(output_dir, "orateurs.csv"), index=False, encoding='utf-8-sig')
+    pd.DataFrame(stats.partis.most_common(), columns=['Parti', 'Interventions']).to_csv(
+        os.path.join(output_dir, "partis.csv"), index=False, encoding='utf-8-sig')
+    for name, groups in (("seances", report["seances"]), ("legislatures", report["legislatures"])):
+        rows = [{"Groupe": key, **{k: v for k, v in summary.items() if k != "histogramme"}}
+                for key, summary in groups.items()]
+        pd.DataFrame(rows).to_csv(os.path.join(output_dir, f"{name}.csv"), index=False, encoding='utf-8-sig')
+
+    write_figures(stats, output_dir)
+    return report
+
+
+def write_figures(stats, output_dir):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")  # Pas d'écran : les graphiques partent dans des fichiers
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️ matplotlib absent : pas de graphiques.")
+        return
+
+    partis = pd.Series(dict(stats.partis.most_common()))
+    fig, ax = plt.subplots(figsize=(10, 6))
+    partis.plot(kind='bar', color='skyblue', ax=ax)
+    ax.set_title('Nombre d\'interventions par Parti politique')
+    ax.set_xlabel('Parti')
+    ax.set_ylabel('Nombre d\'interventions')
+    ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, "partis.png"), dpi=120)
+    plt.close(fig)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for name, lengths in sorted(stats.legislatures.items()):
+        # Part des interventions par classe, au milieu géométrique de chaque classe
+        ax.plot(np.sqrt(np.maximum(LENGTH_BINS[:-2], 1) * LENGTH_BINS[1:-1]), lengths.hist[:-1] / max(lengths.count, 1),
+                label=name)
+    ax.set_xscale('log')
+    ax.set_title('Longueur des interventions par législature')
+    ax.set_xlabel('Caractères (échelle logarithmique)')
+    ax.set_ylabel('Part des interventions')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, "longueurs.png"), dpi=120)
+    plt.close(fig)
+
+
+def default_files(directory):
+    for name in (CORPUS_PARQUET, CORPUS_CSV):
+        path = os.path.join(directory, name)
+        if os.path.exists(path): return [path]
+    return []
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Statistiques du corpus du Grand Conseil (lecture en flux).")
+    parser.add_argument("files", nargs="*", help="Fichiers CSV / Parquet du corpus (défaut : le corpus du projet)")
+    parser.add_argument("--workers", type=int, default=1, help="Fichiers traités en parallèle (défaut : 1, 0 = tous les cœurs)")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Lignes par morceau (défaut : 100000)")
+    parser.add_argument("--top", type=int, default=5, help="Nombre d'orateurs du classement (défaut : 5)")
+    parser.add_argument("--output", default="stats", help="Dossier de sortie (défaut : stats)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    files = args.files or default_files(os.path.dirname(os.path.abspath(__file__)))
+    if not files:
+        print("❌ Aucun fichier de corpus trouvé !")
+        exit()
+
+    t0 = time.perf_counter()
+    stats = compute_stats(files, workers=workers, chunksize=args.chunksize)
+    report = write_outputs(stats, args.output, top=args.top)
+
+    print(f"--- STATISTIQUES GLOBALES ({len(files)} fichier(s), {time.perf_counter() - t0:.1f} s) ---")
+    print(f"Nombre total d'interventions : {report['interventions']}")
+    print(f"Nombre d'orateurs uniques : {report['orateurs_uniques']}")
+    print(f"\n--- TOP {args.top} DES BAVARDS (Nombre d'interventions) ---")
+    for orateur, n in report['top_orateurs'].items():
+        print(f"{orateur:<40}{n:>8}")
+    print("\n--- RÉPARTITION PAR PARTI ---")
+    for parti, n in report['partis'].items():
+        print(f"{parti:<40}{n:>8}")
+    print("\n--- LONGUEUR MOYENNE ---")
+    if report['longueurs']['moyenne'] is not None:
+        print(f"Une intervention fait en moyenne {int(report['longueurs']['moyenne'])} caractères.")
+    for name, summary in report['legislatures'].items():
+        print(f"   {name} : {summary['interventions']} interventions, {int(summary['moyenne'])} caractères en moyenne")
+    print(f"\n🎉 Résultats -> '{args.output}/' (stats.json, CSV, partis.png, longueurs.png)")
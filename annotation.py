@@ -0,0 +1,176 @@
+"""Annotation hors-ligne du corpus avec spaCy (à lancer après scraper2.py).
+
+Chaque intervention passe une seule fois dans fr_core_news_sm via nlp.pipe (par lots, sur plusieurs
+processus, sans le parser ni la NER). On ne garde que les lemmes des catégories affichées par le panneau
+« Top des Mots » d'app.py, dans un Parquet compact (une ligne par mot, lemmes et POS en dictionnaire).
+
+Le Parquet des mots sert ensuite à matérialiser le « cube » des fréquences : nombre d'occurrences par
+(intervention, lemme, POS), déjà filtré par les mots vides de spaCy et CUSTOM_STOP_WORDS. Toute combinaison
+de filtres de l'app devient une somme exacte sur une matrice creuse, sans relire le texte.
+
+Usage : python annotation.py [--n-process 4] [--batch-size 64]
+        python annotation.py --cube-only   (recalcule le cube après un changement de CUSTOM_STOP_WORDS)
+"""
+import argparse
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from corpus import read_artifact, read_corpus, write_artifact
+
+SPACY_MODEL = "fr_core_news_sm"
+TOKENS_ARTIFACT = "tokens"
+LEMMA_COUNTS_ARTIFACT = "lemma_counts"
+
+# Catégories proposées par les cases à cocher (Noms, Adj., Verbes, Noms Pr.)
+CONTENT_POS = ("NOUN", "ADJ", "VERB", "PROPN")
+
+# TA LISTE NOIRE (Ajoute des mots ici pour les cacher)
+CUSTOM_STOP_WORDS = {
+    'monsieur', 'madame', 'président', 'présidente', 'député', 'députée',
+    'conseiller', 'conseillère', 'état', 'grand', 'conseil', 'parole',
+    'merci', 'voix', 'vote', 'voter', 'année', 'années', 'fois', 'jour',
+    'aujourd', 'hui', 'chose', 'question', 'réponse', 'projet', 'loi',
+    'rapport', 'commission', 'groupe', 'nom', 'objet', 'alinéa', 'article',
+    'chers', 'chères', 'collègues', 'canton', 'république', 'neuchâtel'
+}
+
+# Découpage des vectoriseurs (topics.py, similarity.py) : mots d'au moins 3 lettres
+# (pas de chiffres : numéros d'objets, montants, dates)
+TOKEN_PATTERN = r'(?u)\b[^\W\d_]{3,}\b'
+TOKEN_RE = re.compile(TOKEN_PATTERN)
+
+
+def stop_words():
+    """Mots vides des vectoriseurs : ceux de spaCy et CUSTOM_STOP_WORDS, découpés par TOKEN_PATTERN."""
+    from spacy.lang.fr.stop_words import STOP_WORDS  # Liste seule : pas besoin du modèle spaCy
+
+    # Découpés comme les textes (« quelqu'un » -> « quelqu »), sinon CountVectorizer les ignore en partie
+    return sorted({word for entry in set(STOP_WORDS) | CUSTOM_STOP_WORDS for word in TOKEN_RE.findall(entry)})
+
+
+def load_spacy_model(model_name=SPACY_MODEL):
+    import spacy
+
+    try:
+        # On essaie de charger le modèle
+        return spacy.load(model_name)
+    except OSError:
+        # Si ça rate (modèle absent), on le télécharge via la ligne de commande
+        from spacy.cli import download
+        download(model_name)
+        return spacy.load(model_name)
+
+
+def is_content_token(token):
+    return token.pos_ in CONTENT_POS and not token.is_punct and not token.is_space
+
+
+def annotate_texts(texts, nlp=None, n_process=1, batch_size=64):
+    """Lemmes/POS des mots de contenu, une ligne par mot : row_id, lemma, pos, is_stop."""
+    nlp = nlp or load_spacy_model()
+    # Seuls le tagging et la lemmatisation servent : le parser et la NER sont coupés
+    disabled = [name for name in ("parser", "ner") if name in nlp.pipe_names]
+    nlp.max_length = max(nlp.max_length, max((len(t) for t in texts), default=0) + 1)
+
+    row_ids, lemmas, tags, stops = [], [], [], []
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disabled)
+    for row_id, doc in enumerate(docs):
+        for token in doc:
+            if not is_content_token(token): continue
+            row_ids.append(row_id)
+            lemmas.append(token.lemma_.lower())
+            tags.append(token.pos_)
+            stops.append(token.is_stop)
+
+    return pd.DataFrame({
+        'row_id': pd.array(row_ids, dtype='int32'),
+        'lemma': pd.Categorical(lemmas),
+        'pos': pd.Categorical(tags, categories=list(CONTENT_POS)),
+        'is_stop': pd.array(stops, dtype='bool'),
+    })
+
+
+# --- CUBE DES FRÉQUENCES ---
+def build_lemma_counts(tokens):
+    """(row_id, lemme, POS) -> nombre d'occurrences, après les filtres du panneau « Top des Mots »."""
+    lemmas = tokens['lemma'].astype(str)
+    keep = ~tokens['is_stop'] & (lemmas.str.len() > 2) & ~lemmas.isin(CUSTOM_STOP_WORDS)
+    counts = (tokens[keep].groupby(['row_id', 'lemma', 'pos'], observed=True)
+              .size().rename('count').reset_index())
+    counts['count'] = counts['count'].astype('int32')
+    return counts
+
+
+class LemmaCube:
+    """Matrice creuse interventions x (lemme, POS) ; les sommes se font sur les seules lignes filtrées."""
+
+    def __init__(self, counts, n_rows):
+        from scipy import sparse
+
+        features = counts[['lemma', 'pos']].drop_duplicates().reset_index(drop=True)
+        feature_index = pd.MultiIndex.from_frame(features.astype(str))
+        columns = feature_index.get_indexer(pd.MultiIndex.from_frame(counts[['lemma', 'pos']].astype(str)))
+
+        self.matrix = sparse.csr_matrix(
+            (counts['count'].to_numpy(dtype=np.int64), (counts['row_id'].to_numpy(), columns)),
+            shape=(n_rows, len(features)),
+        )
+        lemma_codes, self.lemmas = pd.factorize(features['lemma'].astype(str))
+        self.feature_lemma = lemma_codes
+        self.feature_pos = features['pos'].astype(str).to_numpy()
+
+    def top(self, row_ids, selected_tags, n=20):
+        """Top n des lemmes (somme exacte sur row_ids, POS cochés confondus)."""
+        rows = np.asarray(row_ids)
+        rows = rows[rows < self.matrix.shape[0]]
+        totals = np.asarray(self.matrix[rows].sum(axis=0)).ravel()
+        totals = np.where(np.isin(self.feature_pos, selected_tags), totals, 0)
+        per_lemma = np.bincount(self.feature_lemma, weights=totals, minlength=len(self.lemmas))
+
+        k = min(n, int((per_lemma > 0).sum()))
+        if k == 0: return []
+        threshold = -np.partition(-per_lemma, k - 1)[k - 1]
+        candidates = np.flatnonzero(per_lemma >= threshold)  # Les ex-aequo du k-ième sont tous départagés
+        # Tri par fréquence décroissante puis ordre alphabétique (résultat stable d'un appel à l'autre)
+        best = sorted(candidates, key=lambda j: (-per_lemma[j], self.lemmas[j]))[:n]
+        return [(self.lemmas[j], int(per_lemma[j])) for j in best]
+
+
+def load_lemma_cube(directory, n_rows):
+    counts = read_artifact(directory, LEMMA_COUNTS_ARTIFACT)
+    if counts is None: return None
+    return LemmaCube(counts, n_rows)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Annotation spaCy hors-ligne du corpus du Grand Conseil.")
+    parser.add_argument("--n-process", type=int, default=1, help="Processus spaCy (défaut : 1, 0 = tous les cœurs)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Taille des lots nlp.pipe (défaut : 64)")
+    parser.add_argument("--cube-only", action="store_true",
+                        help="Ne recalcule que le cube des fréquences à partir des mots déjà annotés")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    n_process = args.n_process if args.n_process > 0 else (os.cpu_count() or 1)
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    tokens = read_artifact(directory, TOKENS_ARTIFACT) if args.cube_only else None
+    if tokens is None:
+        df = read_corpus(directory)
+        texts = df['Texte'].fillna("").astype(str).tolist()
+        print(f"🧠 Annotation de {len(texts)} interventions ({n_process} processus)...")
+
+        t0 = time.perf_counter()
+        tokens = annotate_texts(texts, n_process=n_process, batch_size=args.batch_size)
+        path = write_artifact(tokens, directory, TOKENS_ARTIFACT)
+        print(f"🎉 {len(tokens)} mots annotés en {time.perf_counter() - t0:.1f} s -> '{path}'")
+
+    counts = build_lemma_counts(tokens)
+    path = write_artifact(counts, directory, LEMMA_COUNTS_ARTIFACT)
+    print(f"📦 Cube des fréquences : {len(counts)} cellules -> '{path}'")
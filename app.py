@@ -1,105 +1,132 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import re
 from collections import Counter
+import hashlib
 import os
 from datetime import datetime
 import altair as alt
-from textblob import Blobber
-from textblob_fr import PatternTagger, PatternAnalyzer
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
-import spacy
+
+import annotation
+from chronology import ChronologyIndex
+import compass
+import corpus_db
+import corpus_store
+import similarity
+import tone
+import topics
+from annotation import CUSTOM_STOP_WORDS
+from corpus import COLUMNS, corpus_version, load_corpus
+from filter_index import build_filter_index
+from search_index import SearchIndex, query_terms
+from term_matrix import TermMatrix
 
 # 1. CONFIGURATION DE LA PAGE
 st.set_page_config(page_title="Grand Conseil Explorer", page_icon="🏛️", layout="wide")
 
-# --- OUTILS DE GESTION DES DATES ---
-MOIS_MAP = {
-    "janvier": 1, "février": 2, "mars": 3, "avril": 4, "mai": 5, "juin": 6,
-    "juillet": 7, "août": 8, "septembre": 9, "octobre": 10, "novembre": 11, "décembre": 12
-}
-
-
-def convert_date(date_str):
-    """Transforme 'Septembre 2025' ou '01.09.2025' en objet datetime pour le tri."""
-    s = str(date_str).lower()
-
-    # 1. Recherche d'une année (2020-2030)
-    match_year = re.search(r'20\d{2}', s)
-    if not match_year: return datetime(2000, 1, 1)
-    annee = int(match_year.group(0))
-
-    # 2. Détection du mois
-    mois = 1
-    if 'jan' in s:
-        mois = 1
-    elif 'f' in s and 'v' in s:
-        mois = 2
-    elif 'mar' in s:
-        mois = 3
-    elif 'avr' in s:
-        mois = 4
-    elif 'mai' in s:
-        mois = 5
-    elif 'juin' in s:
-        mois = 6
-    elif 'juil' in s:
-        mois = 7
-    elif 'ao' in s:
-        mois = 8
-    elif 'sep' in s:
-        mois = 9
-    elif 'oct' in s:
-        mois = 10
-    elif 'nov' in s:
-        mois = 11
-    elif 'déc' in s or 'dec' in s:
-        mois = 12
-
-    return datetime(annee, mois, 1)
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 # 2. CHARGEMENT DES DONNÉES
-@st.cache_data
-def load_data():
-    try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        file_path = os.path.join(current_dir, "discours_grand_conseil_complet.csv")
-
-        # Lecture tolérante (accepte virgules ou points-virgules, ignore les lignes cassées)
-        df = pd.read_csv(
-            file_path,
-            sep=None,
-            engine='python',
-            dtype={'Objet': str},
-            on_bad_lines='skip',
-            encoding='utf-8-sig'
-        )
+@st.cache_resource
+def load_store(corpus_key):
+    """Store projeté en mémoire écrit par scraper2.py (None s'il manque ou date d'une autre version du corpus)."""
+    return corpus_store.open_store(DATA_DIR)
+
+
+@st.cache_resource
+def load_database(corpus_key):
+    """Base SQLite écrite par scraper2.py (None si absente ou d'une autre version du corpus)."""
+    return corpus_db.open_database(DATA_DIR)
 
-        df['Texte'] = df['Texte'].fillna("").astype(str)
-        if 'Date' not in df.columns: df['Date'] = "Janvier 2000"
-        if 'Parti' not in df.columns: df['Parti'] = "Indéterminé"
-        if 'Orateur' not in df.columns: df['Orateur'] = "Inconnu"
 
-        # Nettoyage
-        df['Parti'] = df['Parti'].astype(str).str.strip()
-        df['Orateur'] = df['Orateur'].astype(str).str.strip()
-        df['Objet'] = df['Objet'].astype(str).str.strip()
+@st.cache_resource
+def load_full_corpus(corpus_key):
+    """Corpus complet, textes compris : seulement sans store ni base pour fournir les textes."""
+    return load_corpus(DATA_DIR)
 
-        # Création de la colonne de date technique pour le tri
-        df['Date_dt'] = df['Date'].apply(convert_date)
-        df = df.sort_values(by='Date_dt', ascending=False)
 
-        return df
+@st.cache_resource
+def load_data(corpus_key):
+    """Libellés du corpus (sans texte), une seule copie par processus, partagée entre les sessions."""
+    try:
+        store = load_store(corpus_key)
+        if store is not None: return store.frame(text=False)
+        db = load_database(corpus_key)
+        if db is not None: return db.labels()
+        # Parquet typé si scraper2.py l'a produit, sinon le CSV historique
+        return load_full_corpus(corpus_key).drop(columns='Texte')
 
     except Exception as e:
-        st.error(f"❌ Erreur critique de lecture du CSV : {e}")
+        st.error(f"❌ Erreur critique de lecture du corpus : {e}")
         return pd.DataFrame()
 
 
-# Chargement initial
-df_full = load_data()
+@st.cache_resource
+def load_texts(corpus_key):
+    """Textes alignés sur load_data : vue sur le fichier projeté du store, lecture à la demande dans la base,
+    ou, sans l'un ni l'autre, colonne du corpus chargé en mémoire."""
+    store = load_store(corpus_key)
+    if store is not None: return pd.Series(store.texts(), index=load_data(corpus_key).index, copy=False)
+    db = load_database(corpus_key)
+    if db is not None: return corpus_db.DatabaseTexts(db, load_data(corpus_key).index)
+    return load_full_corpus(corpus_key)['Texte']
+
+
+@st.cache_resource
+def load_search_index(_texts, corpus_key):
+    """Index inversé construit une fois par processus (partagé entre les sessions) et par version du corpus."""
+    return SearchIndex(_texts)
+
+
+@st.cache_resource
+def load_term_matrix(_texts, corpus_key):
+    """Matrice interventions x mots (term_matrix.py), partagée par la boussole et la chronologie."""
+    return TermMatrix(_texts)
+
+
+@st.cache_resource
+def load_chronology(_df, _texts, corpus_key):
+    return ChronologyIndex(load_term_matrix(_texts, corpus_key), _df)
+
+
+@st.cache_resource
+def load_compass_scores(_texts, corpus_key):
+    return compass.intervention_scores(load_term_matrix(_texts, corpus_key))
+
+
+@st.cache_resource
+def load_tone(corpus_key):
+    """Ton de chaque intervention précalculé par tone.py (None s'il manque ou date d'un autre corpus)."""
+    return tone.load_tone(DATA_DIR)
+
+
+@st.cache_resource
+def load_filter_index(corpus_key):
+    """Index par législature, orateur, parti et objet (filter_index.py), construits une fois au chargement."""
+    return build_filter_index(load_data(corpus_key), load_store(corpus_key))
+
+
+def corpus_rows(positions, text=True):
+    """Lignes du corpus aux positions données ; le texte n'est lu que pour ces lignes."""
+    rows = df_full.iloc[positions]
+    if not text: return rows
+    return rows.assign(Texte=corpus_texts.take(positions).array)[COLUMNS + ['Date_dt']]
+
+
+@st.cache_resource
+def load_period(corpus_key, periods):
+    """Libellés (sans texte) des interventions de la période, lus dans l'index des dates."""
+    return corpus_rows(load_filter_index(corpus_key).period_rows(list(periods)), text=False)
+
+
+# Chargement initial : libellés en mémoire, textes lus à la demande (store, base SQLite ou corpus chargé)
+df_full = load_data(corpus_version(DATA_DIR))
+corpus_texts = load_texts(corpus_version(DATA_DIR))
+# Filtres de la barre latérale : toujours les index précalculés ; la base ne sert qu'à la recherche (FTS5)
+db = load_database(corpus_version(DATA_DIR))
+filter_index = load_filter_index(corpus_version(DATA_DIR))
 
 if df_full.empty:
     st.warning("Le fichier CSV est vide.")
@@ -120,50 +147,53 @@ if not check_actuelle and not check_precedente:
     st.warning("Veuillez cocher au moins une législature.")
     st.stop()
 
-# Filtrage par date
-mask_leg = pd.Series([False] * len(df_full), index=df_full.index)
-
-if check_actuelle:
-    mask_leg = mask_leg | (df_full['Date_dt'] >= DATE_BASCULE)
-if check_precedente:
-    mask_leg = mask_leg | (df_full['Date_dt'] < DATE_BASCULE)
+periods = []
+if check_actuelle: periods.append((DATE_BASCULE, None))
+if check_precedente: periods.append((None, DATE_BASCULE))
 
-df = df_full[mask_leg] # df contient maintenant uniquement les données choisies
+# Tranches de l'index des dates, libellés seulement (mis en cache par législature)
+df = load_period(corpus_version(DATA_DIR), tuple(periods))
 
 if df.empty:
     st.warning("Aucune donnée trouvée pour la période sélectionnée.")
     st.stop()
 
 # --- B. SÉLECTEUR ORATEUR & OBJET ---
-# On recalcule les listes pour ne montrer que ce qui existe dans la période choisie
-liste_orateurs = ["Tous les membres"] + sorted(df['Orateur'].unique())
+# Seulement ce qui existe dans la période choisie (listes triées une fois par législature)
+liste_orateurs = ["Tous les membres"] + filter_index.options('Orateur', periods)
 selected_orateur = st.sidebar.selectbox("👤 Choisir un orateur", liste_orateurs)
 
-liste_objets = ["Tous les objets"] + sorted(df['Objet'].unique())
+liste_objets = ["Tous les objets"] + filter_index.options('Objet', periods)
 selected_objet = st.sidebar.selectbox("📂 Choisir un objet", liste_objets)
 
 st.sidebar.markdown("---")
-search_query = st.sidebar.text_input("🔎 Rechercher un mot-clé")
+search_query = st.sidebar.text_input("🔎 Rechercher un mot-clé", help="Combinez avec ET / OU, ex : climat ET budget")
 case_sensitive = st.sidebar.checkbox("Respecter la casse", value=False)
 
 # 4. LOGIQUE DE FILTRAGE
-df_filtered = df.copy()
+# Intersection des index précalculés : un tableau de positions, matérialisé une seule fois à la fin
+positions = filter_index.select(
+    periods=periods,
+    objet=None if selected_objet == "Tous les objets" else selected_objet,
+    orateur=None if selected_orateur == "Tous les membres" else selected_orateur,
+    exclude_parti='Présidence' if selected_orateur == "Tous les membres" else None,
+)
 
-if selected_objet != "Tous les objets":
-    df_filtered = df_filtered[df_filtered['Objet'] == selected_objet]
+if search_query:
+    # Opérateurs : "a ET b", "a OU b" ; sinon l'expression est cherchée telle quelle.
+    if db is not None:
+        # Index plein texte (FTS5) de la base
+        matching_ids = db.search(search_query, case_sensitive=case_sensitive)
+    else:
+        # Index inversé (même résultat que str.contains, sans parcourir tout le corpus)
+        search_index = load_search_index(corpus_texts, corpus_version(DATA_DIR))
+        matching_ids = search_index.search(search_query, case_sensitive=case_sensitive)
+    positions = positions[np.isin(df_full.index.to_numpy()[positions], matching_ids)]
 
-if selected_orateur != "Tous les membres":
-    df_filtered = df_filtered[df_filtered['Orateur'] == selected_orateur]
-else:
-    df_filtered = df_filtered[df_filtered['Parti'] != 'Présidence']
+df_filtered = corpus_rows(positions)
 
-if search_query:
-    # --- CORRECTION ICI ---
-    # On utilise explicitement l'argument 'case' de Pandas.
-    # Si case_sensitive est False (non coché) -> case=False (insensible à la casse)
-    # Si case_sensitive est True (coché) -> case=True (sensible)
-    mask = df_filtered['Texte'].str.contains(search_query, case=case_sensitive, regex=False)
-    df_filtered = df_filtered[mask]
+# Filtres actifs : la pagination de la liste revient à la page 1 dès que l'un d'eux change
+active_filters = (check_actuelle, check_precedente, selected_orateur, selected_objet, search_query, case_sensitive)
 
 # 5. SIDEBAR STATS
 if selected_orateur != "Tous les membres" and not df_filtered.empty:
@@ -199,36 +229,37 @@ if df_filtered.empty:
 # ==========================================
 # 7. ANALYSE SÉMANTIQUE (CASES À COCHER + SPACY)
 # ==========================================
-import spacy
-from collections import Counter
+@st.cache_resource
+def load_spacy_model():
+    return annotation.load_spacy_model()
 
 
 @st.cache_resource
-def load_spacy_model():
-    model_name = "fr_core_news_sm"
-    try:
-        # On essaie de charger le modèle
-        return spacy.load(model_name)
-    except OSError:
-        # Si ça rate (modèle absent), on le télécharge via la ligne de commande
-        from spacy.cli import download
-        download(model_name)
-        return spacy.load(model_name)
-
-
-# TA LISTE NOIRE (Ajoute des mots ici pour les cacher)
-CUSTOM_STOP_WORDS = {
-    'monsieur', 'madame', 'président', 'présidente', 'député', 'députée',
-    'conseiller', 'conseillère', 'état', 'grand', 'conseil', 'parole',
-    'merci', 'voix', 'vote', 'voter', 'année', 'années', 'fois', 'jour',
-    'aujourd', 'hui', 'chose', 'question', 'réponse', 'projet', 'loi',
-    'rapport', 'commission', 'groupe', 'nom', 'objet', 'alinéa', 'article',
-    'chers', 'chères', 'collègues', 'canton', 'république', 'neuchâtel'
-}
+def load_lemma_cube(corpus_key, n_rows):
+    """Cube des fréquences précalculé par annotation.py (None s'il manque ou date d'un autre corpus)."""
+    return annotation.load_lemma_cube(DATA_DIR, n_rows)
 
-if not df_filtered.empty:
+
+def live_top_words(texts, selected_tags):
+    """Ancien calcul en direct, sur un échantillon du texte (quand annotation.py n'a pas tourné)."""
     nlp = load_spacy_model()
+    # On prend un échantillon du texte
+    full_text = " ".join(texts.tolist())[:150000]
+    doc = nlp(full_text)
+    mots_propres = []
+
+    for token in doc:
+        mot_racine = token.lemma_.lower()
+
+        if token.pos_ in selected_tags:
+            if not token.is_stop and not token.is_punct and len(mot_racine) > 2:
+                if mot_racine not in CUSTOM_STOP_WORDS:
+                    mots_propres.append(mot_racine)
 
+    return Counter(mots_propres).most_common(20)
+
+
+if not df_filtered.empty:
     st.subheader("📊 Analyse du vocabulaire")
 
     col1, col2 = st.columns(2)
@@ -253,23 +284,15 @@ if not df_filtered.empty:
         if check_verb: selected_tags.append("VERB")
         if check_propn: selected_tags.append("PROPN")
 
-        if nlp and selected_tags:
-            # On prend un échantillon du texte
-            full_text = " ".join(df_filtered['Texte'].tolist())[:150000]
-
-            with st.spinner("Analyse..."):
-                doc = nlp(full_text)
-                mots_propres = []
-
-                for token in doc:
-                    mot_racine = token.lemma_.lower()
-
-                    if token.pos_ in selected_tags:
-                        if not token.is_stop and not token.is_punct and len(mot_racine) > 2:
-                            if mot_racine not in CUSTOM_STOP_WORDS:
-                                mots_propres.append(mot_racine)
-
-                word_counts = Counter(mots_propres).most_common(20)
+        if selected_tags:
+            lemma_cube = load_lemma_cube(corpus_version(DATA_DIR), len(df_full))
+            if lemma_cube is not None:
+                # Somme exacte sur toutes les interventions filtrées (plus d'échantillon de 150k caractères)
+                word_counts = lemma_cube.top(df_filtered.index, selected_tags)
+            else:
+                st.caption("ℹ️ Annotations absentes : analyse d'un échantillon (lancez `python annotation.py`).")
+                with st.spinner("Analyse..."):
+                    word_counts = live_top_words(df_filtered['Texte'], selected_tags)
 
             if word_counts:
                 df_words = pd.DataFrame(word_counts, columns=['Mot', 'Fréquence'])
@@ -289,20 +312,21 @@ if not df_filtered.empty:
     with col2:
         if selected_orateur == "Tous les membres":
             st.write("**Répartition par Parti :**")
-            st.bar_chart(df_filtered['Parti'].value_counts())
+            st.bar_chart(df_filtered['Parti'].value_counts().loc[lambda c: c > 0])
         else:
             avg_len = df_filtered['Texte'].str.len().mean()
             st.metric("Longueur moyenne", f"{int(avg_len)} caractères")
             st.divider()
 
             st.write("### 🧠 Analyse du Ton")
-            from textblob import Blobber
-            from textblob_fr import PatternTagger, PatternAnalyzer
-
-            tb = Blobber(pos_tagger=PatternTagger(), analyzer=PatternAnalyzer())
-
-            blob = tb(full_text[:5000])  # On réutilise un bout du texte
-            subjectivity = blob.sentiment[1]
+            tone_scores = load_tone(corpus_version(DATA_DIR))
+            if tone_scores is not None:
+                # Moyenne pondérée par la longueur, sur toutes les interventions filtrées
+                _, subjectivity = tone.weighted_tone(tone_scores, df_filtered.index)
+            else:
+                # Sans tone.py : calcul en direct sur un bout du texte
+                full_text = " ".join(df_filtered['Texte'].tolist())[:5000]
+                subjectivity = tone.score_texts([full_text])[0][1]
             score_percent = int(subjectivity * 100)
 
             if score_percent < 15:
@@ -325,87 +349,9 @@ if not df_filtered.empty:
     st.subheader("🧭 La Boussole Politique")
     st.caption("Positionnement relatif calculé sur le vocabulaire (centré sur la moyenne du conseil).")
 
-    # 1. LISTES AFFINÉES (POUR ÉVITER LE BIAIS "RÉGULATEUR")
-    # J'ai retiré "loi", "canton", "état", "commune" qui polluaient tout.
-
-    # AXE X : ÉCONOMIE (Gauche vs Droite Éco)
-    mots_regulateur = [
-        'subvention', 'aide', 'prestation', 'social', 'protection', 'solidaire',
-        'redistribution', 'taxe', 'impôt', 'contrainte', 'interdiction', 'service public',
-        'salarié', 'syndicat', 'précarité', 'soutien', 'bénéficiaire'
-    ]
-    mots_liberale = [
-        'liberté', 'privé', 'entreprise', 'pme', 'marché', 'concurrence',
-        'initiative', 'baisse', 'moins', 'responsabilité', 'coût', 'efficience',
-        'efficacité', 'dérégulation', 'attractivité', 'fiscalité', 'investisseur',
-        'frein', 'charge', 'charges', 'dynamisme'
-    ]
-
-    # AXE Y : SOCIÉTÉ (Conservateur vs Progressiste)
-    mots_progressiste = [
-        'climat', 'environnement', 'durabilité', 'écologie', 'biodiversité',
-        'transition', 'égalité', 'genre', 'ouverture', 'diversité', 'inclusion',
-        'culture', 'innovation', 'réforme', 'monde', 'europe', 'accueil'
-    ]
-    mots_conservateur = [
-        'sécurité', 'ordre', 'police', 'armée', 'tradition', 'patrimoine',
-        'histoire', 'racines', 'famille', 'suisse', 'souveraineté', 'indépendance',
-        'stabilité', 'prudence', 'rigueur', 'frontière', 'identit', 'héritage'
-    ]
-
-
-    # 2. FONCTION DE CALCUL (Simple compte)
-    def calculate_raw_score(text):
-        t = str(text).lower()
-        # On utilise une petite astuce pour éviter de compter "état" dans "état civil"
-        # Mais pour l'instant, le compte simple suffit si les listes sont bonnes
-        c_reg = sum(t.count(w) for w in mots_regulateur)
-        c_lib = sum(t.count(w) for w in mots_liberale)
-        c_prog = sum(t.count(w) for w in mots_progressiste)
-        c_cons = sum(t.count(w) for w in mots_conservateur)
-
-        total = max(len(t.split()), 1)  # Évite division par 0
-
-        # Score brut (Densité)
-        raw_x = (c_lib - c_reg) / total * 10000
-        raw_y = (c_prog - c_cons) / total * 10000
-
-        return raw_x, raw_y
-
-
-    # 3. CALCUL GLOBAL ET NORMALISATION (LE SECRET POUR QUE ÇA MARCHE)
-    @st.cache_data
-    def get_centered_positions(df_source):
-        # A. On calcule les scores bruts pour tout le monde
-        data = []
-        grouped = df_source.groupby('Orateur')['Texte'].apply(lambda x: " ".join(x)).reset_index()
-
-        for index, row in grouped.iterrows():
-            if row['Orateur'] in ["Inconnu", "Tous les membres"]: continue
-            rx, ry = calculate_raw_score(row['Texte'])
-
-            # On récupère le parti (le plus fréquent pour cet orateur)
-            partis = df_source[df_source['Orateur'] == row['Orateur']]['Parti']
-            parti_top = partis.value_counts().idxmax() if not partis.empty else "Indéterminé"
-
-            data.append({'Orateur': row['Orateur'], 'Parti': parti_top, 'Raw_X': rx, 'Raw_Y': ry})
-
-        df_res = pd.DataFrame(data)
-
-        if df_res.empty: return df_res
-
-        # B. ON CENTRE LE GRAPHIQUE (Moyenne = 0)
-        # Ça force les points à s'étaler autour du centre
-        mean_x = df_res['Raw_X'].mean()
-        mean_y = df_res['Raw_Y'].mean()
-
-        df_res['X'] = df_res['Raw_X'] - mean_x
-        df_res['Y'] = df_res['Raw_Y'] - mean_y
-
-        return df_res
-
-
-    compass_df = get_centered_positions(df)
+    # Scores par intervention calculés une fois (compass.py) : on ne fait plus que les additionner par orateur
+    compass_scores = load_compass_scores(corpus_texts, corpus_version(DATA_DIR))
+    compass_df = compass.centered_positions(df, compass_scores)
 
     # 4. AFFICHAGE DU GRAPHIQUE
     if not compass_df.empty:
@@ -463,48 +409,138 @@ if not df_filtered.empty:
         - Un point en **haut** signifie "Plus progressiste que la moyenne".
         """)
 
+# ==========================================
+# 8b. LES THÈMES DES DÉBATS (LDA) 🗂️
+# ==========================================
+@st.cache_resource
+def load_doc_topics(corpus_key, n_rows):
+    """Thèmes de chaque intervention précalculés par topics.py (None s'ils manquent ou datent d'un autre corpus)."""
+    return topics.load_doc_topics(DATA_DIR, n_rows)
+
+
+if not df_filtered.empty:
+    st.markdown("---")
+    st.subheader("🗂️ Les Thèmes des débats")
+    doc_topics = load_doc_topics(corpus_version(DATA_DIR), len(df_full))
+
+    if doc_topics is None:
+        st.caption("ℹ️ Thèmes absents : lancez `python topics.py` après le scraping.")
+    else:
+        st.caption("Part de chaque thème (modèle LDA), pondérée par la longueur des interventions.")
+        # Simples sommes sur les distributions précalculées : aucun modèle n'est ajusté ici
+        theme_labels = doc_topics.labels()
+        df_themes = pd.DataFrame({
+            'Thème': theme_labels * 2,
+            'Part': np.concatenate([doc_topics.mix(df_filtered.index), doc_topics.mix(df.index)]),
+            'Corpus': ['Sélection'] * len(theme_labels) + ['Tout le conseil'] * len(theme_labels),
+        })
+        theme_chart = alt.Chart(df_themes).mark_bar().encode(
+            x=alt.X('Part', axis=alt.Axis(format='%')),
+            y=alt.Y('Thème', sort=None),
+            yOffset='Corpus',
+            color=alt.Color('Corpus', scale=alt.Scale(domain=['Sélection', 'Tout le conseil'], range=['red', 'gray'])),
+            tooltip=['Thème', 'Corpus', alt.Tooltip('Part', format='.1%')]
+        )
+        st.altair_chart(theme_chart, use_container_width=True)
+
+        if selected_orateur == "Tous les membres":
+            st.write("**Thèmes par Parti :**")
+            by_party = doc_topics.mix_by(df_filtered.index, df_filtered['Parti'])
+            df_heat = by_party.rename_axis('Parti').reset_index().melt('Parti', var_name='Thème', value_name='Part')
+            heat = alt.Chart(df_heat).mark_rect().encode(
+                x=alt.X('Thème', sort=theme_labels, axis=alt.Axis(labelAngle=-40)),
+                y='Parti',
+                color=alt.Color('Part', scale=alt.Scale(scheme='blues'), legend=alt.Legend(format='%')),
+                tooltip=['Parti', 'Thème', alt.Tooltip('Part', format='.1%')]
+            )
+            st.altair_chart(heat, use_container_width=True)
+
 #8 : LISTE INTERVENTIONS
 st.markdown("---")
 st.header("📝 Liste des interventions")
 
+PAGE_SIZES = [10, 25, 50, 100]
+
+
+def page_slice(n_items, key, filters):
+    """Choix de la taille de page et du numéro de page ; renvoie la tranche d'éléments à afficher.
+
+    filters : valeurs des filtres actifs (et de la recherche) ; tout changement ramène à la page 1.
+    """
+    col_taille, col_page = st.columns([1, 3])
+    with col_taille:
+        page_size = st.selectbox("Par page", PAGE_SIZES, index=1, key=f"{key}_taille")
+    n_pages = max(1, -(-n_items // page_size))
+    # La clé change avec les filtres (même si le nombre de pages ne bouge pas) et avec la taille de page
+    filters_key = hashlib.md5(repr(filters).encode("utf-8")).hexdigest()[:12]
+    with col_page:
+        page = st.number_input(f"Page (sur {n_pages})", min_value=1, max_value=n_pages, value=1,
+                               key=f"{key}_page_{filters_key}_{n_pages}")
+    start = (page - 1) * page_size
+    return slice(start, min(start + page_size, n_items))
+
+
+@st.cache_resource
+def load_similarity_index(corpus_key):
+    """Matrice TF-IDF précalculée par similarity.py (None si elle manque ou date d'un autre corpus)."""
+    return similarity.load_similarity_index(DATA_DIR)
+
+
+similarity_index = load_similarity_index(corpus_version(DATA_DIR))
+
+
+def show_similar(row_id, k=5):
+    """Case à cocher sous une intervention : ses k voisines les plus proches dans tout le corpus."""
+    if similarity_index is None: return
+    if not st.checkbox("🔗 Interventions similaires", key=f"similaires_{row_id}"): return
+    neighbours = similarity_index.neighbours(row_id, k=k)
+    if not neighbours:
+        st.caption("Aucune intervention similaire.")
+    voisines = corpus_rows(df_full.index.get_indexer([neighbour_id for neighbour_id, _ in neighbours]))
+    for (_, score), voisine in zip(neighbours, voisines.itertuples()):
+        st.markdown(f"**{score:.0%}** · 📅 {voisine.Date} | 👤 {voisine.Orateur} ({voisine.Parti}) "
+                    f"| 📂 {voisine.Objet}")
+        st.caption(voisine.Texte[:300] + ("…" if len(voisine.Texte) > 300 else ""))
+
+
 if search_query:
     # CAS 1 : RECHERCHE ACTIVE
-    # On affiche tout directement pour voir les résultats
     st.subheader(f"Résultats trouvés : {len(df_filtered)}")
+    page = df_filtered.iloc[page_slice(len(df_filtered), "recherche", active_filters)]
 
-    for index, row in df_filtered.iterrows():
-        titre = f"📅 {row['Date']} | {row['Orateur']} | 📂 {row['Objet']}"
-        with st.expander(titre):
-            # Surlignage du mot-clé trouvé
-            flags = 0 if case_sensitive else re.IGNORECASE
-            # On échappe la query pour éviter les erreurs regex s'il y a des parenthèses
-            safe_query = re.escape(search_query)
-            texte_surligne = re.sub(f"({safe_query})", r"**\1**", row['Texte'], flags=flags)
+    # Surlignage des termes trouvés, seulement sur la page affichée
+    flags = 0 if case_sensitive else re.IGNORECASE
+    # On échappe les termes pour éviter les erreurs regex s'il y a des parenthèses
+    surlignage = re.compile("(" + "|".join(re.escape(t) for t in query_terms(search_query)) + ")", flags)
 
-            st.markdown(f"**Parti :** {row['Parti']}")
-            st.markdown(texte_surligne)
+    for row in page.itertuples():
+        titre = f"📅 {row.Date} | {row.Orateur} | 📂 {row.Objet}"
+        with st.expander(titre):
+            st.markdown(f"**Parti :** {row.Parti}")
+            st.markdown(surlignage.sub(r"**\1**", row.Texte))
+            show_similar(row.Index)
 
 else:
     # CAS 2 : NAVIGATION NORMALE
     # On met une case à cocher pour ne pas polluer l'écran si on veut juste voir les stats
-    objets_uniques = df_filtered['Objet'].unique()
-
     label_checkbox = f"📂 Afficher le détail des textes ({len(df_filtered)} interventions)"
     show_details = st.checkbox(label_checkbox, value=False)
 
     if show_details:
-        # On regroupe par Objet pour que ce soit plus propre
-        for objet in objets_uniques:
-            subset = df_filtered[df_filtered['Objet'] == objet]
-            # On trie les interventions par date/ordre d'apparition
-            subset = subset.sort_index()
-
-            titre_dossier = f"📂 {objet} ({len(subset)} interventions)"
-
+        # On regroupe par Objet (ordre d'apparition) en une passe, puis par ordre d'apparition dans la séance
+        codes, objets = pd.factorize(df_filtered['Objet'].astype(str))
+        tailles = np.bincount(codes, minlength=len(objets))
+        ordre = np.lexsort((df_filtered.index.to_numpy(), codes))
+        page_rows = ordre[page_slice(len(ordre), "navigation", active_filters)]
+
+        # Les dossiers coupés entre deux pages sont repris sur la suivante
+        for code, positions in pd.Series(page_rows).groupby(codes[page_rows], sort=False):
+            titre_dossier = f"📂 {objets[code]} ({tailles[code]} interventions)"
             with st.expander(titre_dossier):
-                for _, row in subset.iterrows():
-                    st.markdown(f"**📅 {row['Date']} | 👤 {row['Orateur']} ({row['Parti']})**")
-                    st.write(row['Texte'])
+                for row in df_filtered.iloc[positions.to_numpy()].itertuples():
+                    st.markdown(f"**📅 {row.Date} | 👤 {row.Orateur} ({row.Parti})**")
+                    st.write(row.Texte)
+                    show_similar(row.Index)
                     st.divider()
 # ==========================================
 # 9. CHRONOLOGIE : L'ÉVOLUTION COMPARÉE 📈
@@ -517,35 +553,24 @@ if not df_filtered.empty:
     # 1. SÉLECTEURS DE MOTS (COTE A COTE)
     col_search_1, col_search_2 = st.columns(2)
 
+    # Positions des interventions filtrées dans l'index (aucun texte relu)
+    chrono_index = load_chronology(df_full, corpus_texts, corpus_version(DATA_DIR))
+    chrono_rows = chrono_index.term_matrix.positions(df_filtered.index)
+
     # Suggestions intelligentes
-    all_words = " ".join(df_filtered['Texte'].tolist()).lower().split()
-    suggestions = [m for m in all_words if len(m) > 4]
-    top_suggestions = [m[0] for m in Counter(suggestions).most_common(5)]
+    top_suggestions = chrono_index.suggest(chrono_rows)
     default_word = top_suggestions[0] if top_suggestions else "budget"
 
     with col_search_1:
         mot1 = st.text_input("Mot 1 (Ligne Bleue)", value=default_word)
     with col_search_2:
         mot2 = st.text_input("Mot 2 (Ligne Orange - Optionnel)", placeholder="Ex: dépense")
+    relative = st.checkbox("Fréquence relative (pour 10 000 mots)", value=False)
 
     if mot1:
-        # 2. PRÉPARATION DES DONNÉES
-        df_chrono = df_filtered.copy()
-
-        # Groupement par mois
-        df_chrono['Mois'] = df_chrono['Date_dt'].dt.to_period('M').astype(str)
-
-        # Comptage du Mot 1
-        df_chrono[mot1] = df_chrono['Texte'].str.lower().str.count(re.escape(mot1.lower()))
-
-        # Comptage du Mot 2 (si présent)
-        cols_to_keep = ['Mois', mot1]
-        if mot2:
-            df_chrono[mot2] = df_chrono['Texte'].str.lower().str.count(re.escape(mot2.lower()))
-            cols_to_keep.append(mot2)
-
-        # On fait la somme par mois
-        evolution = df_chrono.groupby('Mois')[cols_to_keep[1:]].sum().reset_index()
+        # 2. PRÉPARATION DES DONNÉES : somme par mois, lue dans l'index
+        termes = [mot1] + ([mot2] if mot2 else [])
+        evolution = chrono_index.evolution(termes, chrono_rows, by='Mois', relative=relative).reset_index()
 
         # 3. TRANSFORMATION POUR ALTAIR (Format "Long")
         # Altair a besoin que les colonnes soient "fondues" pour faire des couleurs automatiques
@@ -555,7 +580,7 @@ if not df_filtered.empty:
         if not evolution_melted.empty:
             chart = alt.Chart(evolution_melted).mark_line(point=True).encode(
                 x=alt.X('Mois', title='Temps', axis=alt.Axis(labelAngle=-45)),
-                y=alt.Y('Mentions', title='Nombre d\'occurrences'),
+                y=alt.Y('Mentions', title='Occurrences pour 10 000 mots' if relative else 'Nombre d\'occurrences'),
                 color=alt.Color('Mot', title='Termes'),  # Légende automatique
                 tooltip=['Mois', 'Mot', 'Mentions']
             ).properties(
@@ -0,0 +1,52 @@
+"""Temps de chargement et mémoire résidente du corpus : ancien load_data vs corpus.load_corpus.
+
+Usage : python benchmarks/bench_load_data.py [dossier_du_corpus]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from corpus import CORPUS_CSV, CORPUS_PARQUET, convert_date, load_corpus, memory_usage_mb  # noqa: E402
+
+
+def legacy_load(directory):
+    """load_data tel qu'il était dans app.py (lecteur python, dates ligne par ligne, chaînes objet)."""
+    df = pd.read_csv(os.path.join(directory, CORPUS_CSV), sep=None, engine='python', dtype={'Objet': str},
+                     on_bad_lines='skip', encoding='utf-8-sig')
+    df['Texte'] = df['Texte'].fillna("").astype(object)
+    for col in ['Parti', 'Orateur', 'Objet']:
+        df[col] = df[col].astype(object).astype(str).str.strip().astype(object)
+    df['Date_dt'] = df['Date'].apply(convert_date)
+    return df.sort_values(by='Date_dt', ascending=False)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    df = fn(*args)
+    return time.perf_counter() - t0, df
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    with tempfile.TemporaryDirectory() as csv_only:
+        shutil.copy(os.path.join(directory, CORPUS_CSV), csv_only)
+        runs = [("ancien load_data (CSV)", legacy_load, directory),
+                ("load_corpus (CSV)", load_corpus, csv_only)]
+        if os.path.exists(os.path.join(directory, CORPUS_PARQUET)):
+            runs.append(("load_corpus (Parquet)", load_corpus, directory))
+
+        print(f"{'chargement':<26}{'lignes':>10}{'temps (s)':>12}{'mémoire (Mo)':>15}")
+        for label, fn, path in runs:
+            seconds, df = timed(fn, path)
+            print(f"{label:<26}{len(df):>10}{seconds:>12.3f}{memory_usage_mb(df):>15.1f}")
+
+        print("\nDétail par colonne (Mo) :")
+        detail = pd.DataFrame({label: fn(path).memory_usage(deep=True, index=False) / 1e6 for label, fn, path in runs})
+        print(detail.round(2).to_string())
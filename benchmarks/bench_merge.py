@@ -0,0 +1,84 @@
+"""Fusion des fragments consécutifs : ancienne version (groupby + lambda) vs corpus.merge_runs.
+
+Les fragments sont reconstitués à partir du corpus : chaque intervention est recoupée en phrases (comme les
+tranches de page que produit scraper2.py), puis le tout est répété --scale fois.
+
+Usage : python benchmarks/bench_merge.py [dossier_du_corpus] [--scale 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from corpus import CORPUS_CSV, CorpusWriter, read_corpus, merge_runs  # noqa: E402
+
+
+def legacy_merge(df_total):
+    """merge_interventions tel qu'il était dans scraper2.py."""
+    df_total = df_total.copy()
+    df_total['groupe_id'] = (df_total['Orateur'] != df_total['Orateur'].shift()).cumsum() + \
+                            (df_total['Objet'] != df_total['Objet'].shift()).cumsum() + \
+                            (df_total['Date'] != df_total['Date'].shift()).cumsum()
+
+    df_final = df_total.groupby(['groupe_id', 'Orateur', 'Parti', 'Objet', 'Date'])['Texte'].apply(
+        lambda x: " ".join(x)).reset_index()
+    df_final['Texte'] = df_final['Texte'].str.replace('\n', ' ', regex=False)
+    return df_final.drop(columns=['groupe_id'])
+
+
+def check_party_change():
+    """Cas où les deux versions divergent : le parti d'un même orateur change au milieu d'une suite."""
+    df = pd.DataFrame({'Orateur': ["M. A"] * 3, 'Parti': ["P1", "P2", "P1"], 'Objet': ["20.001"] * 3,
+                       'Date': ["Mars 2024"] * 3, 'Texte': ["un", "deux", "trois"]})
+    # Ancienne version : deux lignes, les fragments P1 joints (et triés par parti)
+    assert legacy_merge(df)[['Parti', 'Texte']].values.tolist() == [["P1", "un trois"], ["P2", "deux"]]
+    # merge_runs et CorpusWriter (même clé) : trois lignes, dans l'ordre du document
+    expected = [["P1", "un"], ["P2", "deux"], ["P1", "trois"]]
+    assert merge_runs(df)[['Parti', 'Texte']].values.tolist() == expected
+    with tempfile.TemporaryDirectory() as workdir:
+        with CorpusWriter(os.path.join(workdir, CORPUS_CSV)) as writer:
+            writer.write_frame(df)
+        assert read_corpus(workdir)[['Parti', 'Texte']].values.tolist() == expected
+
+
+def fragments(directory, scale):
+    df = read_corpus(directory)[['Date', 'Objet', 'Orateur', 'Parti', 'Texte']].astype(object)
+    df['Texte'] = df['Texte'].fillna("").str.split('. ', regex=False)
+    df = df.explode('Texte', ignore_index=True)
+    return pd.concat([df] * scale, ignore_index=True)
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    parser.add_argument("--scale", type=int, default=10, help="Nombre de copies du corpus (défaut : 10)")
+    args = parser.parse_args()
+
+    check_party_change()
+    print("✅ Changement de parti en cours de suite : 2 lignes (ancienne) / 3 lignes (merge_runs), comme attendu")
+
+    df = fragments(args.directory, args.scale)
+    print(f"🧩 {len(df)} fragments")
+
+    print(f"{'fusion':<28}{'interventions':>15}{'temps (s)':>12}")
+    legacy_s, legacy = timed(legacy_merge, df)
+    print(f"{'ancienne (groupby+lambda)':<28}{len(legacy):>15}{legacy_s:>12.3f}")
+    new_s, merged = timed(merge_runs, df)
+    print(f"{'merge_runs':<28}{len(merged):>15}{new_s:>12.3f}")
+    print(f"Accélération : x{legacy_s / max(new_s, 1e-9):.1f}")
+
+    # L'ancienne version regroupait (et triait) par parti à l'intérieur d'une suite : seul cas de divergence,
+    # où elle produit aussi moins de lignes (voir check_party_change)
+    same = legacy.astype(str).reset_index(drop=True).equals(merged.astype(str))
+    print(f"Résultat identique : {'oui' if same else 'non (suites où le parti change en cours de route)'}")
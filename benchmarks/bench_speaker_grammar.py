@@ -0,0 +1,101 @@
+"""Micro-benchmark de la grammaire des orateurs (lignes/seconde, avant/après speaker_grammar.py).
+
+Usage : python benchmarks/bench_speaker_grammar.py [bulletin.pdf ...]
+Sans argument, utilise les PDF du dossier pdfs/.
+"""
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import speaker_grammar  # noqa: E402
+from pdf_backend import open_pdf  # noqa: E402
+from scraper2 import PDF_FOLDER, page_slices  # noqa: E402
+
+# --- RÉFÉRENCE : les motifs tels qu'ils étaient écrits dans les scrapers ---
+OLD_REGEX_DEPUTE = r'^(M\.|Mme)\s+(.+?)\s*\((.+?)\)\s*:\s*.?\s*(.*)'
+OLD_REGEX_PRESIDENT = r'^(Le président|La présidente)\s*:\s*.?\s*(.*)'
+OLD_REGEX_CE = r'^(M\.|Mme)\s+([^,]+),\s+(.+?)\s*:\s*.?\s*(.*)'
+OLD_REGEX_STRICT = r'(?:^|\n)(M\.|Mme|Le président|La présidente|Le rapporteur|La rapporteur)\s*([^\n:]*)\s*:\s*[–-]?\s+'
+
+
+def old_scan_lines(lines):
+    found = 0
+    for i, line in enumerate(lines):
+        m = re.match(OLD_REGEX_DEPUTE, line) or re.match(OLD_REGEX_PRESIDENT, line) or re.match(OLD_REGEX_CE, line)
+        if not m and i + 1 < len(lines):
+            combined = f"{line} {lines[i + 1]}"
+            m = re.match(OLD_REGEX_CE, combined) or re.match(OLD_REGEX_DEPUTE, combined)
+        found += m is not None
+    return found
+
+
+def new_scan_lines(lines):
+    found = 0
+    for i, line in enumerate(lines):
+        m, _ = speaker_grammar.match_speaker_line(line, lines[i + 1] if i + 1 < len(lines) else None)
+        found += m is not None
+    return found
+
+
+def old_scan_slices(slices):
+    found = 0
+    for text in slices:
+        text_clean = re.sub(r'(?m)^(M\.|Mme|Le|La)\s+([^:\n]+)\n\s*([^:\n]+):', r'\1 \2 \3:', text)
+        text_clean = re.sub(r',\s*\n\s*', ', ', text_clean)
+        text_clean = text_clean.replace('’', "'")
+        for match in re.finditer(OLD_REGEX_STRICT, text_clean):
+            speaker_grammar.parse_identity.__wrapped__(match.group(1), match.group(2).strip())
+            found += 1
+    return found
+
+
+def new_scan_slices(slices):
+    found = 0
+    for text in slices:
+        for match in speaker_grammar.SPEAKER_HEADER.finditer(speaker_grammar.normalize_slice(text)):
+            speaker_grammar.parse_identity(match.group('titre'), match.group('identite').strip())
+            found += 1
+    return found
+
+
+def best_time(fn, arg, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def load_slices(pdf_files):
+    slices = []
+    for pdf_file in pdf_files:
+        with open_pdf(pdf_file) as pdf:
+            for page in pdf.pages[1:]:
+                slices.extend(text for _, text in page_slices(page) if text)
+    return slices
+
+
+if __name__ == "__main__":
+    pdf_files = sys.argv[1:] or sorted(glob.glob(os.path.join(PDF_FOLDER, "*.pdf")))
+    if not pdf_files:
+        print("❌ Aucun bulletin PDF : passez des fichiers en argument ou remplissez pdfs/.")
+        sys.exit(1)
+
+    slices = load_slices(pdf_files)
+    lines = [line.strip() for text in slices for line in text.split('\n')]
+    print(f"📄 {len(pdf_files)} bulletins, {len(slices)} tranches, {len(lines)} lignes\n")
+
+    for label, old_fn, new_fn, data in [
+        ("scraper.py  (ligne par ligne)", old_scan_lines, new_scan_lines, lines),
+        ("scraper2.py (par tranche)", old_scan_slices, new_scan_slices, slices),
+    ]:
+        t_old, n_old = best_time(old_fn, data)
+        t_new, n_new = best_time(new_fn, data)
+        print(f"{label}")
+        print(f"   avant : {len(lines) / t_old:12,.0f} lignes/s ({n_old} en-têtes)")
+        print(f"   après : {len(lines) / t_new:12,.0f} lignes/s ({n_new} en-têtes)  x{t_old / t_new:.2f}")
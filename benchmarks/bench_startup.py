@@ -0,0 +1,86 @@
+"""Démarrage d'app.py : temps jusqu'au premier rendu et mémoire résidente maximale.
+
+Chaque mesure tourne dans un processus neuf (imports à froid) : l'app et le corpus sont copiés dans un
+dossier temporaire, puis exécutés une fois avec streamlit.testing (AppTest), comme au premier affichage
+d'une session. --eager importe d'abord les bibliothèques NLP que l'app chargeait autrefois en tête de
+fichier, pour comparer avec l'ancien comportement.
+
+Usage : python benchmarks/bench_startup.py [dossier_du_corpus] [--repeat 3] [--eager]
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports de tête de l'ancien app.py
+EAGER_IMPORTS = """
+from textblob import Blobber
+from textblob_fr import PatternTagger, PatternAnalyzer
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+import spacy
+"""
+
+HEAVY_MODULES = ("spacy", "textblob", "textblob_fr", "sklearn", "scipy")
+
+CHILD = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+{eager}
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=600)
+at.run()
+seconds = time.perf_counter() - t0
+print(json.dumps({{
+    "first_render_s": seconds,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "exceptions": [e.message for e in at.exception],
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def run_once(app_dir, eager):
+    code = CHILD.format(eager=EAGER_IMPORTS if eager else "", heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=app_dir, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def prepare(directory, app_dir):
+    for path in glob.glob(os.path.join(ROOT, "*.py")):
+        shutil.copy(path, app_dir)
+    # copy2 garde les dates : les artefacts restent valides (corpus_version)
+    for path in glob.glob(os.path.join(directory, "discours_grand_conseil_complet.*")):
+        shutil.copy2(path, app_dir)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Temps de premier rendu et RSS maximale d'app.py.")
+    parser.add_argument("directory", nargs="?", default=ROOT, help="Dossier contenant le corpus et ses artefacts")
+    parser.add_argument("--repeat", type=int, default=3, help="Nombre de démarrages à froid (défaut : 3)")
+    parser.add_argument("--eager", action="store_true", help="Importe d'abord spacy/textblob/sklearn (ancien app.py)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as app_dir:
+        prepare(args.directory, app_dir)
+        runs = [run_once(app_dir, args.eager) for _ in range(args.repeat)]
+
+    for run in runs:
+        if run["exceptions"]: print(f"❌ Exception dans l'app : {run['exceptions']}")
+
+    times = [r["first_render_s"] for r in runs]
+    rss = [r["peak_rss_mb"] for r in runs]
+    print(f"{'mode':<10}{'premier rendu (s)':>20}{'min (s)':>10}{'RSS max (Mo)':>15}")
+    print(f"{'eager' if args.eager else 'lazy':<10}{statistics.median(times):>20.2f}{min(times):>10.2f}{max(rss):>15.0f}")
+    print(f"Modules lourds chargés : {', '.join(runs[-1]['loaded']) or 'aucun'}")
@@ -0,0 +1,183 @@
+"""Comparaison des moteurs PDF (pdf_backend.py) : vitesse d'extraction et écarts sur les interventions extraites.
+
+Chaque moteur passe sur les mêmes bulletins (scraper2.extract_speeches, meilleur temps sur --rounds passes),
+puis les interventions fusionnées (merge_runs) sont alignées sur celles du moteur de référence par
+(Date, Objet, Orateur, Parti) : on compte les interventions identiques, celles dont seul l'espacement diffère,
+celles dont le texte diffère, et celles qui manquent ou sont en trop ; quelques écarts sont affichés en exemple.
+
+Usage : python benchmarks/compare_backends.py [bulletin.pdf | dossier ...] [--backends pdfplumber,pdfium]
+        [--reference pdfplumber] [--rounds 1] [--samples 5] [--output comparaison.json]
+Sans argument, compare sur des bulletins synthétiques (--bulletins, --pages).
+"""
+import argparse
+import difflib
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd  # noqa: E402
+
+import scraper2  # noqa: E402
+from corpus import merge_runs  # noqa: E402
+from pdf_backend import BACKENDS, DEFAULT_BACKEND, open_pdf  # noqa: E402
+from synthetic_bulletins import build_bulletins  # noqa: E402
+
+KEY_COLUMNS = ['Date', 'Objet', 'Orateur', 'Parti']
+
+
+def run_backend(pdf_files, backend, rounds):
+    """Extrait tous les bulletins avec un moteur ; renvoie (meilleur temps par fichier, interventions fusionnées)."""
+    times = {}
+    frames = []
+    for pdf_file in pdf_files:
+        best = float("inf")
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            df = scraper2._extract_speeches(pdf_file, verbose=False, backend=backend)
+            best = min(best, time.perf_counter() - t0)
+        times[pdf_file] = best
+        frames.append(df)
+    merged = merge_runs(pd.concat(frames, ignore_index=True)) if frames else pd.DataFrame(columns=scraper2.ROW_COLUMNS)
+    return times, merged.reset_index(drop=True)
+
+
+def squash(text):
+    return " ".join(str(text).split())
+
+
+def first_difference(a, b, context=40):
+    """Extraits des deux textes autour du premier caractère qui diffère."""
+    i = next((k for k, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    start = max(0, i - context)
+    return a[start:i + context], b[start:i + context]
+
+
+def compare(reference, candidate, samples=5):
+    """Alignement des interventions de deux moteurs ; renvoie les comptes et quelques exemples d'écarts."""
+    ref_keys = list(reference[KEY_COLUMNS].astype(str).itertuples(index=False, name=None))
+    cand_keys = list(candidate[KEY_COLUMNS].astype(str).itertuples(index=False, name=None))
+    counts = {'identical': 0, 'whitespace_only': 0, 'text_differs': 0, 'missing': 0, 'extra': 0}
+    examples = []
+    ratios = []
+
+    matcher = difflib.SequenceMatcher(None, ref_keys, cand_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                a, b = reference['Texte'].iat[i], candidate['Texte'].iat[j]
+                if a == b:
+                    counts['identical'] += 1
+                elif squash(a) == squash(b):
+                    counts['whitespace_only'] += 1
+                else:
+                    counts['text_differs'] += 1
+                    ratios.append(difflib.SequenceMatcher(None, squash(a), squash(b), autojunk=False).ratio())
+                    if len(examples) < samples:
+                        before, after = first_difference(squash(a), squash(b))
+                        examples.append({'kind': 'texte', 'key': ref_keys[i], 'reference': before, 'candidate': after})
+            continue
+        counts['missing'] += i2 - i1
+        counts['extra'] += j2 - j1
+        if len(examples) < samples:
+            examples.append({'kind': tag, 'reference': [ref_keys[i] for i in range(i1, min(i2, i1 + 3))],
+                             'candidate': [cand_keys[j] for j in range(j1, min(j2, j1 + 3))]})
+
+    counts['reference_rows'] = len(reference)
+    counts['candidate_rows'] = len(candidate)
+    counts['min_text_ratio'] = min(ratios) if ratios else 1.0
+    return counts, examples
+
+
+def count_pages(pdf_files):
+    total = 0
+    for pdf_file in pdf_files:
+        with open_pdf(pdf_file) as pdf:
+            total += len(pdf.pages)
+    return total
+
+
+def collect_pdfs(paths):
+    pdf_files = []
+    for path in paths:
+        pdf_files.extend(sorted(glob.glob(os.path.join(path, "*.pdf"))) if os.path.isdir(path) else [path])
+    return pdf_files
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parité et vitesse des moteurs PDF sur les interventions extraites.")
+    parser.add_argument("pdfs", nargs="*", help="Bulletins ou dossiers de bulletins (défaut : bulletins synthétiques)")
+    parser.add_argument("--backends", default=",".join(BACKENDS),
+                        help=f"Moteurs comparés, séparés par des virgules (défaut : {','.join(BACKENDS)})")
+    parser.add_argument("--reference", default=DEFAULT_BACKEND, help=f"Moteur de référence (défaut : {DEFAULT_BACKEND})")
+    parser.add_argument("--rounds", type=int, default=1, help="Passes par fichier, meilleur temps retenu (défaut : 1)")
+    parser.add_argument("--samples", type=int, default=5, help="Exemples d'écarts affichés par moteur (défaut : 5)")
+    parser.add_argument("--bulletins", type=int, default=4, help="Bulletins synthétiques (défaut : 4)")
+    parser.add_argument("--pages", type=int, default=10, help="Pages de débats par bulletin synthétique (défaut : 10)")
+    parser.add_argument("--output", help="Fichier JSON de sortie (optionnel)")
+    return parser.parse_args(argv)
+
+
+def main(args, pdf_files):
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if args.reference not in backends: backends.insert(0, args.reference)
+    unknown = [b for b in backends if b not in BACKENDS]
+    if unknown:
+        print(f"❌ Moteur(s) inconnu(s) : {', '.join(unknown)} (choix : {', '.join(BACKENDS)})")
+        sys.exit(1)
+
+    n_pages = count_pages(pdf_files)
+    print(f"🚀 {len(pdf_files)} bulletins, {n_pages} pages, moteurs : {', '.join(backends)}")
+    runs = {}
+    for backend in backends:
+        times, interventions = run_backend(pdf_files, backend, args.rounds)
+        runs[backend] = (times, interventions)
+        total = sum(times.values())
+        print(f"   ⏱️ {backend:<11} {total:8.2f} s  ({n_pages / total if total else 0:7.1f} pages/s, "
+              f"{len(interventions)} interventions)")
+
+    ref_total = sum(runs[args.reference][0].values())
+    results = {'n_files': len(pdf_files), 'n_pages': n_pages, 'reference': args.reference, 'backends': {}}
+    for backend in backends:
+        times, interventions = runs[backend]
+        total = sum(times.values())
+        entry = {'seconds': total, 'pages_per_s': n_pages / total if total else None,
+                 'speedup': ref_total / total if total else None,
+                 'per_file_s': {os.path.basename(f): t for f, t in times.items()}}
+        if backend != args.reference:
+            counts, examples = compare(runs[args.reference][1], interventions, args.samples)
+            entry.update(counts)
+            entry['examples'] = examples
+            print(f"\n🔎 {backend} contre {args.reference} : x{entry['speedup']:.2f}")
+            print(f"   ✅ identiques : {counts['identical']}/{counts['reference_rows']}   "
+                  f"↔️ espacement seul : {counts['whitespace_only']}   ✏️ texte différent : {counts['text_differs']} "
+                  f"(similarité min. {counts['min_text_ratio']:.3f})")
+            print(f"   ➖ manquantes : {counts['missing']}   ➕ en trop : {counts['extra']}")
+            for example in examples:
+                if example['kind'] == 'texte':
+                    print(f"   • {' | '.join(example['key'])}\n       {args.reference}: …{example['reference']}…"
+                          f"\n       {backend}: …{example['candidate']}…")
+                else:
+                    print(f"   • {example['kind']} : {example['reference']} -> {example['candidate']}")
+        results['backends'][backend] = entry
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats : '{args.output}'")
+    return results
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.pdfs:
+        main(args, collect_pdfs(args.pdfs))
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            print(f"📄 Génération de {args.bulletins} bulletins synthétiques ({args.pages} pages)...")
+            main(args, build_bulletins(workdir, n_bulletins=args.bulletins, n_pages=args.pages))
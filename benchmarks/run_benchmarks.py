@@ -0,0 +1,150 @@
+"""Suite de mesures du pipeline complet sur des bulletins synthétiques, à plusieurs tailles de corpus.
+
+Pour chaque taille : génération des PDF (synthetic_bulletins.py), puis chronométrage de chaque étape
+(plusieurs passes, min / médiane / moyenne comme pytest-benchmark) :
+extraction (scraper2.extract_speeches), fusion (merge_runs), écriture du corpus comme scraper2.py (CorpusWriter,
+base SQLite et store compris), chargement (load_data de l'app), boussole, « Top des Mots » et chronologie. Le résultat part en JSON pour suivre le débit dans le temps.
+
+Usage : python benchmarks/run_benchmarks.py [--sizes 2,8,32] [--pages 10] [--rounds 3] [--output resultats.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import annotation  # noqa: E402
+import compass  # noqa: E402
+import scraper2  # noqa: E402
+from chronology import ChronologyIndex  # noqa: E402
+from corpus import CORPUS_CSV, CorpusWriter, load_corpus, merge_runs  # noqa: E402
+from synthetic_bulletins import build_bulletins  # noqa: E402
+from term_matrix import TermMatrix  # noqa: E402
+
+# Import de sklearn hors chrono (son coût au démarrage est mesuré par bench_startup.py)
+import sklearn.feature_extraction.text  # noqa: E402,F401
+
+CHRONO_TERMS = ["budget", "climat"]
+
+
+def measure(fn, rounds):
+    """Lance fn rounds fois ; renvoie (statistiques, dernier résultat)."""
+    times = []
+    result = None
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    stats = {"min_s": min(times), "median_s": statistics.median(times), "mean_s": statistics.mean(times),
+             "rounds": rounds}
+    return stats, result
+
+
+def load_nlp():
+    try:
+        return annotation.load_spacy_model()
+    except Exception as e:  # Modèle absent et pas de réseau : l'étape est sautée
+        print(f"   ⚠️ spaCy indisponible ({type(e).__name__}) : « Top des Mots » non mesuré.")
+        return None
+
+
+def write_corpus(dfs, csv_path):
+    """Écriture du corpus comme scraper2.py : fragments bulletin par bulletin, fusionnés à la volée."""
+    with CorpusWriter(csv_path, database=True, store=True) as writer:
+        for df in dfs:
+            writer.write_frame(df)
+    return writer.rows_written
+
+
+def bench_size(n_bulletins, n_pages, rounds, workdir, nlp):
+    pdf_dir = os.path.join(workdir, f"pdfs_{n_bulletins}")
+    corpus_dir = os.path.join(workdir, f"corpus_{n_bulletins}")
+    os.makedirs(corpus_dir, exist_ok=True)
+    pdf_files = build_bulletins(pdf_dir, n_bulletins=n_bulletins, n_pages=n_pages)
+    stages = {}
+
+    def record(name, fn, items, unit):
+        stats, result = measure(fn, rounds)
+        stats["items"] = items
+        stats["unit"] = unit
+        stats["throughput_per_s"] = stats["items"] / stats["median_s"] if stats["median_s"] else None
+        stages[name] = stats
+        print(f"   {name:<22}{stats['median_s']:>10.3f} s  ({stats['throughput_per_s']:,.0f} {unit}/s)")
+        return result
+
+    n_pages_total = n_bulletins * (n_pages + 1)
+    dfs = record("extract_speeches",
+                 lambda: [scraper2.extract_speeches(f, verbose=False) for f in pdf_files], n_pages_total, "pages")
+    n_fragments = sum(len(d) for d in dfs)
+    df_final = record("merge_runs", lambda: merge_runs(pd.concat(dfs, ignore_index=True)), n_fragments, "fragments")
+    csv_path = os.path.join(corpus_dir, CORPUS_CSV)
+    record("corpus_writer", lambda: write_corpus(dfs, csv_path), n_fragments, "fragments")
+    df = record("load_data", lambda: load_corpus(corpus_dir), len(df_final), "interventions")
+
+    tm = record("term_matrix", lambda: TermMatrix(df['Texte']), len(df), "interventions")
+    record("compass", lambda: compass.centered_positions(df, compass.intervention_scores(tm)), len(df),
+           "interventions")
+
+    if nlp is not None:
+        texts = df.sort_index()['Texte'].astype(str).tolist()
+        tokens = record("annotation", lambda: annotation.annotate_texts(texts, nlp=nlp), len(texts), "interventions")
+        cube = annotation.LemmaCube(annotation.build_lemma_counts(tokens), len(texts))
+        record("top_words", lambda: cube.top(df.index, list(annotation.CONTENT_POS)), len(df), "interventions")
+
+    chrono = ChronologyIndex(tm, df)
+    positions = tm.positions(df.index)
+    record("chronology", lambda: chrono.evolution(CHRONO_TERMS, positions, relative=True), len(df), "interventions")
+
+    return {"bulletins": n_bulletins, "pages": n_pages_total, "fragments": n_fragments,
+            "interventions": len(df_final), "stages": stages}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures du pipeline sur des bulletins synthétiques.")
+    parser.add_argument("--sizes", default="2,8,32", help="Nombres de bulletins, séparés par des virgules")
+    parser.add_argument("--pages", type=int, default=10, help="Pages de débats par bulletin (défaut : 10)")
+    parser.add_argument("--rounds", type=int, default=3, help="Passes par étape (défaut : 3)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Fichier JSON de sortie")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    nlp = load_nlp()
+
+    report = {
+        "datetime": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "machine_info": {"python": platform.python_version(), "platform": platform.platform(),
+                         "cpu_count": os.cpu_count()},
+        "params": {"pages_per_bulletin": args.pages, "rounds": args.rounds},
+        "benchmarks": [],
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            print(f"📏 {n} bulletins de {args.pages + 1} pages")
+            report["benchmarks"].append(bench_size(n, args.pages, args.rounds, workdir, nlp))
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+    print(f"🎉 Résultats -> '{args.output}'")
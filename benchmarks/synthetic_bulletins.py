@@ -0,0 +1,161 @@
+"""Générateur de faux bulletins (PV) du Grand Conseil, pour mesurer le pipeline sans les vrais PDF.
+
+Les PDF sont écrits à la main (Helvetica / Helvetica-Bold, WinAnsi) et reprennent ce que scraper2.py
+doit savoir lire : page de garde, bandeaux d'en-tête (60 pt) et de pied de page (50 pt), numéros d'objet
+« NN.NNN » en gras, en-têtes d'orateurs « M. Nom (PARTI) : – » sur une ou deux lignes, présidence,
+rapporteurs et membres du Conseil d'État (« Mme Nom, cheffe du Département ... : – »).
+
+Usage : python benchmarks/synthetic_bulletins.py dossier [--bulletins 5] [--pages 10] [--seed 0]
+"""
+import argparse
+import os
+import random
+
+LARGEUR, HAUTEUR = 595, 842
+MARGE = 50  # Marge gauche et droite du texte
+BAS = 58  # Dernière ligne de texte possible, au-dessus du bandeau de pied de page (50 pt)
+
+# Chasse Helvetica (millièmes du corps) des caractères des phrases ; 556 pour les autres (a, e, é, n, o...)
+CHASSE = {' ': 278, '.': 278, 'f': 278, 'i': 222, 'j': 222, 'l': 222, 'm': 833, 'r': 333, 't': 278, 'w': 722,
+          'c': 500, 'k': 500, 's': 500, 'v': 500, 'x': 500, 'y': 500, 'z': 500, 'ç': 500}
+
+PARTIS = ["PLR", "PS", "UDC", "VERT-E-S", "VL", "POP"]
+PRENOMS = ["Jean", "Marie", "Luc", "Anne", "Paul", "Claire", "Sophie", "Marc", "Julie", "Pierre"]
+NOMS = ["Dupont", "Rochat", "Perrin", "Jeanneret", "Robert", "Matthey", "Favre", "Borel", "Huguenin", "Vuille"]
+FONCTIONS_CE = ["chef du Département de la santé", "cheffe du Département des finances",
+                "président du Conseil d'État", "chancelière d'État"]
+MOTS = ("le canton doit soutenir la politique sociale et les entreprises climat budget sécurité "
+        "famille fiscalité service public environnement police transition marché impôt liberté "
+        "commune projet rapport commission subvention égalité formation hôpital route énergie "
+        "responsabilité efficience patrimoine tradition innovation diversité solidaire taxe").split()
+
+
+def echapper(texte):
+    return texte.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def largeur(texte, taille):
+    return sum(CHASSE.get(c, 556) for c in texte) * taille / 1000
+
+
+def couper_lignes(mots, taille, largeur_max=LARGEUR - 2 * MARGE):
+    """Répartit les mots en lignes qui tiennent dans la largeur utile : aucun mot ne dépasse le bord de la page."""
+    lignes, courante = [], []
+    for mot in mots:
+        if courante and largeur(" ".join(courante + [mot]), taille) > largeur_max:
+            lignes.append(" ".join(courante))
+            courante = []
+        courante.append(mot)
+    return lignes + [" ".join(courante)]
+
+
+def membres(rnd, n=40):
+    """Députés du conseil : chacun garde son titre et son parti d'un bulletin à l'autre."""
+    return [(rnd.choice(["M.", "Mme"]), f"{rnd.choice(PRENOMS)} {rnd.choice(NOMS)}", rnd.choice(PARTIS))
+            for _ in range(n)]
+
+
+def page_ops(rnd, numero, deputes, objet):
+    """Opérations texte (police, taille, x, y, texte) d'une page de débats ; renvoie aussi le dernier objet."""
+    ops = [("F1", 8, 50, HAUTEUR - 30, f"Grand Conseil - Procès-verbal page {numero}"),  # En-tête
+           ("F1", 8, 50, 25, f"{numero}")]  # Pied de page
+    y = HAUTEUR - 75
+    while y > 70:
+        r = rnd.random()
+        if r < 0.08:
+            objet += 1
+            ops.append(("F2", 10, 50, y, f"{rnd.randint(20, 25)}.{objet % 1000:03d}"))
+            ops.append(("F2", 10, 100, y, "Projet de loi portant révision"))
+            y -= 16
+            continue
+        if r < 0.25:
+            titre, nom, parti = rnd.choice(deputes)
+            k = rnd.random()
+            if k < 0.4:
+                ops.append(("F2", 10, 50, y, f"{titre} {nom} ({parti}) : –"))
+            elif k < 0.55:
+                # En-tête coupé sur deux lignes
+                ops.append(("F2", 10, 50, y, f"{titre} {nom}"))
+                y -= 12
+                ops.append(("F2", 10, 50, y, f"({parti}) : –"))
+            elif k < 0.75:
+                ops.append(("F2", 10, 50, y, f"{titre} {nom},"))
+                y -= 12
+                ops.append(("F2", 10, 50, y, f"{rnd.choice(FONCTIONS_CE)} : –"))
+            elif k < 0.9:
+                ops.append(("F2", 10, 50, y, "La présidente : –"))
+            else:
+                ops.append(("F2", 10, 50, y, f"{titre} {nom}"))
+                y -= 12
+                ops.append(("F2", 10, 50, y, f"({parti}), rapporteur : –"))
+            y -= 12
+        mots = [rnd.choice(MOTS) for _ in range(rnd.randint(8, 14))]
+        for ligne in couper_lignes(mots[:-1] + [mots[-1] + "."], 10):
+            if y < BAS: break  # La fin de la phrase tomberait dans le pied de page
+            ops.append(("F1", 10, MARGE, y, ligne))
+            y -= 12
+    return ops, objet
+
+
+def ecrire_pdf(path, pages):
+    objets = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{5 + 2 * i} 0 R" for i in range(len(pages)))
+    objets.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+    objets.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    objets.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    for i, ops in enumerate(pages):
+        flux = "".join(f"BT /{f} {s} Tf {x} {y} Td ({echapper(t)}) Tj ET\n" for f, s, x, y, t in ops).encode("cp1252")
+        objets.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {LARGEUR} {HAUTEUR}] "
+                      f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {6 + 2 * i} 0 R >>")
+        objets.append(b"<< /Length %d >>\nstream\n" % len(flux) + flux + b"endstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, obj in enumerate(objets, 1):
+        offsets.append(len(out))
+        corps = obj if isinstance(obj, bytes) else obj.encode("latin-1")
+        out += b"%d 0 obj\n" % n + corps + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objets) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objets) + 1, xref)
+    with open(path, "wb") as fh:
+        fh.write(out)
+
+
+def build_bulletin(path, n_pages=10, seed=0, deputes=None):
+    """Écrit un bulletin : une page de garde puis n_pages pages de débats."""
+    rnd = random.Random(seed)
+    deputes = deputes or membres(random.Random(0))
+    pages = [[("F2", 20, 100, 700, "BULLETIN OFFICIEL"), ("F1", 12, 100, 650, "Séance du Grand Conseil")]]
+    objet = 10
+    for p in range(n_pages):
+        ops, objet = page_ops(rnd, p + 2, deputes, objet)
+        pages.append(ops)
+    ecrire_pdf(path, pages)
+
+
+def build_bulletins(directory, n_bulletins=5, n_pages=10, seed=0):
+    """Écrit n_bulletins PV_AAMM_NNNN.pdf (un par mois depuis janvier 2020) ; renvoie leurs chemins."""
+    os.makedirs(directory, exist_ok=True)
+    deputes = membres(random.Random(seed))
+    paths = []
+    for i in range(n_bulletins):
+        annee, mois = 20 + (i // 12) % 80, i % 12 + 1
+        path = os.path.join(directory, f"PV_{annee:02d}{mois:02d}_{i:04d}.pdf")
+        build_bulletin(path, n_pages=n_pages, seed=seed + i, deputes=deputes)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère de faux bulletins du Grand Conseil.")
+    parser.add_argument("directory", help="Dossier de sortie")
+    parser.add_argument("--bulletins", type=int, default=5, help="Nombre de bulletins (défaut : 5)")
+    parser.add_argument("--pages", type=int, default=10, help="Pages de débats par bulletin (défaut : 10)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = build_bulletins(args.directory, args.bulletins, args.pages, args.seed)
+    print(f"📄 {len(paths)} bulletins de {args.pages + 1} pages -> '{args.directory}'")
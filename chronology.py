@@ -0,0 +1,55 @@
+"""Index de la « Chronologie des débats » : comptes de termes par mois (ou par orateur / parti).
+
+L'index repose sur la matrice creuse du corpus (term_matrix.py) lue par colonnes : les occurrences
+d'un terme ne touchent que les interventions qui le contiennent, puis sont ventilées par mois avec les
+codes de mois précalculés. Le nombre total de mots par intervention permet de normaliser
+(fréquence pour 10 000 mots) sans relire aucun texte.
+"""
+import numpy as np
+import pandas as pd
+
+BUCKETS = ('Mois', 'Orateur', 'Parti')
+
+
+class ChronologyIndex:
+
+    def __init__(self, term_matrix, df):
+        """df : le corpus complet, aligné sur term_matrix (même index)."""
+        self.term_matrix = term_matrix
+        rows = df.loc[term_matrix.row_ids]
+        months = rows['Date_dt'].dt.to_period('M').astype(str)
+        self.codes = {}
+        self.labels = {}
+        for bucket, values in (('Mois', months), ('Orateur', rows['Orateur']), ('Parti', rows['Parti'])):
+            codes, labels = pd.factorize(np.asarray(values, dtype=object), sort=True)
+            self.codes[bucket] = codes
+            self.labels[bucket] = labels
+
+    def _bucket_sum(self, values, positions, by):
+        codes = self.codes[by][positions]
+        sums = np.bincount(codes, weights=values[positions], minlength=len(self.labels[by]))
+        present = np.unique(codes)  # Seuls les groupes présents dans la sélection
+        return pd.Series(sums[present], index=pd.Index(self.labels[by][present], name=by))
+
+    def totals(self, positions, by='Mois'):
+        """Nombre total de mots par groupe sur la sélection."""
+        return self._bucket_sum(self.term_matrix.word_counts, positions, by)
+
+    def term_counts(self, term, positions, by='Mois'):
+        """Occurrences du terme par groupe (même comptage que str.lower().str.count)."""
+        return self._bucket_sum(self.term_matrix.count(term), positions, by)
+
+    def evolution(self, terms, positions, by='Mois', relative=False):
+        """Tableau groupe x terme : occurrences brutes, ou pour 10 000 mots si relative."""
+        table = pd.DataFrame({term: self.term_counts(term, positions, by) for term in terms})
+        if relative:
+            table = table.div(self.totals(positions, by).clip(lower=1), axis=0) * 10000
+        return table
+
+    def suggest(self, positions, min_length=5, n=5):
+        """Mots les plus fréquents de la sélection (pour pré-remplir le champ de recherche)."""
+        tm = self.term_matrix
+        totals = np.asarray(tm.matrix[positions].sum(axis=0)).ravel()
+        totals[np.char.str_len(tm.vocab) < min_length] = 0
+        best = np.argsort(-totals, kind='stable')[:n]
+        return [str(tm.vocab[j]) for j in best if totals[j] > 0]
@@ -0,0 +1,80 @@
+"""La Boussole Politique : scores de vocabulaire calculés une fois par intervention.
+
+Chaque intervention reçoit ses comptes de mots par pôle (une passe sur la matrice creuse du corpus,
+tous les termes d'un coup). La position d'un orateur, sur n'importe quel sous-ensemble du corpus,
+n'est plus qu'une somme de ces comptes.
+"""
+import numpy as np
+import pandas as pd
+
+# 1. LISTES AFFINÉES (POUR ÉVITER LE BIAIS "RÉGULATEUR")
+# J'ai retiré "loi", "canton", "état", "commune" qui polluaient tout.
+
+# AXE X : ÉCONOMIE (Gauche vs Droite Éco)
+mots_regulateur = [
+    'subvention', 'aide', 'prestation', 'social', 'protection', 'solidaire',
+    'redistribution', 'taxe', 'impôt', 'contrainte', 'interdiction', 'service public',
+    'salarié', 'syndicat', 'précarité', 'soutien', 'bénéficiaire'
+]
+mots_liberale = [
+    'liberté', 'privé', 'entreprise', 'pme', 'marché', 'concurrence',
+    'initiative', 'baisse', 'moins', 'responsabilité', 'coût', 'efficience',
+    'efficacité', 'dérégulation', 'attractivité', 'fiscalité', 'investisseur',
+    'frein', 'charge', 'charges', 'dynamisme'
+]
+
+# AXE Y : SOCIÉTÉ (Conservateur vs Progressiste)
+mots_progressiste = [
+    'climat', 'environnement', 'durabilité', 'écologie', 'biodiversité',
+    'transition', 'égalité', 'genre', 'ouverture', 'diversité', 'inclusion',
+    'culture', 'innovation', 'réforme', 'monde', 'europe', 'accueil'
+]
+mots_conservateur = [
+    'sécurité', 'ordre', 'police', 'armée', 'tradition', 'patrimoine',
+    'histoire', 'racines', 'famille', 'suisse', 'souveraineté', 'indépendance',
+    'stabilité', 'prudence', 'rigueur', 'frontière', 'identit', 'héritage'
+]
+
+POLES = {'c_reg': mots_regulateur, 'c_lib': mots_liberale, 'c_prog': mots_progressiste, 'c_cons': mots_conservateur}
+EXCLUDED_SPEAKERS = ["Inconnu", "Tous les membres"]
+
+
+def intervention_scores(term_matrix):
+    """Comptes par pôle et nombre de mots de chaque intervention (index = identifiant de ligne).
+
+    Même comptage que l'ancien calculate_raw_score (texte.count(mot) pour chaque mot de la liste).
+    """
+    scores = {col: term_matrix.count_many(words) for col, words in POLES.items()}
+    scores['total'] = term_matrix.word_counts
+    return pd.DataFrame(scores, index=term_matrix.row_ids)
+
+
+def majority_party(df_source):
+    """Parti le plus fréquent de chaque orateur, en un seul groupby."""
+    sizes = df_source.groupby(['Orateur', 'Parti'], observed=True).size().reset_index(name='n')
+    sizes = sizes.sort_values('n', ascending=False, kind='stable').drop_duplicates('Orateur')
+    return sizes.set_index('Orateur')['Parti'].astype(str)
+
+
+def centered_positions(df_source, scores):
+    """Position (X, Y) de chaque orateur de df_source, centrée sur la moyenne du conseil."""
+    sub = scores.loc[df_source.index]
+    totals = sub.groupby(df_source['Orateur'].astype(str).to_numpy()).sum()
+    totals = totals.drop(index=EXCLUDED_SPEAKERS, errors='ignore')
+    if totals.empty: return pd.DataFrame()
+
+    words = np.maximum(totals['total'], 1)  # Évite division par 0
+    # Score brut (Densité)
+    df_res = pd.DataFrame({
+        'Orateur': totals.index,
+        'Parti': majority_party(df_source).reindex(totals.index).fillna("Indéterminé").to_numpy(),
+        'Raw_X': ((totals['c_lib'] - totals['c_reg']) / words * 10000).to_numpy(),
+        'Raw_Y': ((totals['c_prog'] - totals['c_cons']) / words * 10000).to_numpy(),
+    })
+
+    # B. ON CENTRE LE GRAPHIQUE (Moyenne = 0)
+    # Ça force les points à s'étaler autour du centre
+    df_res['X'] = df_res['Raw_X'] - df_res['Raw_X'].mean()
+    df_res['Y'] = df_res['Raw_Y'] - df_res['Raw_Y'].mean()
+
+    return df_res
@@ -0,0 +1,386 @@
+"""Lecture et écriture du corpus des interventions (CSV historique + fichier Parquet typé).
+
+Ce module ne dépend ni de Streamlit ni de pdfplumber : il est partagé par scraper2.py (écriture)
+et app.py (lecture).
+"""
+import csv
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+CORPUS_CSV = "discours_grand_conseil_complet.csv"
+CORPUS_PARQUET = "discours_grand_conseil_complet.parquet"
+
+COLUMNS = ['Orateur', 'Parti', 'Objet', 'Date', 'Texte']
+LABEL_COLUMNS = ['Orateur', 'Parti', 'Objet']
+# Une intervention = suite de fragments consécutifs qui partagent ces quatre valeurs
+RUN_COLUMNS = ['Orateur', 'Parti', 'Objet', 'Date']
+
+# --- OUTILS DE GESTION DES DATES ---
+def convert_date(date_str):
+    """Transforme 'Septembre 2025' ou '01.09.2025' en objet datetime pour le tri."""
+    s = str(date_str).lower()
+
+    # 1. Recherche d'une année (2020-2030)
+    match_year = re.search(r'20\d{2}', s)
+    if not match_year: return datetime(2000, 1, 1)
+    annee = int(match_year.group(0))
+
+    # 2. Détection du mois
+    mois = 1
+    if 'jan' in s:
+        mois = 1
+    elif 'f' in s and 'v' in s:
+        mois = 2
+    elif 'mar' in s:
+        mois = 3
+    elif 'avr' in s:
+        mois = 4
+    elif 'mai' in s:
+        mois = 5
+    elif 'juin' in s:
+        mois = 6
+    elif 'juil' in s:
+        mois = 7
+    elif 'ao' in s:
+        mois = 8
+    elif 'sep' in s:
+        mois = 9
+    elif 'oct' in s:
+        mois = 10
+    elif 'nov' in s:
+        mois = 11
+    elif 'déc' in s or 'dec' in s:
+        mois = 12
+
+    return datetime(annee, mois, 1)
+
+
+def parse_dates(dates):
+    """Convertit une colonne de dates textuelles en datetime64 (une conversion par valeur distincte)."""
+    codes, uniques = pd.factorize(dates)
+    converted = pd.to_datetime([convert_date(u) for u in uniques])
+    return pd.Series(converted.take(codes), index=dates.index)
+
+
+# --- ÉCRITURE (scraper2.py) ---
+def to_columnar(df):
+    """Version typée du corpus : libellés en catégories (dictionnaire Parquet) et vraie colonne de date."""
+    df = df[COLUMNS].copy()
+    for col in LABEL_COLUMNS:
+        df[col] = df[col].astype('category')
+    df['Date_dt'] = parse_dates(df['Date'])
+    return df
+
+
+def merge_runs(df):
+    """Fusionne les fragments consécutifs d'une même intervention (mêmes RUN_COLUMNS), en temps linéaire.
+
+    Une seule comparaison de chaque ligne avec la précédente, sur les codes des quatre colonnes, donne
+    les débuts de suite ; les textes de chaque suite sont ensuite joints en une passe sur la liste.
+
+    Différence avec l'ancien groupby (suites sur Orateur / Objet / Date, puis regroupement par Parti) : un
+    changement de parti coupe la suite. A (P1), A (P2), A (P1) donne trois lignes dans l'ordre du document,
+    là où l'ancienne version en donnait deux (les deux textes P1 joints, puis P2).
+    """
+    if df.empty: return pd.DataFrame(columns=COLUMNS)
+    starts = np.zeros(len(df), dtype=bool)
+    starts[0] = True
+    for col in RUN_COLUMNS:
+        codes, _ = pd.factorize(df[col])  # Les valeurs manquantes ont toutes le code -1
+        starts[1:] |= codes[1:] != codes[:-1]
+
+    bounds = np.append(np.flatnonzero(starts), len(df))
+    texts = df['Texte'].tolist()
+    merged = df[RUN_COLUMNS].iloc[bounds[:-1]].reset_index(drop=True)
+    merged['Texte'] = [" ".join(texts[a:b]).replace('\n', ' ') for a, b in zip(bounds[:-1], bounds[1:])]
+    return merged
+
+
+class CorpusWriter:
+    """Écriture du corpus au fil de l'extraction, en mémoire constante.
+
+    Les fragments arrivent dans l'ordre chronologique (dicts Date/Objet/Orateur/Parti/Texte) ; les fragments
+    consécutifs d'un même orateur (mêmes RUN_COLUMNS) sont fusionnés à la volée, comme merge_runs, et chaque
+    intervention terminée part aussitôt dans le CSV. Le Parquet (et, avec database=True, la base SQLite de
+    corpus_db.py, et avec store=True le store projeté en mémoire de corpus_store.py) est écrit par lots de
+    batch_size lignes : aucun ne relit le corpus, le store ne range ses lignes par date qu'à la fermeture.
+
+    Tout est écrit dans des fichiers temporaires, mis en place (os.replace) seulement par un close() sans
+    erreur : une extraction interrompue (exception, Ctrl-C) ou vide laisse l'ancien corpus intact.
+    """
+
+    def __init__(self, output_file=CORPUS_CSV, batch_size=10000, database=False, store=False):
+        self.output_file = output_file
+        self.parquet_file = os.path.splitext(output_file)[0] + ".parquet"
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._key = None
+        self._parts = []
+        self._batch = []
+        self._parquet = None
+        self._schema = None
+        self._closed = False
+        self._csv_handle = open(f"{output_file}.tmp", 'w', newline='', encoding='utf-8-sig')
+        self._csv = csv.writer(self._csv_handle, quoting=csv.QUOTE_ALL, lineterminator='\n')
+        self._csv.writerow(COLUMNS)
+        try:
+            import pyarrow.parquet  # noqa: F401
+            self._with_parquet = True
+        except ImportError:
+            print("⚠️ pyarrow absent : seul le CSV sera écrit.")
+            self._with_parquet = False
+        self.database_file = None
+        self.store_dir = None
+        self._database = None
+        self._store = None
+        directory = os.path.dirname(os.path.abspath(output_file))
+        if database:
+            from corpus_db import DatabaseWriter, db_path
+            self._database = DatabaseWriter(db_path(directory))
+        if store:
+            from corpus_store import StoreWriter, store_path
+            self._store = StoreWriter(store_path(directory))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, row):
+        key = tuple(row[col] for col in RUN_COLUMNS)
+        if key != self._key:
+            self._flush_intervention()
+            self._key = key
+        self._parts.append(row['Texte'])
+
+    def write_frame(self, df):
+        for row in df.to_dict('records'):
+            self.write(row)
+
+    def _flush_intervention(self):
+        if self._key is None: return
+        values = [*self._key, " ".join(self._parts).replace('\n', ' ')]
+        self._csv.writerow(values)
+        self.rows_written += 1
+        self._parts = []
+        if self._with_parquet or self._database is not None or self._store is not None:
+            self._batch.append(values)
+            if len(self._batch) >= self.batch_size: self._flush_batch()
+
+    def _flush_batch(self):
+        if not self._batch: return
+        if self._database is not None: self._database.append(self._batch)
+        if self._store is not None: self._store.append(self._batch)
+        if self._with_parquet: self._write_parquet_batch()
+        self._batch = []
+
+    def _write_parquet_batch(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(to_columnar(pd.DataFrame(self._batch, columns=COLUMNS)), preserve_index=False)
+        if self._parquet is None:
+            # Dictionnaires en int32 : la largeur des index ne dépend plus de la taille du premier lot
+            self._schema = pa.schema([
+                pa.field(f.name, pa.dictionary(pa.int32(), pa.string())) if f.name in LABEL_COLUMNS else f
+                for f in table.schema
+            ], metadata=table.schema.metadata)
+            self._parquet = pq.ParquetWriter(f"{self.parquet_file}.tmp", self._schema)
+        self._parquet.write_table(table.cast(self._schema))
+
+    def close(self):
+        """Termine l'écriture et met les fichiers en place ; renvoie (csv, parquet ou None).
+
+        Sans aucune intervention, rien n'est remplacé : l'ancien corpus reste en place et close() renvoie (None, None).
+        """
+        if self._closed: return self._result()
+        self._flush_intervention()
+        self._key = None
+        self._csv_handle.close()
+        self._flush_batch()
+        if self._parquet is not None: self._parquet.close()
+        if not self.rows_written:
+            print("⚠️ Aucune intervention extraite : le corpus existant est conservé.")
+            self.abort()
+            return self._result()
+        self._closed = True
+
+        # Le CSV d'abord, puis le Parquet : le Parquet reste le plus récent des deux (corpus_source)
+        os.replace(f"{self.output_file}.tmp", self.output_file)
+        if self._parquet is not None: os.replace(f"{self.parquet_file}.tmp", self.parquet_file)
+        directory = os.path.dirname(os.path.abspath(self.output_file))
+        # Version calculée une fois le CSV / Parquet en place : base et store sont à jour pour app.py
+        version = corpus_version(directory)
+        if self._database is not None:
+            self.database_file = self._database.close(version)
+            self._database = None
+        if self._store is not None:
+            self.store_dir = self._store.close(version)
+            self._store = None
+        return self._result()
+
+    def abort(self):
+        """Abandonne l'écriture : supprime les fichiers temporaires, l'ancien corpus n'est pas touché."""
+        if self._closed: return
+        self._closed = True
+        self._csv_handle.close()
+        if self._parquet is not None: self._parquet.close()
+        for path in (f"{self.output_file}.tmp", f"{self.parquet_file}.tmp"):
+            if os.path.exists(path): os.remove(path)
+        if self._database is not None:
+            self._database.abort()
+            self._database = None
+        if self._store is not None:
+            self._store.abort()
+            self._store = None
+        self._key = None
+        self._parts = []
+        self._batch = []
+
+    def _result(self):
+        if not self.rows_written: return None, None
+        return self.output_file, self._parquet_result()
+
+    def _parquet_result(self):
+        return self.parquet_file if self._parquet is not None else None
+
+
+# --- LECTURE (app.py) ---
+def corpus_source(directory):
+    """Nom du fichier de corpus à lire : le Parquet, sauf s'il manque ou si le CSV est plus récent.
+
+    Un CSV plus récent (corrigé à la main, écrit par un ancien scraper) l'emporte sur un Parquet périmé.
+    """
+    paths = {name: os.path.join(directory, name) for name in (CORPUS_PARQUET, CORPUS_CSV)}
+    present = [name for name, path in paths.items() if os.path.exists(path)]
+    if len(present) < 2: return present[0] if present else None
+    parquet_mtime, csv_mtime = (os.stat(paths[name]).st_mtime_ns for name in (CORPUS_PARQUET, CORPUS_CSV))
+    return CORPUS_PARQUET if parquet_mtime >= csv_mtime else CORPUS_CSV
+
+
+def read_corpus(directory):
+    """Lit le corpus brut : le Parquet s'il est à jour (corpus_source), sinon le CSV."""
+    parquet_path = os.path.join(directory, CORPUS_PARQUET)
+    if corpus_source(directory) == CORPUS_PARQUET:
+        try:
+            return pd.read_parquet(parquet_path)
+        except ImportError:
+            pass  # pyarrow absent : on retombe sur le CSV
+
+    csv_path = os.path.join(directory, CORPUS_CSV)
+    try:
+        # Le CSV écrit par scraper2.py est en virgules + QUOTE_ALL : le lecteur C suffit et ne perd aucune ligne
+        return pd.read_csv(csv_path, dtype={'Objet': str}, encoding='utf-8-sig')
+    except pd.errors.ParserError:
+        # Lecture tolérante (accepte virgules ou points-virgules, ignore les lignes cassées)
+        return pd.read_csv(csv_path, sep=None, engine='python', dtype={'Objet': str},
+                           on_bad_lines='skip', encoding='utf-8-sig')
+
+
+# Valeurs par défaut des colonnes de libellés (colonne absente ou cellule vide)
+LABEL_DEFAULTS = {'Orateur': "Inconnu", 'Parti': "Indéterminé", 'Objet': "Ouverture / Divers", 'Date': "Janvier 2000"}
+
+
+def clean_label(value, default):
+    """Libellé d'une ligne écrite au fil de l'eau (base, store) : espaces retirés, valeur par défaut si vide."""
+    if value is None or (isinstance(value, float) and pd.isna(value)): return default
+    value = str(value).strip()
+    return value or default
+
+
+def to_category(series, default):
+    """Libellés en catégorie, espaces superflus retirés sur les seules valeurs distinctes."""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    if series.isna().any():
+        if default not in series.cat.categories:
+            series = series.cat.add_categories([default])
+        series = series.fillna(default)
+    categories = series.cat.categories.astype(str).str.strip()
+    if categories.is_unique:
+        return series.cat.rename_categories(categories)
+    # Deux libellés ne différant que par des espaces : on les fusionne
+    return series.astype(str).str.strip().astype('category')
+
+
+def text_dtype():
+    """Chaînes Arrow (un buffer contigu) si pyarrow est disponible, sinon objets Python."""
+    try:
+        import pyarrow  # noqa: F401
+        return "string[pyarrow]"
+    except ImportError:
+        return object
+
+
+def corpus_version(directory):
+    """Empreinte bon marché du fichier de corpus qui sera lu (nom, taille, date) : clé des caches dérivés."""
+    name = corpus_source(directory)
+    if name is None: return None
+    stat = os.stat(os.path.join(directory, name))
+    return f"{name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+# --- ARTEFACTS DÉRIVÉS (annotations, index...) ---
+# Chaque artefact est un Parquet rangé à côté du corpus, qui mémorise la version du corpus d'origine :
+# s'il ne correspond plus (nouveau scraping), il est ignoré jusqu'au prochain calcul.
+def artifact_path(directory, name):
+    return os.path.join(directory, f"{os.path.splitext(CORPUS_CSV)[0]}.{name}.parquet")
+
+
+def write_artifact(df, directory, name):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), b'corpus_version': str(corpus_version(directory)).encode()}
+    path = artifact_path(directory, name)
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+    return path
+
+
+def read_artifact(directory, name, columns=None):
+    """Relit un artefact, ou None s'il est absent ou calculé sur une autre version du corpus."""
+    path = artifact_path(directory, name)
+    if not os.path.exists(path): return None
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    metadata = pq.read_schema(path).metadata or {}
+    if metadata.get(b'corpus_version', b'').decode() != str(corpus_version(directory)):
+        return None
+    return pd.read_parquet(path, columns=columns)
+
+
+def load_corpus(directory):
+    """Charge le corpus prêt pour l'app : libellés en catégories, Texte en chaînes Arrow, Date_dt parsée.
+
+    L'index d'origine (position de la ligne dans le fichier) est conservé : il sert d'identifiant de ligne.
+    """
+    df = read_corpus(directory)
+
+    for col, default in LABEL_DEFAULTS.items():
+        if col not in df.columns: df[col] = default
+        df[col] = to_category(df[col], default)
+
+    df['Texte'] = df['Texte'].fillna("").astype(text_dtype())
+
+    # Création de la colonne de date technique pour le tri (déjà présente dans le Parquet)
+    if 'Date_dt' not in df.columns:
+        df['Date_dt'] = parse_dates(df['Date'])
+    # Tri stable : à date égale, ordre du fichier (comme « ORDER BY date_dt DESC, row_id » de corpus_db.py)
+    df = df.sort_values(by='Date_dt', ascending=False, kind='stable')
+
+    return df
+
+
+def memory_usage_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
@@ -0,0 +1,238 @@
+"""Base SQLite du corpus : libellés sans le texte, textes à la demande, recherche par index plein texte (FTS5).
+
+scraper2.py l'écrit à côté du CSV (discours_grand_conseil_complet.sqlite) :
+  - interventions : une ligne par intervention, row_id = position dans le corpus (comme load_corpus),
+    date indexée (ordre de load_corpus) ;
+  - interventions_fts : index FTS5 (tokeniseur trigram) sur le texte, pour chercher des sous-chaînes
+    sans parcourir le corpus ;
+  - meta : version du corpus d'origine (la base est ignorée si elle ne correspond plus).
+
+Côté app, la base fournit les libellés sans le texte, la recherche par mots-clés (ET / OU) par l'index
+FTS5, et les textes des seules lignes retenues (DatabaseTexts) : aucun texte n'est chargé dans pandas.
+Les filtres de libellés (législature, orateur, objet) passent, comme sans base, par filter_index.py.
+
+Usage : python corpus_db.py   (reconstruit la base à partir du corpus existant, sans relancer le scraping)
+"""
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from corpus import (CORPUS_CSV, COLUMNS, LABEL_DEFAULTS, clean_label, convert_date, corpus_version, load_corpus,
+                    text_dtype)
+from search_index import TOKEN_RE, parse_query
+
+CORPUS_DB = f"{os.path.splitext(CORPUS_CSV)[0]}.sqlite"
+
+SCHEMA = """
+CREATE TABLE interventions (
+    row_id INTEGER PRIMARY KEY,
+    orateur TEXT NOT NULL,
+    parti TEXT NOT NULL,
+    objet TEXT NOT NULL,
+    date TEXT NOT NULL,
+    date_dt TEXT NOT NULL,
+    texte TEXT NOT NULL
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+INDEXES = """
+CREATE INDEX idx_date_dt ON interventions (date_dt);
+"""
+
+# Index externe (le texte n'est stocké qu'une fois) ; trigram = recherche de sous-chaînes, insensible à la casse
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE interventions_fts USING fts5(
+    texte, content='interventions', content_rowid='row_id', tokenize='trigram'
+);
+"""
+
+# Row_id par requête « IN (...) » (sous la limite de 999 paramètres des anciens SQLite)
+FETCH_CHUNK = 900
+
+# Nom SQL -> nom de colonne du DataFrame
+SQL_COLUMNS = {'orateur': 'Orateur', 'parti': 'Parti', 'objet': 'Objet', 'date': 'Date', 'texte': 'Texte'}
+
+
+def db_path(directory):
+    return os.path.join(directory, CORPUS_DB)
+
+
+# --- ÉCRITURE (scraper2.py) ---
+class DatabaseWriter:
+    """Écrit la base par lots (fichier temporaire, renommé à la fin) ; index et FTS construits à la fermeture."""
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        if os.path.exists(self.tmp_path): os.remove(self.tmp_path)
+        self.conn = sqlite3.connect(self.tmp_path)
+        self.conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        self.next_row_id = 0
+        self._dates = {}
+
+    def _date_dt(self, date):
+        if date not in self._dates:
+            self._dates[date] = convert_date(date).strftime("%Y-%m-%d")
+        return self._dates[date]
+
+    def append(self, rows):
+        """rows : listes [Orateur, Parti, Objet, Date, Texte] dans l'ordre du corpus."""
+        records = []
+        for orateur, parti, objet, date, texte in rows:
+            labels = [clean_label(value, LABEL_DEFAULTS[col])
+                      for value, col in ((orateur, 'Orateur'), (parti, 'Parti'), (objet, 'Objet'), (date, 'Date'))]
+            records.append((self.next_row_id, *labels, self._date_dt(labels[3]), texte or ""))
+            self.next_row_id += 1
+        self.conn.executemany("INSERT INTO interventions VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+
+    def close(self, version):
+        """Construit les index, mémorise la version du corpus et met la base en place."""
+        conn = self.conn
+        conn.executescript(INDEXES)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            conn.execute("INSERT INTO interventions_fts (interventions_fts) VALUES ('rebuild')")
+            fts = "1"
+        except sqlite3.OperationalError:  # SQLite sans FTS5 / trigram (< 3.34) : recherche par balayage
+            print("⚠️ FTS5 (trigram) indisponible : la base sera interrogée sans index plein texte.")
+            fts = "0"
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [('corpus_version', str(version)), ('fts', fts)])
+        conn.commit()
+        conn.close()
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Abandonne la base en cours : le fichier temporaire est supprimé, l'ancienne base reste en place."""
+        self.conn.close()
+        if os.path.exists(self.tmp_path): os.remove(self.tmp_path)
+
+
+def build_database(df, directory):
+    """Base complète à partir d'un corpus déjà chargé (index = row_id, comme load_corpus)."""
+    writer = DatabaseWriter(db_path(directory))
+    rows = df.sort_index()[COLUMNS].astype(object).itertuples(index=False, name=None)
+    writer.append(rows)
+    return writer.close(corpus_version(directory))
+
+
+# --- LECTURE (app.py) ---
+class CorpusDatabase:
+    """Requêtes de l'app sur la base ; une connexion en lecture seule par requête (sûr entre sessions)."""
+
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        self.version = meta.get('corpus_version')
+        self.has_fts = meta.get('fts') == "1"
+
+    def _connect(self):
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        # Vérification exacte des sous-chaînes, avec la même casse que str.contains(case=False)
+        conn.create_function("contains_ci", 2, lambda text, phrase: phrase.lower() in text.lower(),
+                             deterministic=True)
+        return conn
+
+    def count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM interventions").fetchone()[0]
+
+    # --- CONSTRUCTION DU WHERE ---
+    def _phrase_condition(self, phrase, case_sensitive):
+        """Condition SQL d'une expression : index trigram si possible, puis vérification exacte."""
+        check = ("instr(texte, ?) > 0", [phrase]) if case_sensitive else ("contains_ci(texte, ?)", [phrase])
+        # Le trigram ne sait chercher que des expressions d'au moins 3 caractères
+        if not self.has_fts or len(phrase) < 3 or not TOKEN_RE.search(phrase):
+            return check
+        fts_query = '"' + phrase.replace('"', '""') + '"'
+        fts = "row_id IN (SELECT rowid FROM interventions_fts WHERE interventions_fts MATCH ?)"
+        # Sans casse, l'expression trigram est déjà une recherche de sous-chaîne exacte
+        if not case_sensitive: return fts, [fts_query]
+        return f"{fts} AND {check[0]}", [fts_query, *check[1]]
+
+    def where(self, query, case_sensitive=False):
+        """Clause WHERE et paramètres d'une requête de mots-clés (search_index.parse_query : « a ET b OU c »)."""
+        alternatives, params = [], []
+        for clause in parse_query(query):
+            conditions = [self._phrase_condition(phrase, case_sensitive) for phrase in clause]
+            alternatives.append("(" + " AND ".join(sql for sql, _ in conditions) + ")")
+            params.extend(p for _, phrase_params in conditions for p in phrase_params)
+        return "(" + (" OR ".join(alternatives) or "0") + ")", params
+
+    # --- REQUÊTES ---
+    def search(self, query, case_sensitive=False):
+        """row_id des interventions qui correspondent à la requête (même résultat que SearchIndex.search)."""
+        where, params = self.where(query, case_sensitive)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(f"SELECT row_id FROM interventions WHERE {where}", params).fetchall()
+        return np.fromiter((row_id for row_id, in rows), dtype=np.int64, count=len(rows))
+
+    def labels(self):
+        """Libellés de tout le corpus, sans le texte, dans l'ordre de load_corpus (index = row_id)."""
+        sql = ("SELECT row_id, orateur, parti, objet, date, date_dt FROM interventions "
+               "ORDER BY date_dt DESC, row_id")
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(sql, conn)
+        df = df.rename(columns=SQL_COLUMNS).set_index('row_id')
+        df.index.name = None
+        for col in ('Orateur', 'Parti', 'Objet', 'Date'):
+            df[col] = df[col].astype('category')
+        df['Date_dt'] = pd.to_datetime(df.pop('date_dt'))
+        return df
+
+    def texts(self, row_ids):
+        """Textes des row_id donnés, dans cet ordre (lus par paquets de FETCH_CHUNK)."""
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        found = {}
+        with closing(self._connect()) as conn:
+            for start in range(0, len(row_ids), FETCH_CHUNK):
+                chunk = row_ids[start:start + FETCH_CHUNK].tolist()
+                marks = ", ".join("?" * len(chunk))
+                found.update(conn.execute(f"SELECT row_id, texte FROM interventions WHERE row_id IN ({marks})", chunk))
+        return pd.Series([found[row_id] for row_id in row_ids.tolist()], index=row_ids, dtype=text_dtype())
+
+
+class DatabaseTexts:
+    """Textes de la base alignés sur une liste de row_id, sans copie en mémoire : même usage qu'une colonne Texte.
+
+    index, len(), itération (en flux, par paquets) et take(positions) suffisent à TermMatrix et à l'app.
+    """
+
+    def __init__(self, db, row_ids):
+        self.db = db
+        self.index = pd.Index(row_ids)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        for start in range(0, len(self), FETCH_CHUNK * 10):
+            yield from self.db.texts(self.index[start:start + FETCH_CHUNK * 10])
+
+    def take(self, positions):
+        return self.db.texts(self.index[np.asarray(positions)])
+
+
+def open_database(directory):
+    """La base du corpus, ou None si elle manque ou a été écrite pour une autre version du corpus."""
+    path = db_path(directory)
+    if not os.path.exists(path): return None
+    try:
+        db = CorpusDatabase(path)
+    except sqlite3.DatabaseError:
+        return None
+    return db if db.version == str(corpus_version(directory)) else None
+
+
+if __name__ == "__main__":
+    directory = os.path.dirname(os.path.abspath(__file__))
+    t0 = time.perf_counter()
+    df = load_corpus(directory)
+    path = build_database(df, directory)
+    print(f"🎉 {len(df)} interventions en {time.perf_counter() - t0:.1f} s -> '{path}'")
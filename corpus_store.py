@@ -0,0 +1,205 @@
+"""Corpus en lecture seule projeté en mémoire (mmap), partagé par toutes les sessions et tous les processus.
+
+Le dossier discours_grand_conseil_complet.store/ (écrit par lots par scraper2.py, via StoreWriter, ou par
+`python corpus_store.py`) contient :
+  - texte.bin : tous les textes en UTF-8, bout à bout ; offsets.npy : début de chaque texte (n + 1 valeurs) ;
+  - <colonne>.codes.npy : libellés (Orateur, Parti, Objet, Date) en codes entiers, catégories dans meta.json ;
+  - date_dt.npy et row_id.npy ; meta.json mémorise aussi la version du corpus d'origine.
+
+Les lignes sont rangées dans l'ordre de load_corpus (date décroissante) : la colonne Texte du DataFrame est
+une vue Arrow directement posée sur texte.bin, sans copie. Chaque processus projette les mêmes fichiers :
+le système ne garde qu'un exemplaire des pages, quel que soit le nombre de sessions ou de workers.
+Les filtres (filter_index.py) travaillent sur les codes et donnent des positions ; frame(positions) ne
+matérialise que le résultat final.
+
+Usage : python corpus_store.py   (reconstruit le store à partir du corpus existant, sans relancer le scraping)
+"""
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from corpus import CORPUS_CSV, COLUMNS, LABEL_DEFAULTS, clean_label, convert_date, corpus_version, load_corpus
+
+CORPUS_STORE = f"{os.path.splitext(CORPUS_CSV)[0]}.store"
+CODE_COLUMNS = list(LABEL_DEFAULTS)  # Orateur, Parti, Objet, Date
+
+# Textes recopiés par paquet à la fermeture de StoreWriter
+COPY_CHUNK = 4096
+
+
+def store_path(directory):
+    return os.path.join(directory, CORPUS_STORE)
+
+
+# --- ÉCRITURE ---
+class StoreWriter:
+    """Écrit le store par lots, dans l'ordre du corpus (row_id croissant), sans garder les textes en mémoire.
+
+    Les textes partent aussitôt dans un fichier temporaire ; seuls les codes des libellés et la longueur de
+    chaque texte restent en mémoire. close() range les lignes comme load_corpus (date décroissante, tri stable),
+    recopie les textes dans cet ordre depuis le fichier projeté et met le dossier en place.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        if os.path.exists(self.tmp_path): shutil.rmtree(self.tmp_path)
+        os.makedirs(self.tmp_path)
+        self._unsorted_path = os.path.join(self.tmp_path, "texte.unsorted.bin")
+        self._unsorted = open(self._unsorted_path, "wb")
+        self._labels = {col: {} for col in CODE_COLUMNS}  # Libellé -> code provisoire (ordre d'apparition)
+        self._codes = {col: [] for col in CODE_COLUMNS}  # Un tableau par lot
+        self._lengths = []
+        self.n_rows = 0
+
+    def append(self, rows):
+        """rows : listes [Orateur, Parti, Objet, Date, Texte] dans l'ordre du corpus."""
+        codes = {col: [] for col in CODE_COLUMNS}
+        encoded = []
+        for *labels, texte in rows:
+            for col, value in zip(CODE_COLUMNS, labels):
+                known = self._labels[col]
+                codes[col].append(known.setdefault(clean_label(value, LABEL_DEFAULTS[col]), len(known)))
+            encoded.append((texte if isinstance(texte, str) else "").encode("utf-8"))
+        self._unsorted.write(b"".join(encoded))
+        for col in CODE_COLUMNS:
+            self._codes[col].append(np.array(codes[col], dtype=np.int32))
+        self._lengths.append(np.array([len(e) for e in encoded], dtype=np.int64))
+        self.n_rows += len(encoded)
+
+    def close(self, version):
+        """Range les lignes par date, écrit les tableaux et met le store en place ; renvoie son dossier."""
+        self._unsorted.close()
+        # Catégories triées, comme astype('category') : codes provisoires -> codes définitifs
+        categories, codes = {}, {}
+        for col in CODE_COLUMNS:
+            known = self._labels[col]
+            categories[col] = sorted(known)
+            rank = {label: k for k, label in enumerate(categories[col])}
+            remap = np.array([rank[label] for label in known], dtype=np.int32)
+            codes[col] = remap[_concat(self._codes[col], np.int32)]
+        dates = np.array([convert_date(date) for date in categories['Date']], dtype="datetime64[ns]")
+        date_dt = dates[codes['Date']]
+        order = pd.Series(date_dt).sort_values(ascending=False, kind='stable').index.to_numpy()
+
+        lengths = _concat(self._lengths, np.int64)
+        starts = np.zeros(self.n_rows + 1, dtype=np.int64)
+        np.cumsum(lengths, out=starts[1:])
+        offsets = np.zeros(self.n_rows + 1, dtype=np.int64)
+        np.cumsum(lengths[order], out=offsets[1:])
+        self._copy_texts(order, starts)
+        np.save(os.path.join(self.tmp_path, "offsets.npy"), offsets)
+        for col in CODE_COLUMNS:
+            np.save(os.path.join(self.tmp_path, f"{col.lower()}.codes.npy"), codes[col][order])
+        np.save(os.path.join(self.tmp_path, "date_dt.npy"), date_dt[order])
+        np.save(os.path.join(self.tmp_path, "row_id.npy"), order.astype(np.int64))
+
+        with open(os.path.join(self.tmp_path, "meta.json"), "w", encoding="utf-8") as fh:
+            json.dump({'corpus_version': str(version), 'n_rows': self.n_rows, 'categories': categories},
+                      fh, ensure_ascii=False)
+        if os.path.exists(self.path): shutil.rmtree(self.path)
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def _copy_texts(self, order, starts):
+        """Textes dans l'ordre du store, recopiés par paquets depuis le fichier temporaire projeté."""
+        with open(os.path.join(self.tmp_path, "texte.bin"), "wb") as fh:
+            if starts[-1]:  # np.memmap refuse les fichiers vides
+                source = np.memmap(self._unsorted_path, dtype=np.uint8, mode='r')
+                for first in range(0, len(order), COPY_CHUNK):
+                    fh.write(b"".join(source[starts[k]:starts[k + 1]].tobytes()
+                                      for k in order[first:first + COPY_CHUNK].tolist()))
+                del source
+        os.remove(self._unsorted_path)
+
+    def abort(self):
+        """Abandonne le store en cours : le dossier temporaire est supprimé, l'ancien store reste en place."""
+        self._unsorted.close()
+        if os.path.exists(self.tmp_path): shutil.rmtree(self.tmp_path)
+
+
+def _concat(parts, dtype):
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+
+def build_store(df, directory):
+    """Store complet à partir d'un corpus déjà chargé (index = row_id, comme load_corpus) ; renvoie son dossier."""
+    writer = StoreWriter(store_path(directory))
+    writer.append(df.sort_index()[COLUMNS].astype(object).itertuples(index=False, name=None))
+    return writer.close(corpus_version(directory))
+
+
+# --- LECTURE ---
+class CorpusStore:
+    """Accès en lecture seule au store ; les tableaux restent des projections mémoire (np.load mmap_mode='r')."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as fh:
+            meta = json.load(fh)
+        self.version = meta['corpus_version']
+        self.categories = {col: pd.Index(values) for col, values in meta['categories'].items()}
+        self.offsets = self._load("offsets.npy")
+        self.codes = {col: self._load(f"{col.lower()}.codes.npy") for col in CODE_COLUMNS}
+        self.date_dt = self._load("date_dt.npy")
+        self.row_ids = self._load("row_id.npy")
+        blob_path = os.path.join(path, "texte.bin")
+        # np.memmap refuse les fichiers vides (corpus sans texte)
+        self.blob = (np.memmap(blob_path, dtype=np.uint8, mode='r') if os.path.getsize(blob_path)
+                     else np.zeros(0, dtype=np.uint8))
+
+    def _load(self, name):
+        return np.load(os.path.join(self.path, name), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def text(self, position):
+        return bytes(self.blob[self.offsets[position]:self.offsets[position + 1]]).decode("utf-8")
+
+    def texts(self):
+        """Tous les textes en chaînes Arrow posées sur le fichier projeté (aucune copie)."""
+        import pyarrow as pa
+
+        array = pa.LargeStringArray.from_buffers(len(self), pa.py_buffer(self.offsets), pa.py_buffer(self.blob))
+        return pd.arrays.ArrowStringArray(pa.chunked_array([array]))
+
+    def code(self, col, value):
+        """Code entier d'un libellé (-1 s'il n'existe pas dans le corpus)."""
+        return self.categories[col].get_indexer([value])[0]
+
+    def frame(self, positions=None, text=True):
+        """DataFrame comme load_corpus (index = row_id) ; sans positions, Texte est une vue sans copie."""
+        rows = slice(None) if positions is None else np.asarray(positions)
+        data = {col: pd.Categorical.from_codes(np.asarray(self.codes[col][rows]), categories=self.categories[col],
+                                               validate=False)
+                for col in CODE_COLUMNS}
+        if text:
+            texts = self.texts()
+            data['Texte'] = texts if positions is None else texts.take(rows)
+        data['Date_dt'] = np.asarray(self.date_dt[rows])
+        df = pd.DataFrame(data, index=pd.Index(np.asarray(self.row_ids[rows])), copy=False)
+        return df[[c for c in COLUMNS + ['Date_dt'] if c in df.columns]]
+
+
+def open_store(directory):
+    """Le store du corpus, ou None s'il manque, est illisible ou a été écrit pour une autre version du corpus."""
+    path = store_path(directory)
+    if not os.path.exists(os.path.join(path, "meta.json")): return None
+    try:
+        store = CorpusStore(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return store if store.version == str(corpus_version(directory)) else None
+
+
+if __name__ == "__main__":
+    directory = os.path.dirname(os.path.abspath(__file__))
+    t0 = time.perf_counter()
+    df = load_corpus(directory)
+    path = build_store(df, directory)
+    print(f"🎉 {len(df)} interventions en {time.perf_counter() - t0:.1f} s -> '{path}'")
@@ -0,0 +1,122 @@
+"""Index des filtres de la barre latérale, construits une fois par processus au chargement du corpus.
+
+Pour Orateur, Parti et Objet : une liste triée de positions par libellé (un seul argsort des codes, découpé
+par bornes). Pour les dates : les positions rangées par date, une législature étant une tranche contiguë
+(deux recherches dichotomiques). Un filtre part de la plus courte des listes concernées puis vérifie les autres
+critères sur les seules lignes candidates : le coût suit la taille du résultat, pas celle du corpus.
+
+Les positions renvoyées sont celles des lignes du corpus chargé (df_full.iloc / CorpusStore.frame), triées.
+"""
+import numpy as np
+import pandas as pd
+
+INDEXED_COLUMNS = ('Orateur', 'Parti', 'Objet')
+NAT = np.iinfo(np.int64).min
+
+
+class FilterIndex:
+
+    def __init__(self, codes, categories, dates):
+        """codes : {colonne: codes entiers (-1 = vide)} ; categories : {colonne: libellés} ; dates : datetime64."""
+        self.codes = {col: np.asarray(codes[col]) for col in INDEXED_COLUMNS}
+        self.lookup = {col: {str(label): code for code, label in enumerate(categories[col])} for col in INDEXED_COLUMNS}
+        self.labels = {col: np.asarray(categories[col], dtype=object) for col in INDEXED_COLUMNS}
+        self.postings = {}
+        for col in INDEXED_COLUMNS:
+            col_codes = self.codes[col]
+            order = np.argsort(col_codes, kind='stable')  # Positions croissantes à l'intérieur de chaque libellé
+            counts = np.bincount(col_codes[col_codes >= 0], minlength=len(categories[col]))
+            bounds = np.concatenate([[0], np.cumsum(counts)]) + int((col_codes < 0).sum())
+            self.postings[col] = (order, bounds)
+
+        self.dates = np.asarray(dates, dtype='datetime64[ns]').view(np.int64)
+        self.by_date = np.argsort(self.dates, kind='stable')
+        self.sorted_dates = self.dates[self.by_date]
+        self.n_undated = int(np.searchsorted(self.sorted_dates, NAT, side='right'))  # NaT : hors de toute période
+        self._periods = {}
+        self._options = {}
+
+    @classmethod
+    def from_frame(cls, df):
+        """Index d'un corpus chargé par load_corpus (colonnes de libellés en catégories)."""
+        return cls({col: df[col].cat.codes.to_numpy() for col in INDEXED_COLUMNS},
+                   {col: df[col].cat.categories for col in INDEXED_COLUMNS}, df['Date_dt'].to_numpy())
+
+    @classmethod
+    def from_store(cls, store):
+        """Index posé directement sur les codes du store projeté en mémoire (corpus_store.py)."""
+        return cls(store.codes, store.categories, store.date_dt)
+
+    def __len__(self):
+        return len(self.dates)
+
+    # --- LISTES ÉLÉMENTAIRES ---
+    def rows(self, col, value):
+        """Positions (triées) des lignes dont la colonne vaut value."""
+        code = self.lookup[col].get(value)
+        if code is None: return np.empty(0, dtype=np.int64)
+        order, bounds = self.postings[col]
+        return order[bounds[code]:bounds[code + 1]]
+
+    def _date_bounds(self, start, end):
+        lo = self.n_undated if start is None else max(self.n_undated, int(np.searchsorted(
+            self.sorted_dates, np.datetime64(start, 'ns').astype(np.int64), side='left')))
+        hi = len(self) if end is None else int(np.searchsorted(
+            self.sorted_dates, np.datetime64(end, 'ns').astype(np.int64), side='left'))
+        return lo, max(lo, hi)
+
+    def period_rows(self, periods):
+        """Positions (triées) des lignes d'une liste de périodes (début, fin) réunies par OU ; une fois par période."""
+        key = tuple(periods)
+        if key not in self._periods:
+            parts = [self.by_date[lo:hi] for lo, hi in (self._date_bounds(start, end) for start, end in periods)]
+            rows = np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+            rows.flags.writeable = False  # Partagé entre les sessions
+            self._periods[key] = rows
+        return self._periods[key]
+
+    def _in_periods(self, positions, periods):
+        dates = self.dates[positions]
+        keep = np.zeros(len(positions), dtype=bool)
+        for start, end in periods:
+            lo, hi = self._date_bounds(start, end)
+            if lo < hi:
+                keep |= (dates >= self.sorted_dates[lo]) & (dates <= self.sorted_dates[hi - 1])
+        return positions[keep]
+
+    # --- FILTRES COMBINÉS ---
+    def select(self, periods=None, orateur=None, objet=None, exclude_parti=None):
+        """Positions triées des lignes retenues (législatures, orateur, objet, parti exclu), avec ou sans base."""
+        lists = [self.rows(col, value) for col, value in (('Orateur', orateur), ('Objet', objet)) if value is not None]
+        if lists:
+            # On part de la liste la plus courte ; les autres critères sont vérifiés sur ses seules lignes
+            lists.sort(key=len)
+            positions = lists[0]
+            for col, value in (('Orateur', orateur), ('Objet', objet)):
+                if value is not None and len(positions):
+                    positions = positions[self.codes[col][positions] == self.lookup[col][value]]
+            if periods is not None: positions = self._in_periods(positions, periods)
+        elif periods is not None:
+            positions = self.period_rows(periods)
+        else:
+            positions = np.arange(len(self))
+        if exclude_parti is not None and exclude_parti in self.lookup['Parti']:
+            positions = positions[self.codes['Parti'][positions] != self.lookup['Parti'][exclude_parti]]
+        return positions
+
+    def options(self, col, periods=None):
+        """Libellés triés présents sur la période (listes déroulantes), calculés une fois par période."""
+        key = (col, None if periods is None else tuple(periods))
+        if key not in self._options:
+            positions = np.arange(len(self)) if periods is None else self.period_rows(periods)
+            present = np.unique(self.codes[col][positions])
+            self._options[key] = sorted(self.labels[col][present[present >= 0]].tolist())
+        return self._options[key]
+
+
+def build_filter_index(df, store=None):
+    """Index du corpus chargé : sur les codes du store s'il y en a un, sinon sur les catégories du DataFrame."""
+    if store is not None: return FilterIndex.from_store(store)
+    if not all(isinstance(df[col].dtype, pd.CategoricalDtype) for col in INDEXED_COLUMNS):
+        df = df.astype({col: 'category' for col in INDEXED_COLUMNS})
+    return FilterIndex.from_frame(df)
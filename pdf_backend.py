@@ -0,0 +1,211 @@
+"""Moteurs de lecture des PDF, interchangeables : pdfplumber (référence) ou pypdfium2 (PDFium, en C).
+
+Un moteur ouvre un document (open_pdf(chemin, moteur)) dont les pages exposent ce dont les scrapers ont besoin :
+  - page_number, width, height, bbox : dimensions (points, origine en haut à gauche comme pdfplumber) ;
+  - load() : analyse de la page (chronométrée à part par le profilage de scraper2.py) ;
+  - words(keep, require) : mots avec leur police (text, x0, x1, top, bottom, fontname) ;
+  - text(bbox) : texte de la zone (x0, top, x1, bottom), lignes séparées par « \\n » ;
+  - close() : libère la page.
+
+pdfplumber passe par pdfminer, en pur Python : c'est la référence, et le plus lent. PDFium (pypdfium2, déjà
+installé avec pdfplumber) lit le flux de la page en C et découpe le texte d'une zone lui-même ; ses boîtes de
+caractères ne sont pas exactement celles de pdfminer, d'où benchmarks/compare_backends.py pour mesurer les
+écarts sur les interventions extraites avant d'en changer.
+"""
+import bisect
+import ctypes
+import re
+
+BACKENDS = ("pdfplumber", "pdfium")
+DEFAULT_BACKEND = "pdfplumber"
+LINE_BREAK = re.compile(r"\r\n|[\r\n]")
+
+
+def open_pdf(path, backend=DEFAULT_BACKEND):
+    """Document ouvert avec le moteur demandé (gestionnaire de contexte, .pages)."""
+    if backend == "pdfplumber": return PlumberDocument(path)
+    if backend == "pdfium": return PdfiumDocument(path)
+    raise ValueError(f"Moteur PDF inconnu : {backend!r} (choix : {', '.join(BACKENDS)})")
+
+
+class Document:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# --- PDFPLUMBER ---
+class PlumberDocument(Document):
+
+    def __init__(self, path):
+        import pdfplumber
+
+        self._pdf = pdfplumber.open(path)
+        self.pages = [PlumberPage(page) for page in self._pdf.pages]
+
+    def close(self):
+        self._pdf.close()
+
+
+class PlumberPage:
+    """Page pdfplumber : les caractères sont lus une fois, mots et zones de texte en sont tirés."""
+
+    def __init__(self, page):
+        self._page = page
+        self.page_number = page.page_number
+        self.width = page.width
+        self.height = page.height
+        self.bbox = page.bbox
+        self._chars = None
+        self._order = None
+
+    def load(self):
+        if self._chars is None: self._chars = self._page.chars  # Analyse de la page par pdfminer
+        return self
+
+    def words(self, keep=None, require=None):
+        """Mots (avec fontname) ; require(texte, police) : sans caractère qui le vérifie, rien n'est construit."""
+        import pdfplumber
+
+        chars = self.load()._chars
+        if require is not None and not any(require(c['text'], c['fontname']) for c in chars): return []
+        words = pdfplumber.utils.extract_words(chars, extra_attrs=['fontname'])
+        return [w for w in words if keep is None or keep(w)]
+
+    def text(self, bbox):
+        """Même résultat que page.crop(bbox).extract_text(), sans re-filtrer tous les objets de la page."""
+        import pdfplumber
+        from pdfplumber.page import test_proposed_bbox
+
+        chars = self.load()._chars
+        test_proposed_bbox(bbox, self.bbox)  # Mêmes erreurs que page.crop()
+        if self._order is None:
+            # Index des caractères triés par 'top' : chaque zone ne regarde que ses voisins
+            self._order = sorted(range(len(chars)), key=lambda k: chars[k]['top'])
+            self._tops = [chars[k]['top'] for k in self._order]
+            self._max_height = max((c['bottom'] - c['top'] for c in chars), default=0)
+        x0, top, x1, bottom = bbox
+        lo = bisect.bisect_left(self._tops, top - self._max_height)
+        hi = bisect.bisect_right(self._tops, bottom)
+        candidates = [chars[k] for k in sorted(self._order[lo:hi])]  # Ordre d'origine conservé
+        slice_chars = pdfplumber.utils.crop_to_bbox(candidates, bbox)
+        return pdfplumber.utils.chars_to_textmap(
+            slice_chars, layout_bbox=bbox, layout_width=self.width, layout_height=bottom - top
+        ).as_string
+
+    def close(self):
+        self._chars = self._order = None
+        self._page.close()
+
+
+# --- PDFIUM (pypdfium2) ---
+class PdfiumDocument(Document):
+
+    def __init__(self, path):
+        import pypdfium2 as pdfium
+
+        self._pdf = pdfium.PdfDocument(path)
+        self.pages = [PdfiumPage(self._pdf, i) for i in range(len(self._pdf))]
+
+    def close(self):
+        self._pdf.close()
+
+
+class PdfiumPage:
+    """Page PDFium, chargée à la demande ; coordonnées converties (origine PDF en bas -> top / bottom).
+
+    La table des caractères (texte, police, boîte « loose ») est lue une fois en tableaux numpy.
+    Une zone garde, comme le crop de pdfplumber, tout caractère dont la boîte touche le cadre, bord compris :
+    le titre d'un objet, dont le 'top' sert de limite, figure ainsi dans les deux tranches qu'il sépare.
+    (FPDFText_GetBoundedText, lui, coupe selon la boîte serrée des glyphes et perd ces lignes.)
+    """
+
+    def __init__(self, pdf, index):
+        self._pdf = pdf
+        self._index = index
+        self.page_number = index + 1
+        self.width, self.height = pdf.get_page_size(index)
+        self.bbox = (0, 0, self.width, self.height)
+        self._page = None
+        self._textpage = None
+
+    def load(self):
+        if self._textpage is not None: return self
+        import numpy as np
+        import pypdfium2.raw as pdfium_c
+
+        self._page = self._pdf[self._index]
+        self._textpage = self._page.get_textpage()
+        raw = self._textpage.raw
+        n = pdfium_c.FPDFText_CountChars(raw)
+        rect = pdfium_c.FS_RECTF()
+        buffer, flags = ctypes.create_string_buffer(256), ctypes.c_int()
+        # Texte en un appel ; caractère par caractère si un caractère hors BMP décale les index
+        chars = self._textpage.get_text_range(0, n) if n else ""
+        if len(chars) != n: chars = "".join(chr(pdfium_c.FPDFText_GetUnicode(raw, i)) for i in range(n))
+        blank = np.array([c.isspace() for c in chars], dtype=bool)  # Espaces et fins de ligne générées
+        boxes = np.zeros((n, 4))  # left, bottom, right, top (origine en bas)
+        font_ids = np.zeros(n, dtype=np.int64)
+        fonts = {}
+        for i in np.flatnonzero(~blank).tolist():
+            if pdfium_c.FPDFText_GetLooseCharBox(raw, i, rect):
+                boxes[i] = rect.left, rect.bottom, rect.right, rect.top
+            pdfium_c.FPDFText_GetFontInfo(raw, i, buffer, len(buffer), flags)
+            font_ids[i] = fonts.setdefault(buffer.value, len(fonts))
+        self._chars = chars
+        self._blank = blank
+        self._font_ids = font_ids
+        self._fonts = [name.decode("utf-8", errors="replace") for name in fonts]
+        self._x0, self._x1 = boxes[:, 0], boxes[:, 2]
+        self._tops, self._bottoms = self.height - boxes[:, 3], self.height - boxes[:, 1]
+        return self
+
+    def words(self, keep=None, require=None):
+        """Mots coupés aux blancs, aux caractères générés (fins de ligne) et aux changements de police."""
+        import numpy as np
+
+        self.load()
+        chars, fonts = self._chars, self._fonts
+        solid = np.flatnonzero(~self._blank)
+        if require is not None and not any(require(char, fonts[font]) for char, font in
+                                           {(chars[i], self._font_ids[i]) for i in solid}): return []
+        if not len(solid): return []
+
+        # Un mot = suite de caractères consécutifs, non blancs, de même police
+        font_ids = self._font_ids[solid]
+        starts = np.flatnonzero(np.concatenate([[True], (np.diff(solid) != 1) | (np.diff(font_ids) != 0)]))
+        ends = np.append(starts[1:], len(solid))
+        x0 = np.minimum.reduceat(self._x0[solid], starts)
+        x1 = np.maximum.reduceat(self._x1[solid], starts)
+        tops = np.minimum.reduceat(self._tops[solid], starts)
+        bottoms = np.maximum.reduceat(self._bottoms[solid], starts)
+        words = [{'text': chars[solid[s]:solid[e - 1] + 1], 'fontname': fonts[font_ids[s]], 'x0': float(x0[k]),
+                  'x1': float(x1[k]), 'top': float(tops[k]), 'bottom': float(bottoms[k])}
+                 for k, (s, e) in enumerate(zip(starts, ends))]
+        return [w for w in words if keep is None or keep(w)]
+
+    def text(self, bbox):
+        """Texte des caractères qui touchent la zone, dans l'ordre de lecture de PDFium, une ligne par « \\n »."""
+        import numpy as np
+
+        self.load()
+        x0, top, x1, bottom = bbox
+        inside = ((self._x1 >= x0) & (self._x0 <= x1) & (self._bottoms >= top) & (self._tops <= bottom)
+                  & ~self._blank)
+        if not inside.any(): return ""
+        # Les blancs (espaces, fins de ligne générées) sont gardés entre deux caractères retenus
+        kept = np.flatnonzero(inside)
+        selected = inside.copy()
+        selected[kept[0]:kept[-1] + 1] |= self._blank[kept[0]:kept[-1] + 1]
+        text = "".join(self._chars[i] for i in np.flatnonzero(selected))
+        lines = (" ".join(line.split()) for line in LINE_BREAK.split(text))
+        return "\n".join(line for line in lines if line)
+
+    def close(self):
+        if self._textpage is not None:
+            self._textpage.close()
+            self._page.close()
+        self._page = self._textpage = None
+        self._chars = self._blank = self._font_ids = self._fonts = None
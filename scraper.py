@@ -1,144 +1,121 @@
-import pdfplumber
-import re
+import csv
+import os
+
 import pandas as pd
 
+from pdf_backend import DEFAULT_BACKEND, open_pdf
+from speaker_grammar import match_speaker_line, ce_party
+
 # --- CONFIGURATION ---
 # Remplace ce chemin par le vrai chemin d'un PDF que tu as téléchargé
 PDF_PATH = "bulletin_test.pdf"
+# Moteur de lecture des PDF : "pdfplumber" (référence) ou "pdfium" (plus rapide), voir pdf_backend.py
+PDF_BACKEND = DEFAULT_BACKEND
+OUTPUT_FILE = "discours_grand_conseil.csv"
+OUTPUT_COLUMNS = ['Orateur', 'Parti', 'Texte']
 
 
-def extract_speeches(pdf_path):
+def extract_speeches(pdf_path, backend=PDF_BACKEND):
     print(f"🔍 Analyse du fichier : {pdf_path}...")
+    try:
+        data = list(iter_speeches(pdf_path, backend))
+    except FileNotFoundError:
+        print("❌ Fichier introuvable.")
+        return pd.DataFrame()
+
+    print(f"✅ Terminé ! {len(data)} interventions extraites.")
+    return pd.DataFrame(data)
+
+
+def iter_speeches(pdf_path, backend=PDF_BACKEND):
+    """Générateur : les interventions du bulletin, produites page par page (une page en mémoire à la fois).
+
+    Une intervention n'est produite qu'une fois terminée (à l'orateur suivant ou en fin de document).
+    """
     data = []
 
     current_speaker = None
     current_party = None
     current_text = []
 
-    # --- LES 3 MOTIFS (REGEX) ---
+    # Les motifs (député, présidence, rapporteur, Conseil d'État) sont dans speaker_grammar.py
 
-    # CAS 1 : Député standard -> M. Nom (PARTI) :
-    regex_depute = r'^(M\.|Mme)\s+(.+?)\s*\((.+?)\)\s*:\s*.?\s*(.*)'
+    with open_pdf(pdf_path, backend) as pdf:
+        # On ignore la page 1 (couverture)
+        for i, page in enumerate(pdf.pages[1:]):
 
-    # CAS 2 : Présidence -> Le président : (ou La présidente)
-    # On capture le texte après les deux points
-    regex_president = r'^(Le président|La présidente)\s*:\s*.?\s*(.*)'
+            # --- ROGNAGE (Crop) ---
+            height = page.height
+            width = page.width
+            bbox = (0, 60, width, height - 50)
+            text = page.text(bbox)
+            page.close()  # Texte lu : la page est libérée avant la suivante
+            # -----------------------
 
-    # CAS 3 : Conseil d'État -> M. Nom, conseiller... :
-    # On capture le Nom (avant la virgule) et le Titre (après la virgule)
-    regex_ce = r'^(M\.|Mme)\s+([^,]+),\s+(.+?)\s*:\s*.?\s*(.*)'
+            if not text: continue
 
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            # On ignore la page 1 (couverture)
-            for i, page in enumerate(pdf.pages[1:]):
-
-                # --- ROGNAGE (Crop) ---
-                height = page.height
-                width = page.width
-                bbox = (0, 60, width, height - 50)
-                cropped_page = page.crop(bbox)
-                text = cropped_page.extract_text()
-                # -----------------------
-
-                if not text: continue
-
-                lines = text.split('\n')
-                i = 0
-                while i < len(lines):
-                    line = lines[i].strip()
-
-                    # 1. On teste si la ligne seule matche déjà
-                    match_depute = re.match(regex_depute, line)
-                    match_president = re.match(regex_president, line)
-                    match_ce = re.match(regex_ce, line)
-
-                    # 2. LOGIQUE DE RÉPARATION (Si la ligne seule ne matche pas)
-                    is_merged_line = False
-                    if not (match_depute or match_president or match_ce) and i + 1 < len(lines):
-                        # On tente de coller avec la ligne suivante
-                        next_line = lines[i + 1].strip()
-                        combined_line = f"{line} {next_line}"
-
-                        # On re-teste avec la version collée
-                        # On ne teste que le Conseil d'État (souvent long) et Député (parfois long)
-                        if re.match(regex_ce, combined_line):
-                            line = combined_line
-                            match_ce = re.match(regex_ce, line)  # Mise à jour du match
-                            is_merged_line = True
-                        elif re.match(regex_depute, combined_line):
-                            line = combined_line
-                            match_depute = re.match(regex_depute, line)
-                            is_merged_line = True
-
-                    # SI C'EST UN DÉPUTÉ
-                    if match_depute:
-                        save_previous(data, current_speaker, current_party, current_text)
-
-                        current_speaker = f"{match_depute.group(1)} {match_depute.group(2).strip()}"
-                        current_party = match_depute.group(3).strip()
-                        current_text = [match_depute.group(4)] if match_depute.group(4) else []
-
-                    # SI C'EST LE PRÉSIDENT (Cas simple)
-                    elif match_president:
-                        save_previous(data, current_speaker, current_party, current_text)
-
-                        current_speaker = match_president.group(1)  # "Le président"
-                        current_party = "Présidence"  # On invente un parti pour la cohérence
-                        current_text = [match_president.group(2)] if match_president.group(2) else []
-
-                    # SI C'EST UN CONSEILLER D'ÉTAT
-                    elif match_ce:
-                        save_previous(data, current_speaker, current_party, current_text)
-
-                        current_speaker = f"{match_ce.group(1)} {match_ce.group(2).strip()}"
-
-                        # LOGIQUE DÉPARTEMENT :
-                        # On récupère tout le titre (ex: "conseiller d'État, chef du Département de la santé...")
-                        titre_complet = match_ce.group(3).strip()
-
-                        if "président" in titre_complet:
-                            current_party="Présidence CE"
-
-                        # On cherche le mot "Département" pour ne garder que ça
-                        elif "Département" in titre_complet:
-                            # On découpe la phrase et on garde ce qui commence par "Département"
-                            # Ex: "chef du Département de la santé" -> "Département de la santé"
-                            try:
-                                # On prend la partie après "du " ou "le " qui précède souvent Département
-                                # Le plus simple : on cherche la position du mot "Département"
-                                index_dept = titre_complet.find("Département")
-                                current_party = titre_complet[index_dept:]  # On garde tout depuis "Département..."
-                            except:
-                                current_party = titre_complet  # Si ça rate, on garde le titre entier
-                        else:
-                            # Si aucun département n'est cité (ex: juste "Le Conseil d'État"), on garde le générique
-                            current_party = "Conseil d'État"
-                        current_text = [match_ce.group(4)] if match_ce.group(4) else []
-
-                    # SINON (Suite du texte ou Bruit)
-                    else:
-                        if current_speaker is None: continue
-
-                        # Filtre anti-bruit
-                        is_noise = False
-                        if len(line) < 3: is_noise = True
-                        if "Vote n°" in line: is_noise = True
-                        if "Résultat du vote" in line: is_noise = True
-                        if line.isupper() and len(line) < 50: is_noise = True
-
-                        if not is_noise:
-                            current_text.append(line)
-
-        # Sauvegarder le dernier à la fin
-        save_previous(data, current_speaker, current_party, current_text)
-
-        print(f"✅ Terminé ! {len(data)} interventions extraites.")
-        return pd.DataFrame(data)
+            lines = text.split('\n')
+            i = 0
+            while i < len(lines):
+                line = lines[i].strip()
 
-    except FileNotFoundError:
-        print("❌ Fichier introuvable.")
-        return pd.DataFrame()
+                # 1. On teste la ligne seule, 2. sinon on la recolle avec la suivante (en-têtes longs)
+                next_line = lines[i + 1].strip() if i + 1 < len(lines) else None
+                match, is_merged_line = match_speaker_line(line, next_line)
+                if is_merged_line:
+                    line = f"{line} {next_line}"
+                i += 2 if is_merged_line else 1
+
+                kind = match.lastgroup if match else None
+
+                # SI C'EST UN DÉPUTÉ
+                if kind == 'depute':
+                    save_previous(data, current_speaker, current_party, current_text)
+
+                    current_speaker = f"{match.group('dep_titre')} {match.group('dep_nom').strip()}"
+                    current_party = match.group('dep_parti').strip()
+                    current_text = [match.group('dep_texte')] if match.group('dep_texte') else []
+
+                # SI C'EST LE PRÉSIDENT OU LE RAPPORTEUR (Cas simple)
+                elif kind in ('presidence', 'rapporteur'):
+                    save_previous(data, current_speaker, current_party, current_text)
+
+                    prefix = 'pres' if kind == 'presidence' else 'rap'
+                    current_speaker = match.group(f'{prefix}_titre')  # "Le président"
+                    current_party = "Présidence"  # On invente un parti pour la cohérence
+                    texte = match.group(f'{prefix}_texte')
+                    current_text = [texte] if texte else []
+
+                # SI C'EST UN CONSEILLER D'ÉTAT
+                elif kind == 'ce':
+                    save_previous(data, current_speaker, current_party, current_text)
+
+                    current_speaker = f"{match.group('ce_titre')} {match.group('ce_nom').strip()}"
+                    # LOGIQUE DÉPARTEMENT : "conseiller d'État, chef du Département de la santé" -> "Département de la santé"
+                    current_party = ce_party(match.group('ce_fonction').strip())
+                    current_text = [match.group('ce_texte')] if match.group('ce_texte') else []
+
+                # SINON (Suite du texte ou Bruit)
+                else:
+                    if current_speaker is None: continue
+
+                    # Filtre anti-bruit
+                    is_noise = False
+                    if len(line) < 3: is_noise = True
+                    if "Vote n°" in line: is_noise = True
+                    if "Résultat du vote" in line: is_noise = True
+                    if line.isupper() and len(line) < 50: is_noise = True
+
+                    if not is_noise:
+                        current_text.append(line)
+
+            # Interventions terminées sur cette page
+            yield from data
+            data = []
+
+    # Sauvegarder le dernier à la fin
+    save_previous(data, current_speaker, current_party, current_text)
+    yield from data
 
 
 # --- Petite fonction utilitaire pour ne pas répéter le code de sauvegarde ---
@@ -151,11 +128,31 @@ def save_previous(data, speaker, party, text_list):
         })
 
 # --- EXÉCUTION ---
-if __name__ == "__main__":
-    df = extract_speeches(PDF_PATH)
-
-    if not df.empty:
+def save_speeches(pdf_path, output_file=OUTPUT_FILE, backend=PDF_BACKEND):
+    """Écrit les interventions dans le CSV au fil de la lecture ; sans intervention, aucun fichier n'est remplacé."""
+    print(f"🔍 Analyse du fichier : {pdf_path}...")
+    n_rows, complete = 0, False
+    try:
         # On sauvegarde le résultat propre dans un fichier CSV (compatible Excel)
-        output_file = "discours_grand_conseil.csv"
-        df.to_csv(output_file, index=False, encoding='utf-8-sig')
-        print(f"\n💾 Données sauvegardées dans '{output_file}'")
\ No newline at end of file
+        with open(f"{output_file}.tmp", 'w', newline='', encoding='utf-8-sig') as fh:
+            writer = csv.DictWriter(fh, fieldnames=OUTPUT_COLUMNS, lineterminator='\n')
+            writer.writeheader()
+            for row in iter_speeches(pdf_path, backend):
+                writer.writerow(row)
+                n_rows += 1
+        complete = True
+    except FileNotFoundError:
+        print("❌ Fichier introuvable.")
+    finally:
+        # Lecture interrompue ou vide : l'ancien CSV reste en place
+        if not (complete and n_rows) and os.path.exists(f"{output_file}.tmp"): os.remove(f"{output_file}.tmp")
+    if not n_rows: return 0
+
+    os.replace(f"{output_file}.tmp", output_file)
+    print(f"✅ Terminé ! {n_rows} interventions extraites.")
+    print(f"\n💾 Données sauvegardées dans '{output_file}'")
+    return n_rows
+
+
+if __name__ == "__main__":
+    save_speeches(PDF_PATH)
\ No newline at end of file
@@ -1,12 +1,28 @@
-import pdfplumber
 import re
 import pandas as pd
 import os
 import glob
-import csv  # <--- IMPORTANT : Pour gérer les guillemets
+import argparse
+import hashlib
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from corpus import CORPUS_CSV, CorpusWriter
+from pdf_backend import BACKENDS, DEFAULT_BACKEND, open_pdf
+from speaker_grammar import SPEAKER_HEADER, ce_identity, normalize_slice, parse_identity
 
 # --- CONFIGURATION ---
 PDF_FOLDER = "pdfs"
+CACHE_FOLDER = ".cache_extraction"
+PROFILE_REPORT = "profil_extraction.json"
+
+# Colonnes d'un fragment extrait (avant fusion des interventions)
+ROW_COLUMNS = ['Date', 'Objet', 'Orateur', 'Parti', 'Texte']
+
+# À incrémenter dès que la logique d'extraction change (invalide le cache)
+EXTRACTOR_VERSION = "1"
 
 MOIS = {
     "01": "Janvier", "02": "Février", "03": "Mars", "04": "Avril",
@@ -27,139 +43,442 @@ def get_date_from_filename(filepath):
     return "Date inconnue"
 
 
-def extract_speeches(pdf_path):
-    print(f"🔍 Analyse du fichier : {pdf_path}")
+def get_sort_key_from_filename(filepath):
+    """Clé de tri chronologique (PV_AAMM), les fichiers sans date passent à la fin."""
+    filename = os.path.basename(filepath)
+    match = re.search(r'PV_(\d{2})(\d{2})', filename, re.IGNORECASE)
+    if match:
+        return (0, match.group(1), match.group(2), filename)
+    return (1, "", "", filename)
+
+
+def extract_speeches(pdf_path, verbose=True, profiler=None, backend=DEFAULT_BACKEND):
+    try:
+        return _extract_speeches(pdf_path, verbose=verbose, profiler=profiler, backend=backend)
+    except Exception as e:
+        print(f"❌ Erreur sur {pdf_path} : {e}")
+        return pd.DataFrame(columns=ROW_COLUMNS)
+
+
+def _extract_speeches(pdf_path, verbose=True, profiler=None, backend=DEFAULT_BACKEND):
+    """Comme extract_speeches, mais laisse remonter les erreurs (utile pour les workers)."""
+    return pd.DataFrame(list(iter_speeches(pdf_path, verbose=verbose, profiler=profiler, backend=backend)),
+                        columns=ROW_COLUMNS)
+
+
+def iter_speeches(pdf_path, verbose=True, profiler=None, backend=DEFAULT_BACKEND):
+    """Générateur : les fragments d'intervention du bulletin, produits page par page.
+
+    Une seule page est en mémoire à la fois (son cache de mise en page est vidé une fois lue).
+    Avec un StageProfiler, le temps de chaque étape est relevé page par page.
+    backend : moteur de lecture du PDF (pdf_backend.BACKENDS).
+    """
+    prof = profiler or NULL_PROFILER
     current_date = get_date_from_filename(pdf_path)
-    print(f"   📅 Date détectée : {current_date}")
+    if verbose:
+        print(f"🔍 Analyse du fichier : {pdf_path}")
+        print(f"   📅 Date détectée : {current_date}")
 
-    data = []
     current_speaker = None
     current_party = None
     current_object = "Ouverture / Divers"
 
-    regex_strict = r'(?:^|\n)(M\.|Mme|Le président|La présidente|Le rapporteur|La rapporteur)\s*([^\n:]*)\s*:\s*[–-]?\s+'
-
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            start_page = 1 if len(pdf.pages) > 1 else 0
-
-            for i, page in enumerate(pdf.pages[start_page:]):
-                width = page.width
-                height = page.height
-
-                # --- 1. OBJETS ---
-                bold_objects = []
-                words = page.extract_words(extra_attrs=['fontname'])
-                for w in words:
-                    text = w['text']
-                    font = w['fontname'].lower()
-                    if 'bold' in font or 'bd' in font or 'gras' in font:
-                        found_ids = re.findall(r'\d{2}\.\d{3}', text)
-                        for obj_id in found_ids:
-                            bold_objects.append({'id': obj_id, 'top': w['top']})
-                bold_objects.sort(key=lambda x: x['top'])
-
-                # --- 2. SLICING ---
-                slice_points = [50] + [obj['top'] for obj in bold_objects] + [height - 50]
-
-                for j in range(len(slice_points) - 1):
-                    y_top = slice_points[j]
-                    y_bottom = slice_points[j + 1]
-                    if y_bottom - y_top < 10: continue
-                    if j > 0: current_object = bold_objects[j - 1]['id']
-
-                    bbox = (0, y_top, width, y_bottom)
-                    cropped_slice = page.crop(bbox)
-                    text = cropped_slice.extract_text()
-                    if not text: continue
-
-                    # --- 3. ORATEURS ---
-                    text_clean = re.sub(r'(?m)^(M\.|Mme|Le|La)\s+([^:\n]+)\n\s*([^:\n]+):', r'\1 \2 \3:', text)
-                    text_clean = re.sub(r',\s*\n\s*', ', ', text_clean)
-                    text_clean = text_clean.replace('’', "'")
-
-                    matches = list(re.finditer(regex_strict, text_clean))
-
-                    if not matches:
-                        if current_speaker:
+    prof.start_file(pdf_path)
+    with prof.stage('open'):
+        pdf = open_pdf(pdf_path, backend)
+
+    with pdf:
+        start_page = 1 if len(pdf.pages) > 1 else 0
+
+        for page in pdf.pages[start_page:]:
+            prof.start_page(page.page_number)
+            data = []
+            for obj_id, text in page_slices(page, prof):
+                if obj_id is not None: current_object = obj_id
+                if not text: continue
+
+                # --- 3. ORATEURS ---
+                with prof.stage('normalize'):
+                    text_clean = normalize_slice(text)
+                with prof.stage('speaker_regex'):
+                    matches = list(SPEAKER_HEADER.finditer(text_clean))
+
+                if not matches:
+                    if current_speaker:
+                        with prof.stage('append_entry'):
                             append_entry(data, current_speaker, current_party, current_object, current_date, text)
-                        continue
-
-                    cursor = 0
-                    for match in matches:
-                        start_pos = match.start()
-                        end_pos = match.end()
-
-                        # Avant
-                        text_before = text_clean[cursor:start_pos].strip()
-                        if text_before and current_speaker:
-                            if len(text_before) < 100 and (
-                                    "occupe le siège" in text_before.lower() or "séance est levée" in text_before.lower()):
-                                pass
-                            else:
+                    continue
+
+                cursor = 0
+                for match in matches:
+                    start_pos = match.start()
+                    end_pos = match.end()
+
+                    # Avant
+                    text_before = text_clean[cursor:start_pos].strip()
+                    if text_before and current_speaker:
+                        if len(text_before) < 100 and (
+                                "occupe le siège" in text_before.lower() or "séance est levée" in text_before.lower()):
+                            pass
+                        else:
+                            with prof.stage('append_entry'):
                                 append_entry(data, current_speaker, current_party, current_object, current_date,
                                              text_before)
 
-                        # Nouveau
-                        titre = match.group(1)
-                        raw_identity = match.group(2).strip()
-                        if raw_identity == "" and "M." in titre: continue
+                    # Nouveau
+                    kind = match.lastgroup  # 'ce', 'membre', 'presidence' ou 'rapporteur'
+                    titre = match.group(f'{kind}_titre')
+                    raw_identity = match.group(f'{kind}_identite').strip()
+                    if raw_identity == "" and "M." in titre: continue
+
+                    with prof.stage('parse_identity'):
+                        if kind == 'ce':
+                            current_speaker, current_party = ce_identity(titre, raw_identity)
+                        else:
+                            current_speaker, current_party = parse_identity(titre, raw_identity)
+                    cursor = end_pos
+
+                # Après
+                text_after = text_clean[cursor:].strip()
+                if text_after and current_speaker:
+                    with prof.stage('append_entry'):
+                        append_entry(data, current_speaker, current_party, current_object, current_date, text_after)
 
-                        current_speaker, current_party = parse_identity(titre, raw_identity)
-                        cursor = end_pos
+            page.close()
+            prof.end_page(len(data))
+            yield from data
+    prof.end_file()
 
-                    # Après
-                    text_after = text_clean[cursor:].strip()
-                    if text_after and current_speaker:
-                        append_entry(data, current_speaker, current_party, current_object, current_date, text_after)
 
-        cols = ['Date', 'Objet', 'Orateur', 'Parti', 'Texte']
-        if not data: return pd.DataFrame(columns=cols)
-        return pd.DataFrame(data)
+# --- MISE EN PAGE (UNE SEULE PASSE PAR PAGE) ---
+BOLD_OBJECT_ID = re.compile(r'\d{2}\.\d{3}')
 
-    except Exception as e:
-        print(f"❌ Erreur sur {pdf_path} : {e}")
-        return pd.DataFrame(columns=['Date', 'Objet', 'Orateur', 'Parti', 'Texte'])
 
+def is_bold_font(fontname):
+    font = fontname.lower()
+    return 'bold' in font or 'bd' in font or 'gras' in font
 
-# --- HELPERS ---
-def parse_identity(titre, raw_identity):
-    identity = raw_identity.replace('\n', ' ').replace('’', "'").strip()
-    if ("président" in titre.lower() or "rapporteur" in titre.lower()) and not identity: return titre, "Présidence"
-    if "(" in identity and ")" in identity:
-        m = re.match(r'(.+?)\s*\((.+?)\)', identity)
-        if m: return f"{titre} {m.group(1).strip()}", m.group(2).strip()
-    if "," in identity:
-        parts = identity.split(',', 1)
-        nom = parts[0].strip()
-        suite = parts[1].strip()
-        suite_lower = suite.lower()
-        speaker = f"{titre} {nom}"
-        party = "Conseil d'État"
-        if "département" in suite_lower:
-            m = re.search(r'(département.*)', suite, re.IGNORECASE)
-            party = m.group(1) if m else suite
-        elif "chancell" in suite_lower:
-            party = "Chancellerie d'État"
-        elif "président" in suite_lower and "état" in suite_lower:
-            party = "Présidence CE"
-        elif "conseil" in suite_lower and "état" in suite_lower:
-            party = "Conseil d'État"
-        elif "président" in suite_lower:
-            party = "Présidence"
-        return speaker, party
-    if "président" in titre.lower(): return f"{titre} {identity}", "Présidence"
-    return f"{titre} {identity}", "Indéterminé"
 
+def page_slices(page, profiler=None):
+    """Découpe une page en tranches entre les numéros d'objets en gras.
+
+    page est une page de pdf_backend : elle est analysée une seule fois, les mots (pour repérer les objets)
+    et le texte de chaque tranche en sont tirés. Avec pdfplumber, le résultat est identique à
+    page.crop(bbox).extract_text().
 
+    Renvoie des couples (id_objet, texte) ; id_objet vaut None pour la tranche d'avant le premier objet.
+    """
+    prof = profiler or NULL_PROFILER
+    width = page.width
+    height = page.height
+    with prof.stage('chars'):  # Analyse de la page par le moteur PDF
+        page.load()
+
+    # --- 1. OBJETS ---
+    # Un numéro d'objet en gras suppose au moins un chiffre en gras : sinon inutile de construire les mots
+    bold_objects = []
+    with prof.stage('extract_words'):
+        words = page.words(keep=lambda w: is_bold_font(w['fontname']),
+                           require=lambda char, fontname: char.isdigit() and is_bold_font(fontname))
+    for w in words:
+        for obj_id in BOLD_OBJECT_ID.findall(w['text']):
+            bold_objects.append({'id': obj_id, 'top': w['top']})
+    bold_objects.sort(key=lambda x: x['top'])
+
+    # --- 2. SLICING ---
+    slice_points = [50] + [obj['top'] for obj in bold_objects] + [height - 50]
+
+    for j in range(len(slice_points) - 1):
+        y_top = slice_points[j]
+        y_bottom = slice_points[j + 1]
+        if y_bottom - y_top < 10: continue
+
+        with prof.stage('slice_text'):  # Équivalent de page.crop(bbox).extract_text()
+            text = page.text((0, y_top, width, y_bottom))
+
+        yield (bold_objects[j - 1]['id'] if j > 0 else None), text
+
+
+# --- HELPERS ---
 def append_entry(data, speaker, party, objet, date, text):
     if len(text) < 3 or "Vote n°" in text or "Résultat du vote" in text: return
     if text.isupper() and len(text) < 50: return
     data.append({'Date': date, 'Objet': objet, 'Orateur': speaker, 'Parti': party, 'Texte': text})
 
 
+# --- PROFILAGE PAR ÉTAPE (--profile) ---
+class NullProfiler:
+    """Profilage désactivé : ne mesure rien (chaque étape coûte un simple appel)."""
+    _context = nullcontext()
+
+    def stage(self, name):
+        return self._context
+
+    def start_file(self, pdf_path): pass
+
+    def start_page(self, number): pass
+
+    def end_page(self, interventions): pass
+
+    def end_file(self): pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StageProfiler:
+    """Temps et nombre d'appels de chaque étape de l'extraction, par page et par fichier.
+
+    Le temps d'une page court de start_page à end_page (le code qui consomme le générateur n'est pas
+    compté) ; 'autre' est la part de ce temps qui n'appartient à aucune étape nommée.
+    """
+
+    def __init__(self):
+        self.pages = []
+        self.files = []
+        self._file = None
+        self._page = None
+        self._page_t0 = 0.0
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, time.perf_counter() - t0)
+
+    def _add(self, name, seconds, calls=1):
+        target = self._page if self._page is not None else self._file
+        entry = target['stages'].setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+
+    def start_file(self, pdf_path):
+        self._file = {'file': os.path.basename(pdf_path), 'pages': 0, 'interventions': 0, 'seconds': 0.0,
+                      'stages': {}}
+
+    def start_page(self, number):
+        self._page = {'file': self._file['file'], 'page': number, 'interventions': 0, 'seconds': 0.0,
+                      'stages': {}}
+        self._page_t0 = time.perf_counter()
+
+    def end_page(self, interventions):
+        page = self._page
+        page['seconds'] = time.perf_counter() - self._page_t0
+        page['interventions'] = interventions
+        named = sum(seconds for seconds, _ in page['stages'].values())
+        page['stages']['autre'] = [max(page['seconds'] - named, 0.0), 1]
+        self._page = None
+        self.pages.append(page)
+
+        f = self._file
+        f['pages'] += 1
+        f['interventions'] += interventions
+        for name, (seconds, calls) in page['stages'].items():
+            entry = f['stages'].setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+
+    def end_file(self):
+        f = self._file
+        f['seconds'] = sum(seconds for seconds, _ in f['stages'].values())
+        self.files.append(f)
+        self._file = None
+
+    def report(self):
+        return {'files': self.files, 'pages': self.pages}
+
+    def merge(self, report):
+        """Ajoute le rapport d'un autre profileur (worker du pool de processus)."""
+        self.files.extend(report['files'])
+        self.pages.extend(report['pages'])
+
+    def totals(self):
+        totals = {}
+        for f in self.files:
+            for name, (seconds, calls) in f['stages'].items():
+                entry = totals.setdefault(name, [0.0, 0])
+                entry[0] += seconds
+                entry[1] += calls
+        return totals
+
+    def write(self, json_path):
+        """Rapport complet en JSON, et une ligne par (page, étape) dans le CSV voisin."""
+        report = self.report()
+        report['totals'] = {name: {'seconds': s, 'calls': c} for name, (s, c) in self.totals().items()}
+        with open(json_path, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+
+        csv_path = os.path.splitext(json_path)[0] + ".csv"
+        rows = [{'file': p['file'], 'page': p['page'], 'interventions': p['interventions'], 'stage': name,
+                 'seconds': seconds, 'calls': calls}
+                for p in self.pages for name, (seconds, calls) in p['stages'].items()]
+        pd.DataFrame(rows, columns=['file', 'page', 'interventions', 'stage', 'seconds', 'calls']).to_csv(
+            csv_path, index=False)
+        return json_path, csv_path
+
+    def summary(self):
+        totals = self.totals()
+        grand_total = sum(seconds for seconds, _ in totals.values())
+        pages = sum(f['pages'] for f in self.files)
+        interventions = sum(f['interventions'] for f in self.files)
+        lines = [f"⏱️ {len(self.files)} fichiers, {pages} pages, {interventions} interventions, "
+                 f"{grand_total:.2f} s",
+                 f"   {'étape':<16}{'appels':>10}{'total (s)':>12}{'%':>7}{'ms/appel':>11}"]
+        for name in sorted(totals, key=lambda n: -totals[n][0]):
+            seconds, calls = totals[name]
+            lines.append(f"   {name:<16}{calls:>10}{seconds:>12.3f}{100 * seconds / (grand_total or 1.0):>7.1f}"
+                         f"{1000 * seconds / max(calls, 1):>11.3f}")
+        return "\n".join(lines)
+
+
+# --- CACHE D'EXTRACTION ---
+def file_hash(filepath):
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_path(cache_dir, digest, backend=DEFAULT_BACKEND):
+    # Un dossier par moteur PDF : leurs extractions peuvent différer légèrement
+    version = f"v{EXTRACTOR_VERSION}" if backend == DEFAULT_BACKEND else f"v{EXTRACTOR_VERSION}-{backend}"
+    return os.path.join(cache_dir, version, f"{digest}.pkl")
+
+
+def load_cached(cache_dir, digest, pdf_path, backend=DEFAULT_BACKEND):
+    path = cache_path(cache_dir, digest, backend)
+    if not os.path.exists(path): return None
+    try:
+        df = pd.read_pickle(path)
+    except Exception:
+        return None
+    # La date vient du nom du fichier, pas du contenu : on la recalcule
+    if not df.empty: df['Date'] = get_date_from_filename(pdf_path)
+    return df
+
+
+def store_cached(cache_dir, digest, df, backend=DEFAULT_BACKEND):
+    path = cache_path(cache_dir, digest, backend)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)  # Écriture atomique
+
+
+# --- TRAITEMENT PARALLÈLE ---
+def _extract_file(pdf_path, profile=False, backend=DEFAULT_BACKEND):
+    """Worker : renvoie (chemin, DataFrame, erreur, rapport de profilage) sans jamais lever d'exception."""
+    profiler = StageProfiler() if profile else None
+    try:
+        df = _extract_speeches(pdf_path, verbose=False, profiler=profiler, backend=backend)
+        return pdf_path, df, None, profiler.report() if profiler else None
+    except Exception as e:
+        return pdf_path, None, f"{type(e).__name__}: {e}", None
+
+
+def iter_extracted(pdf_files, workers=1, cache_dir=None, profiler=None, backend=DEFAULT_BACKEND):
+    """Extrait tous les PDF (éventuellement en parallèle) et rend leurs DataFrames dans l'ordre chronologique.
+
+    Chaque DataFrame est rendu dès que les bulletins précédents sont sortis : seuls les résultats arrivés
+    en avance restent en mémoire. Avec cache_dir, seuls les PDF nouveaux ou modifiés sont analysés,
+    les autres sont relus depuis le cache au moment de leur tour. Avec un StageProfiler, les fichiers
+    analysés (pas ceux du cache) y ajoutent leurs temps par étape. backend : moteur PDF (pdf_backend.py).
+    """
+    pdf_files = sorted(pdf_files, key=get_sort_key_from_filename)
+    results = {}
+    digests = {}
+
+    if cache_dir:
+        for pdf_file in pdf_files:
+            digests[pdf_file] = file_hash(pdf_file)
+        cached = {f for f in pdf_files if os.path.exists(cache_path(cache_dir, digests[f], backend))}
+        print(f"   💾 Cache : {len(cached)}/{len(pdf_files)} fichiers déjà extraits.")
+    else:
+        cached = set()
+
+    to_parse = [f for f in pdf_files if f not in cached]
+    total = len(to_parse)
+    profile = profiler is not None
+    done = 0
+
+    def collect(pdf_path, df, error, report=None):
+        nonlocal done
+        done += 1
+        name = os.path.basename(pdf_path)
+        if error:
+            print(f"   [{done}/{total}] ❌ {name} : {error}")
+        else:
+            print(f"   [{done}/{total}] ✅ {name} : {len(df)} entrées.")
+        results[pdf_path] = df
+        if profiler and report: profiler.merge(report)
+        # Les échecs ne sont pas mis en cache : ils seront retentés au prochain passage
+        if cache_dir and not error: store_cached(cache_dir, digests[pdf_path], df, backend)
+
+    position = 0
+
+    def release():
+        """Rend, dans l'ordre des dates, les bulletins dont tous les prédécesseurs sont prêts."""
+        nonlocal position, total
+        while position < len(pdf_files):
+            pdf_file = pdf_files[position]
+            if pdf_file in cached:
+                df = load_cached(cache_dir, digests[pdf_file], pdf_file, backend)
+                if df is None:  # Cache illisible : on ré-analyse ce fichier
+                    total += 1
+                    collect(*_extract_file(pdf_file, profile, backend))
+                    df = results.pop(pdf_file)
+            elif pdf_file in results:
+                df = results.pop(pdf_file)
+            else:
+                return
+            position += 1
+            if df is not None and not df.empty: yield df
+
+    if workers <= 1 or total <= 1:
+        for pdf_file in to_parse:
+            yield from release()
+            collect(*_extract_file(pdf_file, profile, backend))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_extract_file, pdf_file, profile, backend): pdf_file for pdf_file in to_parse}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:  # Worker tué (mémoire, segfault...)
+                    result = futures[future], None, f"{type(e).__name__}: {e}", None
+                collect(*result)
+                yield from release()
+    yield from release()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extraction des interventions des bulletins du Grand Conseil.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Nombre de processus pour traiter les PDF en parallèle (défaut : 1, 0 = tous les cœurs)")
+    parser.add_argument("--cache-dir", default=CACHE_FOLDER,
+                        help=f"Dossier du cache d'extraction (défaut : {CACHE_FOLDER})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ré-analyse tous les PDF sans lire ni écrire le cache")
+    parser.add_argument("--no-database", action="store_true",
+                        help="N'écrit pas la base SQLite du corpus (recherche FTS5 et textes à la demande de app.py)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="N'écrit pas le store projeté en mémoire (corpus partagé entre les sessions de app.py)")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"Moteur de lecture des PDF (défaut : {DEFAULT_BACKEND} ; pdfium est plus rapide, "
+                             "comparer avec benchmarks/compare_backends.py)")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_REPORT, metavar="RAPPORT.json",
+                        help=f"Mesure le temps de chaque étape (rapport JSON + CSV, défaut : {PROFILE_REPORT})")
+    return parser.parse_args(argv)
+
+
 # --- MAIN BLOCK ---
 if __name__ == "__main__":
+    args = parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
     pdf_files = glob.glob(os.path.join(PDF_FOLDER, "*.pdf"))
     if not pdf_files and os.path.exists("bulletin_test.pdf"): pdf_files = ["bulletin_test.pdf"]
 
@@ -167,34 +486,27 @@ if __name__ == "__main__":
         print("❌ Aucun fichier PDF trouvé !")
         exit()
 
-    all_dataframes = []
-    print(f"🚀 Traitement de {len(pdf_files)} fichiers...")
-
-    for pdf_file in pdf_files:
-        df_temp = extract_speeches(pdf_file)
-        if not df_temp.empty:
-            all_dataframes.append(df_temp)
-            print(f"   ✅ {len(df_temp)} entrées.")
-
-    if all_dataframes:
-        print("\n🔄 Fusion...")
-        df_total = pd.concat(all_dataframes, ignore_index=True)
-
-        df_total['groupe_id'] = (df_total['Orateur'] != df_total['Orateur'].shift()).cumsum() + \
-                                (df_total['Objet'] != df_total['Objet'].shift()).cumsum() + \
-                                (df_total['Date'] != df_total['Date'].shift()).cumsum()
-
-        df_final = df_total.groupby(['groupe_id', 'Orateur', 'Parti', 'Objet', 'Date'])['Texte'].apply(
-            lambda x: " ".join(x)).reset_index()
-        df_final['Texte'] = df_final['Texte'].str.replace('\n', ' ', regex=False)
-        df_final = df_final.drop(columns=['groupe_id'])
-
-        output_file = "discours_grand_conseil_complet.csv"
-
-        # --- C'EST ICI QUE LA MAGIE OPÈRE (QUOTING) ---
-        df_final.to_csv(output_file, index=False, encoding='utf-8-sig', quoting=csv.QUOTE_ALL)
-        # ----------------------------------------------
-
-        print(f"🎉 Succès ! Fichier généré : '{output_file}' ({len(df_final)} lignes)")
+    print(f"🚀 Traitement de {len(pdf_files)} fichiers ({workers} worker(s), moteur {args.backend})...")
+    cache_dir = None if args.no_cache else args.cache_dir
+    profiler = StageProfiler() if args.profile else None
+    if profiler and cache_dir: print("   ⏱️ Profilage : les fichiers relus depuis le cache ne sont pas mesurés (--no-cache).")
+    # CSV en QUOTE_ALL (les guillemets protègent les virgules du texte) + Parquet typé pour app.py
+    with CorpusWriter(CORPUS_CSV, database=not args.no_database, store=not args.no_store) as writer:
+        # Les fragments partent dans le fichier au fil des bulletins, fusionnés à la volée
+        for df in iter_extracted(pdf_files, workers=workers, cache_dir=cache_dir, profiler=profiler,
+                                 backend=args.backend):
+            writer.write_frame(df)
+    output_file, parquet_file = writer.close()
+
+    if writer.rows_written:
+        print(f"🎉 Succès ! Fichier généré : '{output_file}' ({writer.rows_written} lignes)")
+        if parquet_file: print(f"   📦 Version colonnes : '{parquet_file}'")
+        if writer.database_file: print(f"   🗄️ Base SQLite (FTS5) : '{writer.database_file}'")
+        if writer.store_dir: print(f"   🧠 Store partagé (mmap) : '{writer.store_dir}'")
     else:
-        print("❌ Aucune donnée.")
\ No newline at end of file
+        print("❌ Aucune donnée.")
+
+    if profiler:
+        print("\n" + profiler.summary())
+        json_path, csv_path = profiler.write(args.profile)
+        print(f"   📊 Rapport de profilage : '{json_path}' et '{csv_path}'")
@@ -0,0 +1,117 @@
+"""Index inversé des interventions pour la recherche par mot-clé de app.py.
+
+La recherche garde la sémantique de l'ancien str.contains (sous-chaîne littérale, casse au choix) :
+l'index donne un petit ensemble de lignes candidates, et seules celles-ci sont vérifiées sur le texte.
+
+Syntaxe des requêtes : « a ET b » / « a AND b » (les deux), « a OU b » / « a OR b » (l'un ou l'autre).
+Sans opérateur, plusieurs mots forment une expression exacte, comme avant.
+"""
+import bisect
+import re
+from collections import defaultdict
+
+import numpy as np
+
+TOKEN_RE = re.compile(r'\w+')
+OR_RE = re.compile(r'\s+(?:OU|OR)\s+')
+AND_RE = re.compile(r'\s+(?:ET|AND)\s+')
+
+
+def parse_query(query):
+    """'a ET b OU c' -> [['a', 'b'], ['c']] (disjonction de conjonctions d'expressions)."""
+    clauses = []
+    for alternative in OR_RE.split(query.strip()):
+        phrases = [p.strip() for p in AND_RE.split(alternative) if p.strip()]
+        if phrases: clauses.append(phrases)
+    return clauses
+
+
+def query_terms(query):
+    """Toutes les expressions d'une requête (pour le surlignage)."""
+    return [phrase for clause in parse_query(query) for phrase in clause]
+
+
+class SearchIndex:
+    """Listes de lignes par mot (en minuscules), construites une fois pour tout le corpus."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.row_ids = np.asarray(texts.index)
+
+        postings = defaultdict(list)
+        for pos, text in enumerate(texts):
+            for token in set(TOKEN_RE.findall(text.lower())):
+                postings[token].append(pos)
+        self.postings = {token: np.asarray(rows, dtype=np.int32) for token, rows in postings.items()}
+
+        # Vocabulaire trié (préfixes), trié à l'envers (suffixes) et concaténé (sous-chaînes)
+        self.vocab = sorted(self.postings)
+        self.reversed_vocab = sorted(token[::-1] for token in self.vocab)
+        self.vocab_blob = "\n".join(self.vocab)
+        self.vocab_starts = [0]
+        for token in self.vocab[:-1]:
+            self.vocab_starts.append(self.vocab_starts[-1] + len(token) + 1)
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    # --- RECHERCHE DANS LE VOCABULAIRE ---
+    def _with_prefix(self, prefix):
+        lo = bisect.bisect_left(self.vocab, prefix)
+        hi = bisect.bisect_left(self.vocab, prefix + "\U0010ffff")
+        return self.vocab[lo:hi]
+
+    def _with_suffix(self, suffix):
+        rev = suffix[::-1]
+        lo = bisect.bisect_left(self.reversed_vocab, rev)
+        hi = bisect.bisect_left(self.reversed_vocab, rev + "\U0010ffff")
+        return [token[::-1] for token in self.reversed_vocab[lo:hi]]
+
+    def _containing(self, fragment):
+        found = []
+        last = -1
+        for m in re.finditer(re.escape(fragment), self.vocab_blob):
+            k = bisect.bisect_right(self.vocab_starts, m.start()) - 1
+            if k != last:
+                found.append(self.vocab[k])
+                last = k
+        return found
+
+    def _union(self, tokens):
+        arrays = [self.postings[t] for t in tokens]
+        if not arrays: return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(arrays)) if len(arrays) > 1 else arrays[0]
+
+    def _candidates(self, phrase):
+        """Lignes pouvant contenir l'expression (sur-ensemble exact de la réponse)."""
+        tokens = TOKEN_RE.findall(phrase.lower())
+        if not tokens:
+            return np.arange(len(self.row_ids), dtype=np.int32)  # Ponctuation seule : on vérifie tout
+        if len(tokens) == 1:
+            return self._union(self._containing(tokens[0]))
+
+        # Dans une expression, le premier mot peut être une fin de mot, le dernier un début de mot,
+        # et ceux du milieu sont des mots entiers
+        rows = self._union(self._with_suffix(tokens[0]))
+        for token in tokens[1:-1]:
+            rows = np.intersect1d(rows, self.postings.get(token, np.empty(0, dtype=np.int32)), assume_unique=True)
+        return np.intersect1d(rows, self._union(self._with_prefix(tokens[-1])), assume_unique=True)
+
+    def _match_phrase(self, phrase, case_sensitive, within=None):
+        rows = self._candidates(phrase)
+        if within is not None:
+            rows = np.intersect1d(rows, within, assume_unique=True)
+        if len(rows) == 0: return rows
+        found = self.texts.iloc[rows].str.contains(phrase, case=case_sensitive, regex=False).to_numpy(dtype=bool)
+        return rows[found]
+
+    def search(self, query, case_sensitive=False):
+        """Identifiants (index du DataFrame) des interventions qui satisfont la requête."""
+        result = np.empty(0, dtype=np.int32)
+        for clause in parse_query(query):
+            rows = None
+            for phrase in clause:
+                rows = self._match_phrase(phrase, case_sensitive, within=rows)
+                if len(rows) == 0: break
+            result = np.union1d(result, rows)
+        return self.row_ids[result]
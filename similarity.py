@@ -0,0 +1,103 @@
+"""Interventions similaires : matrice TF-IDF (normalisée L2) calculée hors-ligne, voisins à la demande.
+
+Chaque intervention est une ligne TF-IDF de norme 1 : la similarité cosinus avec toutes les autres est
+un seul produit creux, limité aux colonnes (mots) de l'intervention ouverte grâce à une copie de la
+matrice rangée par mot. Une recherche ne lit donc que les interventions qui partagent au moins un mot
+avec elle, quelle que soit la taille du corpus.
+
+La matrice est rangée à côté du corpus (discours_grand_conseil_complet.tfidf.npz) avec la version du
+corpus d'origine ; elle est ignorée après un nouveau scraping, jusqu'au prochain calcul.
+
+Usage : python similarity.py [--max-features 50000]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from annotation import TOKEN_PATTERN, stop_words
+from corpus import CORPUS_CSV, corpus_version, read_corpus
+
+
+def matrix_path(directory):
+    return os.path.join(directory, f"{os.path.splitext(CORPUS_CSV)[0]}.tfidf.npz")
+
+
+def build_matrix(texts, max_features=50000):
+    """Matrice TF-IDF interventions x mots (CSR, float32, lignes de norme 1), dans l'ordre des textes."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(token_pattern=TOKEN_PATTERN, lowercase=True, stop_words=stop_words(),
+                                 min_df=2, max_df=0.5, max_features=max_features, sublinear_tf=True,
+                                 norm='l2', dtype=np.float32)
+    return vectorizer.fit_transform(texts).tocsr()
+
+
+def save_matrix(matrix, directory):
+    # save_npz ne garde pas de métadonnées : les tableaux CSR sont écrits à la main avec la version
+    path = matrix_path(directory)
+    np.savez(f"{path}.tmp.npz", data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+             shape=np.array(matrix.shape), corpus_version=np.array(str(corpus_version(directory))))
+    os.replace(f"{path}.tmp.npz", path)
+    return path
+
+
+class SimilarityIndex:
+    """Voisins les plus proches (cosinus) d'une intervention, par row_id."""
+
+    def __init__(self, matrix):
+        self.matrix = matrix.tocsr()
+        # Copie par mot : pour une intervention, seules les colonnes de ses mots sont lues
+        self.by_term = self.matrix.T.tocsr()
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def scores(self, row_id):
+        """Similarité cosinus de l'intervention row_id avec toutes les autres."""
+        row = self.matrix[row_id]
+        return np.asarray(self.by_term[row.indices].T @ row.data).ravel()
+
+    def neighbours(self, row_id, k=5):
+        """[(row_id, score), ...] des k interventions les plus proches (elle-même exclue, score > 0)."""
+        if not 0 <= row_id < len(self): return []
+        scores = self.scores(row_id)
+        scores[row_id] = 0
+        k = min(k, int((scores > 0).sum()))
+        if k == 0: return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.lexsort((best, -scores[best]))]  # Score décroissant, puis ordre du corpus
+        return [(int(j), float(scores[j])) for j in best]
+
+
+def load_similarity_index(directory):
+    """Index de similarité, ou None si la matrice manque ou date d'une autre version du corpus."""
+    from scipy import sparse
+
+    path = matrix_path(directory)
+    if not os.path.exists(path): return None
+    with np.load(path) as npz:
+        if str(npz['corpus_version']) != str(corpus_version(directory)):
+            return None
+        matrix = sparse.csr_matrix((npz['data'], npz['indices'], npz['indptr']), shape=tuple(npz['shape']))
+    return SimilarityIndex(matrix)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Matrice TF-IDF des interventions (recherche d'interventions similaires).")
+    parser.add_argument("--max-features", type=int, default=50000, help="Taille maximale du vocabulaire (défaut : 50000)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    texts = read_corpus(directory)['Texte'].fillna("").astype(str)
+    print(f"🧠 TF-IDF de {len(texts)} interventions...")
+
+    t0 = time.perf_counter()
+    matrix = build_matrix(texts, max_features=args.max_features)
+    path = save_matrix(matrix, directory)
+    print(f"🎉 {matrix.shape[1]} mots, {matrix.nnz} valeurs en {time.perf_counter() - t0:.1f} s -> '{path}'")
@@ -0,0 +1,112 @@
+"""Grammaire des en-têtes d'orateurs, partagée par scraper.py et scraper2.py.
+
+Toutes les expressions sont compilées une seule fois à l'import, et la résolution
+« identité -> (orateur, parti) » est mémorisée : dans un bulletin, les mêmes en-têtes
+reviennent des centaines de fois.
+"""
+import re
+from functools import lru_cache
+
+# --- FRAGMENTS ---
+TITRE_MEMBRE = r'M\.|Mme'
+TITRE_PRESIDENCE = r'Le président|La présidente'
+TITRE_RAPPORTEUR = r'Le rapporteur|La rapporteur'
+
+# CAS 1 : Député standard -> M. Nom (PARTI) : texte
+_DEPUTE = (r'(?P<depute>(?P<dep_titre>' + TITRE_MEMBRE + r')\s+(?P<dep_nom>.+?)\s*\((?P<dep_parti>.+?)\)'
+           r'\s*:\s*.?\s*(?P<dep_texte>.*))')
+# CAS 2 : Présidence -> Le président : texte
+_PRESIDENCE = r'(?P<presidence>(?P<pres_titre>' + TITRE_PRESIDENCE + r')\s*:\s*.?\s*(?P<pres_texte>.*))'
+# CAS 3 : Rapporteur -> Le rapporteur : texte
+_RAPPORTEUR = r'(?P<rapporteur>(?P<rap_titre>' + TITRE_RAPPORTEUR + r')\s*:\s*.?\s*(?P<rap_texte>.*))'
+# CAS 4 : Conseil d'État -> M. Nom, conseiller d'État, chef du Département... : texte
+_CE = (r'(?P<ce>(?P<ce_titre>' + TITRE_MEMBRE + r')\s+(?P<ce_nom>[^,]+),\s+(?P<ce_fonction>.+?)'
+       r'\s*:\s*.?\s*(?P<ce_texte>.*))')
+
+# --- GRAMMAIRE LIGNE PAR LIGNE (scraper.py) ---
+# Une seule alternative ordonnée remplace les trois re.match successifs : le premier cas qui matche gagne.
+SPEAKER_LINE = re.compile(r'^(?:' + '|'.join([_DEPUTE, _PRESIDENCE, _RAPPORTEUR, _CE]) + r')')
+# Ligne recollée avec la suivante : seuls les en-têtes longs (Conseil d'État puis député) sont retentés
+MERGED_SPEAKER_LINE = re.compile(r'^(?:' + '|'.join([_CE, _DEPUTE]) + r')')
+
+# --- GRAMMAIRE PAR TRANCHE DE TEXTE (scraper2.py) ---
+# Même alternative ordonnée que SPEAKER_LINE : match.lastgroup donne le cas, <cas>_titre et <cas>_identite
+# l'en-tête. Le Conseil d'État (« M. Nom, fonction », sans parenthèses) passe avant les députés.
+_H_CE = r'(?P<ce>(?P<ce_titre>' + TITRE_MEMBRE + r')\s*(?P<ce_identite>[^\n:(,]+,[^\n:(]*))'
+_H_MEMBRE = r'(?P<membre>(?P<membre_titre>' + TITRE_MEMBRE + r')\s*(?P<membre_identite>[^\n:]*))'
+_H_PRESIDENCE = r'(?P<presidence>(?P<presidence_titre>' + TITRE_PRESIDENCE + r')\s*(?P<presidence_identite>[^\n:]*))'
+_H_RAPPORTEUR = r'(?P<rapporteur>(?P<rapporteur_titre>' + TITRE_RAPPORTEUR + r')\s*(?P<rapporteur_identite>[^\n:]*))'
+SPEAKER_HEADER = re.compile(
+    r'(?:^|\n)(?:' + '|'.join([_H_CE, _H_MEMBRE, _H_PRESIDENCE, _H_RAPPORTEUR]) + r')\s*:\s*[–-]?\s+'
+)
+
+# En-tête coupé sur deux lignes ("M. Nom\n(PARTI) :") et retours à la ligne après une virgule
+_SPLIT_HEADER = re.compile(r'(?m)^(M\.|Mme|Le|La)\s+([^:\n]+)\n\s*([^:\n]+):')
+_COMMA_NEWLINE = re.compile(r',\s*\n\s*')
+
+_IDENTITE_PARTI = re.compile(r'(.+?)\s*\((.+?)\)')
+_DEPARTEMENT = re.compile(r'(département.*)', re.IGNORECASE)
+
+
+def normalize_slice(text):
+    """Recolle les en-têtes d'orateurs coupés et uniformise les apostrophes."""
+    text = _SPLIT_HEADER.sub(r'\1 \2 \3:', text)
+    text = _COMMA_NEWLINE.sub(', ', text)
+    return text.replace('’', "'")
+
+
+@lru_cache(maxsize=4096)
+def parse_identity(titre, raw_identity):
+    """Transforme un en-tête ('M.', 'Dupont (PLR)') en couple (orateur, parti)."""
+    identity = raw_identity.replace('\n', ' ').replace('’', "'").strip()
+    if ("président" in titre.lower() or "rapporteur" in titre.lower()) and not identity: return titre, "Présidence"
+    if "(" in identity and ")" in identity:
+        m = _IDENTITE_PARTI.match(identity)
+        if m: return f"{titre} {m.group(1).strip()}", m.group(2).strip()
+    if "," in identity: return ce_identity(titre, identity)
+    if "président" in titre.lower(): return f"{titre} {identity}", "Présidence"
+    return f"{titre} {identity}", "Indéterminé"
+
+
+@lru_cache(maxsize=1024)
+def ce_identity(titre, raw_identity):
+    """Membre du Conseil d'État ('Mme', 'Nom, cheffe du Département ...') -> (orateur, département ou fonction)."""
+    nom, suite = raw_identity.replace('\n', ' ').replace('’', "'").split(',', 1)
+    nom, suite = nom.strip(), suite.strip()
+    suite_lower = suite.lower()
+    party = "Conseil d'État"
+    if "département" in suite_lower:
+        m = _DEPARTEMENT.search(suite)
+        party = m.group(1) if m else suite
+    elif "chancell" in suite_lower:
+        party = "Chancellerie d'État"
+    elif "président" in suite_lower and "état" in suite_lower:
+        party = "Présidence CE"
+    elif "conseil" in suite_lower and "état" in suite_lower:
+        party = "Conseil d'État"
+    elif "président" in suite_lower:
+        party = "Présidence"
+    return f"{titre} {nom}", party
+
+
+def ce_party(fonction):
+    """Parti d'un membre du Conseil d'État d'après sa fonction (grammaire ligne par ligne)."""
+    if "président" in fonction:
+        return "Présidence CE"
+    # On garde tout depuis "Département..." (ex: "chef du Département de la santé" -> "Département de la santé")
+    index_dept = fonction.find("Département")
+    if index_dept >= 0:
+        return fonction[index_dept:]
+    return "Conseil d'État"
+
+
+def match_speaker_line(line, next_line=None):
+    """Teste une ligne (et, à défaut, la ligne recollée avec la suivante).
+
+    Renvoie (match, ligne_recollée) ; match.lastgroup donne le cas : 'depute', 'presidence', 'rapporteur' ou 'ce'.
+    """
+    match = SPEAKER_LINE.match(line)
+    if match or next_line is None:
+        return match, False
+    match = MERGED_SPEAKER_LINE.match(f"{line} {next_line}")
+    return match, match is not None
@@ -0,0 +1,82 @@
+"""Matrice creuse interventions x mots, pour compter n'importe quel terme sans relire les textes.
+
+count(terme) donne, pour chaque intervention, le même résultat que texte.lower().count(terme) :
+un terme fait de lettres ne peut apparaître qu'à l'intérieur d'un mot, il suffit donc de sommer
+ses occurrences dans chaque mot du vocabulaire (pondérées par la matrice). Les termes de plusieurs
+mots ("service public") passent par une vérification exacte, limitée aux interventions candidates.
+"""
+import re
+
+import numpy as np
+
+TOKEN_PATTERN = r'(?u)\b\w+\b'
+WORD_RE = re.compile(r'\w+')
+
+
+class TermMatrix:
+
+    def __init__(self, texts):
+        """texts : colonne Texte (index = row_id), ou tout objet qui a index, l'itération et take(positions)
+        (corpus_db.DatabaseTexts) ; les textes sont parcourus une seule fois, sans en garder de copie."""
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.texts = texts
+        self.row_ids = np.asarray(texts.index)
+        # Nombre de mots au sens de l'ancien len(texte.split()), relevé pendant la même passe
+        word_counts = []
+
+        def documents():
+            for text in texts:
+                word_counts.append(len(text.split()))
+                yield text
+
+        vectorizer = CountVectorizer(token_pattern=TOKEN_PATTERN, lowercase=True, dtype=np.int32)
+        self.matrix = vectorizer.fit_transform(documents()).tocsr()
+        # Copie par colonnes : pour un terme, on ne lit que les interventions des mots qui le contiennent
+        self.matrix_csc = self.matrix.tocsc()
+        self.vocab = vectorizer.get_feature_names_out().astype(str)
+        self.vocab_index = vectorizer.vocabulary_
+        self.word_counts = np.asarray(word_counts, dtype=np.int64)
+        # Identifiant de ligne -> position dans la matrice
+        self.position_of = np.full(self.row_ids.max() + 1 if len(self.row_ids) else 0, -1, dtype=np.int64)
+        self.position_of[self.row_ids] = np.arange(len(self.row_ids))
+
+    def __len__(self):
+        return len(self.row_ids)
+
+    def positions(self, row_ids):
+        """Positions dans la matrice des identifiants de ligne donnés (ex : df_filtered.index)."""
+        return self.position_of[np.asarray(row_ids)]
+
+    def term_weights(self, term):
+        """Poids du terme sur le vocabulaire : nombre d'occurrences du terme dans chaque mot."""
+        return np.char.count(self.vocab, term.lower())
+
+    def count(self, term):
+        """Occurrences du terme (sous-chaîne, insensible à la casse) dans chaque intervention."""
+        term = term.lower()
+        words = WORD_RE.findall(term)
+        if words == [term]:
+            weights = self.term_weights(term)
+            cols = np.flatnonzero(weights)
+            return np.asarray(self.matrix_csc[:, cols] @ weights[cols]).ravel()
+
+        # Plusieurs mots (ou ponctuation) : chaque mot doit apparaître, puis on compte exactement
+        candidates = np.ones(len(self), dtype=bool)
+        for word in words:
+            candidates &= (self.matrix @ self.term_weights(word)) > 0
+        counts = np.zeros(len(self), dtype=np.int64)
+        rows = np.flatnonzero(candidates)
+        if len(rows):
+            counts[rows] = self.texts.take(rows).str.lower().str.count(re.escape(term)).to_numpy()
+        return counts
+
+    def count_many(self, terms):
+        """Somme des occurrences d'une liste de termes, en un seul produit matrice x vecteur pour les mots simples."""
+        simple = [t.lower() for t in terms if WORD_RE.findall(t.lower()) == [t.lower()]]
+        others = [t for t in terms if t.lower() not in simple]
+        weights = sum((self.term_weights(t) for t in simple), np.zeros(len(self.vocab), dtype=np.int64))
+        total = self.matrix @ weights
+        for term in others:
+            total = total + self.count(term)
+        return total
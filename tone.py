@@ -0,0 +1,89 @@
+"""Polarité / subjectivité de chaque intervention (textblob-fr), calculées une fois hors-ligne.
+
+Les interventions sont réparties par lots sur un pool de processus ; chaque processus construit son
+Blobber une seule fois. Le ton d'un orateur devient une moyenne pondérée (par la longueur des textes)
+sur toutes ses interventions, au lieu d'un échantillon des 5000 premiers caractères.
+
+Usage : python tone.py [--workers 4] [--batch-size 256]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from corpus import read_artifact, read_corpus, write_artifact
+
+TONE_ARTIFACT = "tone"
+
+_blobber = None
+
+
+def get_blobber():
+    global _blobber
+    if _blobber is None:
+        from textblob import Blobber
+        from textblob_fr import PatternTagger, PatternAnalyzer
+        _blobber = Blobber(pos_tagger=PatternTagger(), analyzer=PatternAnalyzer())
+    return _blobber
+
+
+def score_texts(texts):
+    """[(polarité, subjectivité), ...] pour une liste de textes."""
+    tb = get_blobber()
+    return [tb(text).sentiment[:2] if text else (0.0, 0.0) for text in texts]
+
+
+def score_corpus(texts, workers=1, batch_size=256):
+    """Tableau row_id, polarity, subjectivity, n_chars (row_id = position dans le corpus)."""
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    if workers <= 1 or len(batches) <= 1:
+        results = [score_texts(batch) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(score_texts, batches))  # map conserve l'ordre des lots
+
+    scores = np.array([s for batch in results for s in batch], dtype=np.float32).reshape(-1, 2)
+    return pd.DataFrame({
+        'row_id': np.arange(len(texts), dtype=np.int32),
+        'polarity': scores[:, 0],
+        'subjectivity': scores[:, 1],
+        'n_chars': np.fromiter((len(t) for t in texts), dtype=np.int32, count=len(texts)),
+    })
+
+
+def load_tone(directory):
+    tone = read_artifact(directory, TONE_ARTIFACT)
+    return None if tone is None else tone.set_index('row_id')
+
+
+def weighted_tone(tone, row_ids):
+    """(polarité, subjectivité) moyennes sur row_ids, pondérées par la longueur des interventions."""
+    sub = tone.reindex(np.asarray(row_ids)).dropna()
+    weights = sub['n_chars'].to_numpy(dtype=np.float64)
+    if weights.sum() == 0: return 0.0, 0.0
+    return (float(np.average(sub['polarity'], weights=weights)),
+            float(np.average(sub['subjectivity'], weights=weights)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Calcul hors-ligne du ton (textblob-fr) de chaque intervention.")
+    parser.add_argument("--workers", type=int, default=1, help="Nombre de processus (défaut : 1, 0 = tous les cœurs)")
+    parser.add_argument("--batch-size", type=int, default=256, help="Interventions par lot (défaut : 256)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    texts = read_corpus(directory)['Texte'].fillna("").astype(str).tolist()
+    print(f"🧠 Analyse du ton de {len(texts)} interventions ({workers} processus)...")
+
+    t0 = time.perf_counter()
+    tone = score_corpus(texts, workers=workers, batch_size=args.batch_size)
+    path = write_artifact(tone, directory, TONE_ARTIFACT)
+    print(f"🎉 Terminé en {time.perf_counter() - t0:.1f} s -> '{path}'")
@@ -0,0 +1,264 @@
+"""Thèmes des interventions (LDA), appris hors-ligne et mis à jour au fil des nouveaux bulletins.
+
+Le modèle est une LatentDirichletAllocation « online » : il apprend par lots (partial_fit) sur la
+matrice interventions x mots, avec un vocabulaire figé au premier entraînement. Après un nouveau
+scraping, seules les interventions jamais vues passent dans le modèle (une passe de partial_fit) et
+reçoivent leur distribution de thèmes ; les autres gardent la leur. Une intervention est reconnue à
+l'empreinte de (date, objet, orateur, texte) : son row_id bouge quand un bulletin s'insère au milieu.
+
+Fichiers rangés à côté du corpus :
+  - discours_grand_conseil_complet.topics.pkl : vocabulaire, modèle, empreintes et distributions
+    des interventions déjà vues ;
+  - discours_grand_conseil_complet.topics_dtm.npz : matrice documents x mots (mêmes lignes) ;
+  - artefacts doc_topics (row_id, n_words, topic_0..k) et topic_terms (mots de chaque thème), lus par
+    l'app : le mélange de thèmes d'un orateur, d'un parti ou d'un objet n'est plus qu'une somme.
+
+Usage : python topics.py               (mise à jour incrémentale, ou premier entraînement)
+        python topics.py --retrain     (nouveau modèle : vocabulaire et thèmes recalculés)
+        python topics.py --refresh     (redistribue toutes les interventions avec le modèle à jour)
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from annotation import TOKEN_PATTERN, stop_words
+from corpus import CORPUS_CSV, read_artifact, read_corpus, write_artifact
+
+DOC_TOPICS_ARTIFACT = "doc_topics"
+TOPIC_TERMS_ARTIFACT = "topic_terms"
+FINGERPRINT_COLUMNS = ['Date', 'Objet', 'Orateur', 'Texte']
+
+N_TOPICS = 12
+N_TERMS = 10
+
+
+def state_path(directory):
+    return os.path.join(directory, f"{os.path.splitext(CORPUS_CSV)[0]}.topics.pkl")
+
+
+def dtm_path(directory):
+    return os.path.join(directory, f"{os.path.splitext(CORPUS_CSV)[0]}.topics_dtm.npz")
+
+
+def fingerprints(df):
+    """Empreinte (uint64) de chaque intervention, indépendante de sa position dans le corpus."""
+    return pd.util.hash_pandas_object(df[FINGERPRINT_COLUMNS].astype(str), index=False).to_numpy()
+
+
+def match_fingerprints(previous, current):
+    """Position de chaque empreinte courante dans previous (-1 : jamais vue) ; doublons -> première occurrence."""
+    unique, first = np.unique(previous, return_index=True)
+    if not len(unique): return np.full(len(current), -1, dtype=np.int64)
+    pos = np.searchsorted(unique, current).clip(max=len(unique) - 1)
+    return np.where(unique[pos] == current, first[pos], -1)
+
+
+def make_vectorizer(vocabulary=None, max_features=5000):
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    if vocabulary is not None:
+        return CountVectorizer(token_pattern=TOKEN_PATTERN, lowercase=True, vocabulary=vocabulary,
+                               dtype=np.int32)
+    return CountVectorizer(token_pattern=TOKEN_PATTERN, lowercase=True, stop_words=stop_words(),
+                           max_df=0.5, min_df=2, max_features=max_features, dtype=np.int32)
+
+
+def state_topics(state):
+    """Nombre de thèmes d'un modèle enregistré."""
+    return state['doc_topics'].shape[1]
+
+
+def partial_fit(model, matrix, batch_size, passes, seed=0):
+    """Passes de partial_fit sur des lots mélangés (le corpus est rangé par date)."""
+    rng = np.random.default_rng(seed)
+    for _ in range(passes):
+        order = rng.permutation(matrix.shape[0])
+        for start in range(0, len(order), batch_size):
+            model.partial_fit(matrix[order[start:start + batch_size]])
+
+
+def update_topics(df, state=None, dtm=None, n_topics=None, batch_size=512, passes=5, refresh=False):
+    """Met à jour (ou crée) le modèle sur le corpus df (index = row_id) ; renvoie (état, matrice, stats).
+
+    state / dtm : résultat d'un appel précédent (None pour un premier entraînement).
+    n_topics : nombre de thèmes (None : celui du modèle existant, N_TOPICS pour un premier entraînement) ;
+    un modèle existant ne change pas de nombre de thèmes, il faut repartir de zéro (state=None).
+    """
+    from scipy import sparse
+    from sklearn.decomposition import LatentDirichletAllocation
+
+    if state is not None and n_topics is not None and n_topics != state_topics(state):
+        raise ValueError(f"Le modèle enregistré a {state_topics(state)} thèmes, pas {n_topics} : "
+                         "relancez l'entraînement (--retrain)")
+    if n_topics is None: n_topics = N_TOPICS if state is None else state_topics(state)
+
+    df = df.sort_index()
+    texts = df['Texte'].fillna("").astype(str)
+    prints = fingerprints(df)
+
+    if state is None:
+        vectorizer = make_vectorizer()
+        vectorizer.fit(texts)
+        vocabulary = vectorizer.get_feature_names_out().astype(str)
+        model = LatentDirichletAllocation(n_components=n_topics, learning_method='online',
+                                          learning_offset=10.0, random_state=0)
+        known = np.full(len(df), -1, dtype=np.int64)
+    else:
+        vocabulary, model = state['vocabulary'], state['model']
+        known = match_fingerprints(state['fingerprints'], prints)
+
+    new = np.flatnonzero(known < 0)
+    old = np.flatnonzero(known >= 0)
+    n_words_total = len(vocabulary)
+    new_matrix = make_vectorizer(vocabulary).transform(texts.iloc[new]).tocsr()
+
+    # Matrice du corpus actuel : lignes déjà vectorisées + nouvelles interventions
+    matrix = sparse.vstack([dtm[known[old]] if len(old) else sparse.csr_matrix((0, n_words_total)),
+                            new_matrix], format='csr', dtype=np.int32)
+    matrix = matrix[np.argsort(np.concatenate([old, new]), kind='stable')]
+
+    model.set_params(total_samples=max(len(df), 1))
+    if len(new):
+        # Premier entraînement : plusieurs passes ; mise à jour : une passe sur les seules nouveautés
+        partial_fit(model, new_matrix, batch_size, passes if state is None else 1)
+
+    doc_topics = np.zeros((len(df), n_topics), dtype=np.float32)
+    if refresh or state is None:
+        doc_topics[:] = model.transform(matrix)
+    else:
+        doc_topics[old] = state['doc_topics'][known[old]]
+        if len(new): doc_topics[new] = model.transform(new_matrix)
+
+    state = {'vocabulary': vocabulary, 'model': model, 'fingerprints': prints, 'doc_topics': doc_topics,
+             'row_ids': df.index.to_numpy()}
+    return state, matrix, {'new': len(new), 'known': len(old)}
+
+
+def topic_terms(state, n_terms=N_TERMS):
+    """Mots les plus lourds de chaque thème : topic, rank, term, weight."""
+    components = state['model'].components_
+    weights = components / components.sum(axis=1, keepdims=True)
+    rows = []
+    for topic, row in enumerate(weights):
+        for rank, j in enumerate(np.argsort(-row)[:n_terms]):
+            rows.append((topic, rank, state['vocabulary'][j], float(row[j])))
+    frame = pd.DataFrame(rows, columns=['topic', 'rank', 'term', 'weight'])
+    return frame.astype({'topic': 'int16', 'rank': 'int16', 'weight': 'float32'})
+
+
+def doc_topics_frame(state, matrix):
+    """Artefact de l'app : distribution des thèmes par row_id, avec le nombre de mots du vocabulaire."""
+    frame = pd.DataFrame(state['doc_topics'], columns=[f"topic_{k}" for k in range(state['doc_topics'].shape[1])])
+    frame.insert(0, 'row_id', state['row_ids'].astype(np.int32))
+    frame.insert(1, 'n_words', np.asarray(matrix.sum(axis=1)).ravel().astype(np.int32))
+    return frame
+
+
+# --- SAUVEGARDE / RELECTURE ---
+def save_topics(directory, state, matrix):
+    from scipy import sparse
+
+    with open(f"{state_path(directory)}.tmp", "wb") as fh:
+        pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(f"{state_path(directory)}.tmp", state_path(directory))
+    sparse.save_npz(f"{dtm_path(directory)}.tmp.npz", matrix)
+    os.replace(f"{dtm_path(directory)}.tmp.npz", dtm_path(directory))
+    write_artifact(topic_terms(state), directory, TOPIC_TERMS_ARTIFACT)
+    return write_artifact(doc_topics_frame(state, matrix), directory, DOC_TOPICS_ARTIFACT)
+
+
+def load_state(directory):
+    """(état, matrice) du dernier calcul, ou (None, None) s'il n'y en a pas."""
+    from scipy import sparse
+
+    if not (os.path.exists(state_path(directory)) and os.path.exists(dtm_path(directory))):
+        return None, None
+    with open(state_path(directory), "rb") as fh:
+        state = pickle.load(fh)
+    return state, sparse.load_npz(dtm_path(directory)).tocsr()
+
+
+class DocTopics:
+    """Thèmes par intervention, pondérés par leur nombre de mots : un mélange est une somme de lignes."""
+
+    def __init__(self, frame, terms, n_rows):
+        topic_columns = [c for c in frame.columns if c.startswith('topic_')]
+        self.n_topics = len(topic_columns)
+        row_ids = frame['row_id'].to_numpy()
+        self.weighted = np.zeros((n_rows, self.n_topics), dtype=np.float64)
+        keep = row_ids < n_rows
+        self.weighted[row_ids[keep]] = (frame[topic_columns].to_numpy(dtype=np.float64)[keep]
+                                        * frame['n_words'].to_numpy()[keep, None])
+        top = terms.sort_values(['topic', 'rank']).groupby('topic')['term'].apply(list)
+        self.terms = [top.get(k, []) for k in range(self.n_topics)]
+
+    def labels(self, n=4):
+        return [f"{k + 1}. " + ", ".join(self.terms[k][:n]) for k in range(self.n_topics)]
+
+    def mix(self, row_ids):
+        """Part de chaque thème dans les interventions row_ids (somme 1, ou zéros si aucun mot)."""
+        rows = np.asarray(row_ids)
+        totals = self.weighted[rows[rows < len(self.weighted)]].sum(axis=0)
+        return totals / totals.sum() if totals.sum() else totals
+
+    def mix_by(self, row_ids, groups):
+        """Mélange de thèmes par groupe (ex : parti) : matrice creuse groupes x interventions @ poids."""
+        from scipy import sparse
+
+        rows = np.asarray(row_ids)
+        keep = rows < len(self.weighted)
+        codes, names = pd.factorize(np.asarray(groups)[keep])
+        indicator = sparse.csr_matrix((np.ones(len(codes)), (codes, np.arange(len(codes)))),
+                                      shape=(len(names), len(codes)))
+        totals = indicator @ self.weighted[rows[keep]]
+        sums = totals.sum(axis=1, keepdims=True)
+        return pd.DataFrame(np.divide(totals, sums, out=np.zeros_like(totals), where=sums > 0),
+                            index=names.astype(str), columns=self.labels())
+
+
+def load_doc_topics(directory, n_rows):
+    """Thèmes de l'app (None si topics.py n'a pas tourné sur cette version du corpus)."""
+    frame = read_artifact(directory, DOC_TOPICS_ARTIFACT)
+    terms = read_artifact(directory, TOPIC_TERMS_ARTIFACT)
+    if frame is None or terms is None: return None
+    return DocTopics(frame, terms, n_rows)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Modèle de thèmes (LDA online) des interventions.")
+    parser.add_argument("--topics", type=int,
+                        help=f"Nombre de thèmes (défaut : celui du modèle enregistré, sinon {N_TOPICS} ; "
+                             "un autre nombre relance l'entraînement)")
+    parser.add_argument("--batch-size", type=int, default=512, help="Interventions par lot de partial_fit (défaut : 512)")
+    parser.add_argument("--passes", type=int, default=5, help="Passes du premier entraînement (défaut : 5)")
+    parser.add_argument("--retrain", action="store_true", help="Repart de zéro (vocabulaire et modèle)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Recalcule la distribution de toutes les interventions avec le modèle mis à jour")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    df = read_corpus(directory)
+    state, dtm = (None, None) if args.retrain else load_state(directory)
+    if state is not None and args.topics is not None and args.topics != state_topics(state):
+        # Le nombre de thèmes fait partie du modèle : on ne peut pas le changer par une mise à jour
+        print(f"🔁 Le modèle enregistré a {state_topics(state)} thèmes, {args.topics} demandés : "
+              "nouvel entraînement.")
+        state, dtm = None, None
+    print(f"🧠 {'Mise à jour' if state is not None else 'Entraînement'} des thèmes sur {len(df)} interventions...")
+
+    t0 = time.perf_counter()
+    state, matrix, stats = update_topics(df, state, dtm, n_topics=args.topics, batch_size=args.batch_size,
+                                         passes=args.passes, refresh=args.refresh)
+    path = save_topics(directory, state, matrix)
+    print(f"🎉 {stats['new']} nouvelles interventions, {stats['known']} déjà vues, "
+          f"en {time.perf_counter() - t0:.1f} s -> '{path}'")
+    for label in DocTopics(doc_topics_frame(state, matrix), topic_terms(state), len(df)).labels(6):
+        print(f"   {label}")